@@ -4,11 +4,11 @@ import subprocess
 import socket
 import numpy as np 
 import logging
-import RPi.GPIO as GPIO
 import concurrent.futures
-import time
-from collections import deque
+import functools
+import json
 import difflib
+import openai
 
 # Import custom modules
 import libs.utilities as Utilities
@@ -19,6 +19,15 @@ import libs.clock as clock
 import libs.raspotify_wrapper as btm
 import libs.games
 import libs.raspotify_wrapper as rspw  # Update the import
+import libs.gesture_scheduler as gesture_scheduler
+import libs.gpio_backend as gpio_backend
+import libs.sensor_process as sensor_process
+import libs.wake_word as wake_word
+import libs.command_matcher as command_matcher
+import libs.command_scheduler as command_scheduler
+import libs.async_core as async_core
+import libs.http_client as http_client
+from libs.gesture import GestureModule
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -41,126 +50,6 @@ def get_ip_address():
         s.close()
     return ip_address
 
-class GestureModule:
-    """
-    Class to handle gesture detection using ultrasonic sensors.
-    
-    Attributes:
-        trigger_pin (int): GPIO pin for trigger signal
-        echo_pin (int): GPIO pin for echo signal
-        distance_range (tuple): Min and max distance (cm) for gesture detection
-        gesture_interval (float): Time between gesture checks in seconds
-        debounce_time (float): Minimum time between valid gestures
-        distance_history (deque): Recent distance measurements for smoothing
-    """
-
-    def __init__(self, trigger_pin=18, echo_pin=24, distance_range=(2, 5), gesture_interval=0.2, debounce_time=1.0):
-        self.trigger_pin = trigger_pin
-        self.echo_pin = echo_pin
-        self.distance_range = distance_range
-        self.gesture_interval = gesture_interval
-        self.debounce_time = debounce_time
-        self.distance_history = deque(maxlen=5)
-        self.is_gpio_active = True
-        self.last_valid_measurement = None
-        self.consecutive_timeouts = 0
-        self.max_timeouts = 5
-        self.setup_gpio()
-
-    def setup_gpio(self):
-        try:
-            GPIO.setmode(GPIO.BCM)
-            GPIO.setup(self.trigger_pin, GPIO.OUT)
-            GPIO.setup(self.echo_pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
-            GPIO.output(self.trigger_pin, False)
-            time.sleep(0.1)
-        except Exception as e:
-            logging.error(f"GPIO setup failed: {e}")
-            self.is_gpio_active = False
-
-    def cleanup_gpio(self):
-        GPIO.cleanup()
-        self.is_gpio_active = False
-
-    def measure_distance(self):
-        if not self.is_gpio_active:
-            return None
-        try:
-            GPIO.output(self.trigger_pin, False)
-            time.sleep(0.000005)
-            GPIO.output(self.trigger_pin, True)
-            time.sleep(0.00001)
-            GPIO.output(self.trigger_pin, False)
-            timeout = time.time() + 0.02
-            while GPIO.input(self.echo_pin) == 0:
-                pulse_start = time.time()
-                if pulse_start > timeout:
-                    self.consecutive_timeouts += 1
-                    if self.consecutive_timeouts > self.max_timeouts:
-                        logging.warning("Multiple consecutive timeouts detected")
-                    return None
-            while GPIO.input(self.echo_pin) == 1:
-                pulse_end = time.time()
-                if pulse_end > timeout:
-                    return None
-            self.consecutive_timeouts = 0
-            pulse_duration = pulse_end - pulse_start # type: ignore
-            distance = (pulse_duration * 34300) / 2
-            if 0 <= distance <= 400:
-                self.last_valid_measurement = distance
-                return round(distance, 1)
-            return None
-        except Exception as e:
-            logging.warning(f"Error measuring distance: {e}")
-            return None
-
-    def get_smoothed_distance(self):
-        measurements = []
-        for _ in range(3):
-            dist = self.measure_distance()
-            if dist is not None:
-                measurements.append(dist)
-            time.sleep(0.01)
-        if len(measurements) < 2:
-            return None
-        median = sorted(measurements)[len(measurements)//2]
-        filtered = [x for x in measurements if abs(x - median) < 2]
-        if not filtered:
-            return None
-        avg_distance = sum(filtered) / len(filtered)
-        self.distance_history.append(avg_distance)
-        if len(self.distance_history) >= 3:
-            return sum(self.distance_history) / len(self.distance_history)
-        return avg_distance
-
-    def detect_hand_gesture(self):
-        if not self.is_gpio_active:
-            return False
-        valid_detections = 0
-        required_detections = 2
-        for _ in range(3):
-            distance = self.get_smoothed_distance()
-            if distance is None:
-                time.sleep(self.gesture_interval)
-                continue
-            if self.distance_range[0] <= distance <= self.distance_range[1]:
-                valid_detections += 1
-                if valid_detections >= required_detections:
-                    logging.info(f"Hand gesture detected at {distance:.1f}cm")
-                    return True
-            else:
-                valid_detections = 0
-            time.sleep(self.gesture_interval)
-        return False
-
-    def start_hand_gesture_detection(self):
-        hand_gesture_thread = threading.Thread(target=self.detect_hand_gesture, daemon=True)
-        hand_gesture_thread.start()
-
-    def stop(self):
-        logging.info("Stopping gesture detection...")
-        self.cleanup_gpio()
-
 class FamAssistant:
     """
     Main class for the FamAssistant, handling voice and gesture interactions.
@@ -171,23 +60,60 @@ class FamAssistant:
         music_path (str): Path to music directory
         is_running (bool): Flag indicating if assistant is active
         is_processing_command (bool): Flag indicating command processing state
-        executor: ThreadPoolExecutor for concurrent operations
+        executor: ThreadPoolExecutor for barge-in listening while a reply is read out
+        scheduler (CommandScheduler): Runs sessions and commands one at a time, with preemption
+        preemptive_handlers (set): Handlers that cancel the active session when heard during a reply
         command_mappings (list): List of (command_phrase, handler_function) tuples
+        gesture_scheduler (SamplingScheduler): Duty-cycled gesture sampling loop (thread sampler)
+        sensor_process (SensorProcess): Out-of-process gesture sampler, or None in thread mode
+        wake_word_config (dict): 'wake_word' configuration section
+        wake_word_listener (WakeWordListener): Wake-word detector on the capture stream, or None
+        command_matcher (CommandMatcher): Exact and fuzzy matcher compiled from command_mappings
+        transcript_log (str): JSON-lines file receiving every transcript and its match, or None
     """
-    def __init__(self, access_key, keyword_path, music_path):
+    def __init__(self, access_key, keyword_path, music_path, gesture_config=None, wake_word_config=None,
+                 command_config=None, http_config=None):
+        # Before any module issues a request, so every client shares the configured pool
+        http_client.configure(http_config)
+        openai.http_client = http_client.get_pool().client
+        self.sensor_process = None
+        self.wake_word_listener = None
+        self.wake_word_config = wake_word_config or {}
+        self.gesture_module = None
+        self.gesture_scheduler = None
         self.access_key = access_key
         self.keyword_path = keyword_path
         self.music_path = music_path
         self.is_running = False
         self.is_processing_command = False
+        self.is_listening_for_interrupt = False
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
         self.games = libs.games.Games(False, '/home/pi/FAM/misc')
         self.music_search = musicSearch.MusicSearch()
         self.music_player = musicP.MusicPlayer(music_path, shuffle=True)
-        self.task_manager = clock.TaskManager()
+        self.task_manager = clock.TaskManager(alarm_chime=Utilities.alarm)
         self.util = Utilities.Utilities()
         self.gpt = gpt.Generation()
-        self.gesture_module = GestureModule()
+        gesture_config = gesture_config or {}
+        if gesture_config.get('sampler', 'process') == 'process':
+            self.sensor_process = sensor_process.SensorProcess(gesture_config, self.on_gesture)
+        else:
+            self.gesture_module = GestureModule(
+                distance_filter=gesture_config.get('filter', 'exponential'),
+                timing=gesture_config.get('timing', 'edge'),
+                required_detections=int(gesture_config.get('required_detections', 4)),
+                trace_path=gesture_config.get('trace_path'),
+                gpio=gpio_backend.load_gpio(gesture_config),
+            )
+            self.gesture_scheduler = gesture_scheduler.SamplingScheduler.from_config(
+                gesture_config,
+                probe=self.gesture_module.sample,
+                detect=self.gesture_module.detect_hand_gesture,
+                should_pause=self.is_gesture_sampling_paused,
+            )
+        self.util.speaking_listeners.append(self.sync_listeners)
+        self.scheduler = command_scheduler.CommandScheduler()
+        self.scheduler.cancel_hooks.append(self.util.stop_speaking)
         self.raspotify_wrapper = rspw.RaspotifyWrapper()
 
         logging.info("FamAssistant initialized.")
@@ -200,6 +126,7 @@ class FamAssistant:
             ("current time", self.handle_time),
             ("what's the date", self.handle_date),
             ("current date", self.handle_date),
+            ("what's the weather", self.handle_weather),
             ("add a new task", self.handle_add_task),
             ("add a task", self.handle_add_task),
             ("search for task", self.handle_search_task),
@@ -215,6 +142,7 @@ class FamAssistant:
             ("how are you", self.handle_how_are_you),
             ("time", self.handle_time),
             ("date", self.handle_date),
+            ("weather", self.handle_weather),
             ("start", self.handle_start_my_day),
             ("news", self.handle_news),
             ("next", self.handle_next_track),
@@ -234,53 +162,139 @@ class FamAssistant:
         ]
         # Sort command mappings by phrase length (longest first)
         self.command_mappings.sort(key=lambda x: len(x[0]), reverse=True)
+        self.util.setCommandPhrases(phrase for phrase, _ in self.command_mappings)
+        intents = {phrase: handler.__name__ for phrase, handler in self.command_mappings}
+        # Handlers that read the rest of the utterance must wait for the full transcript
+        self.util.setEarlyCommands(intents, final_only={self.handle_download.__name__})
+        command_config = command_config or {}
+        self.command_handlers = dict(self.command_mappings)
+        self.command_matcher = command_matcher.CommandMatcher(
+            intents,
+            dispatch_score=float(command_config.get('dispatch_score', 0.8)),
+            dispatch_margin=float(command_config.get('dispatch_margin', 0.1)),
+            confirm_score=float(command_config.get('confirm_score', 0.7)),
+        )
+        self.transcript_log = command_config.get('transcript_log')
+        self.preemptive_handlers = {self.handle_stop_music, self.handle_pause_music, self.handle_next_track}
+
+    @property
+    def is_processing_command(self):
+        return self._is_processing_command
+
+    @is_processing_command.setter
+    def is_processing_command(self, value):
+        self._is_processing_command = value
+        self.sync_listeners()
+
+    @property
+    def is_listening_for_interrupt(self):
+        return self._is_listening_for_interrupt
+
+    @is_listening_for_interrupt.setter
+    def is_listening_for_interrupt(self, value):
+        self._is_listening_for_interrupt = value
+        self.sync_listeners()
 
     def start(self):
-        """Start the assistant by initializing gesture detection thread."""
+        """Start the assistant by initializing gesture detection."""
         self.is_running = True
         self.util.playChime('success')
         logging.info("Assistant started.")
+        self.scheduler.start()
 
-        # Start gesture detection thread
-        gesture_thread = threading.Thread(target=self.gesture_detection_loop, daemon=True)
-        gesture_thread.start()
+        if self.sensor_process is not None:
+            self.sensor_process.start()
+        else:
+            gesture_thread = threading.Thread(target=self.gesture_detection_loop, daemon=True)
+            gesture_thread.start()
+
+        self.start_wake_word_detection()
+        self.util.start_briefing_precompute()
+        self.sync_listeners()
+
+    def start_wake_word_detection(self):
+        """Run the wake-word detector on the shared capture stream, if one is configured."""
+        detector = wake_word.make_detector(self.wake_word_config, self.access_key, self.keyword_path)
+        if detector is None:
+            logging.info("Wake-word detection disabled.")
+            return
+        try:
+            self.wake_word_listener = wake_word.WakeWordListener(
+                self.util.capture_stream(), detector, self.on_wake_word)
+            self.wake_word_listener.start()
+        except Exception as e:
+            logging.error(f"Failed to start wake-word detection: {e}")
+            detector.close()
+            self.wake_word_listener = None
+
+    def on_wake_word(self, position):
+        self.start_session(position)
 
-        # Commented out wake word detection thread
-        # wake_word_thread = threading.Thread(target=self.wake_word_detection_loop, daemon=True)
-        # wake_word_thread.start()
+    def start_session(self, start_position=None):
+        """Queue a session; ignored while one is already active or queued."""
+        return self.scheduler.submit("session", functools.partial(self.on_keyword_detected, start_position),
+                                     unique=True)
 
     def gesture_detection_loop(self):
-        """Continuously detects hand gestures and triggers command processing."""
+        """Runs the gesture sampling scheduler and triggers command processing."""
         try:
-            while self.is_running:
-                if not self.is_processing_command and self.gesture_module.detect_hand_gesture():
-                    logging.info("Hand gesture detected.")
-                    self.executor.submit(self.on_keyword_detected)
+            self.gesture_scheduler.run(self.on_gesture, lambda: self.is_running)
         except Exception as e:
             logging.error(f"Error in gesture detection loop: {e}")
+        finally:
+            self.gesture_scheduler.log_usage()
+
+    def is_gesture_sampling_paused(self):
+        """Sampling pauses while a command is processed, except to allow a barge-in during speech."""
+        return self.is_processing_command and (self.is_listening_for_interrupt or not self.util.is_speaking())
 
-    def on_keyword_detected(self):
+    def sync_listeners(self):
+        """
+        Push the current state to the input listeners: the gesture sampler process
+        (the thread sampler reads it itself) and the wake-word detector, which
+        pauses while a command is handled.
+        """
+        if not hasattr(self, 'util'):
+            return
+        if self.sensor_process is not None:
+            self.sensor_process.set_paused(self.is_gesture_sampling_paused())
+        if self.wake_word_listener is not None:
+            self.wake_word_listener.set_paused(self.is_processing_command)
+
+    def on_gesture(self):
+        if not self.is_processing_command:
+            if self.start_session():
+                logging.info("Hand gesture detected.")
+        elif self.util.is_speaking() and not self.is_listening_for_interrupt:
+            logging.info("Hand gesture detected during speech.")
+            self.is_listening_for_interrupt = True
+            self.executor.submit(self.on_interrupt_requested)
+
+    def on_keyword_detected(self, start_position=None):
         self.is_processing_command = True
+        try:
+            self.run_session(start_position)
+        finally:
+            self.is_processing_command = False
+
+    def run_session(self, start_position=None):
         self.util.playChime('success')
         logging.info("Chime played for keyword detection.")
 
         if self.music_player.is_playing:
             self.music_player.set_volume(20)
 
-        # Removed audio stream closing
-        # self.close_audio_stream()
-
+        # The microphone stays open: the command is read from the same capture
+        # stream, starting where the wake word ended
         try:
-            command = self.util.getSpeech()
+            command = self.util.getSpeech(commands=True, start_position=start_position)
             if not command:
-                self.is_processing_command = False
                 return
             if isinstance(command, list):
                 command = ' '.join(map(str, command))
             logging.debug(f"Recognized command: {command}")
         except Exception as e:
             logging.error(f"Error in speech recognition: {e}")
-            self.is_processing_command = False
             return
 
         if self.music_player.is_playing and "stop" not in command.lower() and not {"song", "music"} & set(command.lower().split()):
@@ -291,10 +305,26 @@ class FamAssistant:
         if self.music_player.is_playing:
             self.music_player.set_volume(100)
 
-        # Removed audio stream initialization
-        # self.init_audio_stream()
-        self.is_processing_command = False
-        time.sleep(1)  # Delay before re-enabling gesture detection
+        self.scheduler.sleep(1)  # Delay before re-enabling gesture detection
+
+    def on_interrupt_requested(self):
+        """
+        Listen for a command while a long reply is being read out. Preemptive
+        commands ("stop", "pause", "next") cancel the reply and run at once.
+        """
+        self.is_listening_for_interrupt = True
+        try:
+            command = self.util.getSpeech()
+            if not command:
+                return
+            command = command.lower().strip()
+            phrase, action, _ = self.command_matcher.decide(command)
+            handler = self.command_handlers.get(phrase) if action == command_matcher.DISPATCH else None
+            if handler in self.preemptive_handlers:
+                self.scheduler.submit(phrase, functools.partial(handler, command),
+                                      priority=command_scheduler.URGENT, preempt=True)
+        finally:
+            self.is_listening_for_interrupt = False
 
     def process_command(self, command):
         """
@@ -304,28 +334,38 @@ class FamAssistant:
             command (str): Voice command to process
             
         Note:
-            Uses fuzzy matching to handle similar commands and confirm with user
+            Exact and confident fuzzy matches dispatch at once; weaker fuzzy
+            matches are confirmed with the user first
         """
         command = command.lower().strip()
-        for phrase, handler in self.command_mappings:
-            if phrase in command:
-                handler(command)
-                return
-
-        # Fuzzy matching with known commands
-        phrases = [phrase for phrase, _ in self.command_mappings]
-        close_matches = difflib.get_close_matches(command, phrases, n=1, cutoff=0.7)
-        if close_matches:
-            matched_phrase = close_matches[0]
-            self.util.speak(f"Did you mean {matched_phrase}?")
+        phrase, action, candidates = self.command_matcher.decide(command)
+        self.log_transcript(command, phrase, action, candidates[0].score if candidates else 0.0)
+        if action == command_matcher.DISPATCH:
+            self.command_handlers[phrase](command)
+            return
+        if action == command_matcher.CONFIRM:
+            self.util.speak(f"Did you mean {phrase}?")
             confirmation = self.util.getSpeech()
             if confirmation and 'yes' in confirmation.lower():
-                for phrase, handler in self.command_mappings:
-                    if phrase == matched_phrase:
-                        handler(command)
-                        return
+                self.command_handlers[phrase](command)
+                return
         self.handle_unknown_command(command)
 
+    def log_transcript(self, command, phrase, action, score):
+        """
+        Append a transcript and how it was matched to the transcript log, if enabled.
+
+        The log is the corpus read by benchmarks/command_matcher_benchmark.py.
+        """
+        if not self.transcript_log:
+            return
+        try:
+            with open(self.transcript_log, 'a') as f:
+                f.write(json.dumps({"transcript": command, "phrase": phrase, "action": action,
+                                    "score": round(score, 3)}) + "\n")
+        except OSError as e:
+            logging.error(f"Failed to write transcript log: {e}")
+
     def handle_play_music(self, _command):
         """
         Handle music playback commands.
@@ -361,6 +401,9 @@ class FamAssistant:
     def handle_date(self, _command):
         self.util.speak(self.util.getDate())
 
+    def handle_weather(self, _command):
+        self.util.speak(self.util.getWeather(Utilities.BRIEFING_LOCATION))
+
     def handle_start_my_day(self, _command):
         self.util.startMyDay()
 
@@ -368,7 +411,10 @@ class FamAssistant:
         self.repSpeak('/home/pi/FAM/tts_audio_files/Here_are_the_top_news_headlines___.mp3')
         news = self.util.getNews()
         for headline in news:
-            self.util.speak(headline)
+            if self.scheduler.cancelled():
+                break
+            if not self.util.speak_long(headline):
+                break
 
     def handle_download(self, command):
         song_name = command.replace("download", "").strip()
@@ -387,6 +433,7 @@ class FamAssistant:
         self.music_player.unpause_music()
 
     def handle_stop_music(self, _command):
+        self.util.stop_speaking()
         self.repSpeak('/home/pi/FAM/tts_audio_files/Stopping_music___.mp3')
         self.music_player.stop_music()
 
@@ -433,13 +480,15 @@ class FamAssistant:
     def handle_unknown_command(self, command):
         logging.info(f"Handling unknown command: {command}")
         reply = self.gpt.live_chat_with_ai(command)
+        if self.scheduler.cancelled():
+            return
         if reply:
-            self.util.speak(reply)
+            self.util.speak_long(reply)
         else:
             logging.error("No reply from GPT")
 
     def repSpeak(self, file):
-        subprocess.run(['ffplay', '-nodisp', '-autoexit', file], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.util.playPrompt(file)
 
     def seek_forward(self):
         seconds = 10
@@ -470,12 +519,19 @@ class FamAssistant:
     def stop(self):
         """Stops the assistant and cleans up resources."""
         self.is_running = False
-        # Removed audio stream closure
-        # self.close_audio_stream()
-        # if self.porcupine:
-        #     self.porcupine.delete()
+        self.scheduler.stop()
         self.music_player.stop_music()
-        self.gesture_module.stop()
+        if self.wake_word_listener is not None:
+            self.wake_word_listener.stop()
+        if self.sensor_process is not None:
+            self.sensor_process.stop()
+        else:
+            self.gesture_module.stop()
+        self.util.stop_briefing_precompute()
+        async_core.get_core().close()
+        http_client.get_pool().close()
+        logging.info("Audio engine stats: %s", Utilities.audioEngine.stats())
+        Utilities.ttsCache.close()
         logging.info("Assistant stopped.")
 
     def returnEmailSubject(self, ip_address):
@@ -0,0 +1,92 @@
+"""
+Side-by-side latency/accuracy benchmark of the speech-recognition backends.
+
+The fixture directory holds 16-bit mono WAV recordings of spoken commands and
+a transcripts.json with the reference text of each:
+
+    {"what_time_is_it.wav": "what time is it", ...}
+
+Every available backend transcribes every fixture. The script reports mean
+and p95 latency, word error rate and exact-match rate per backend.
+
+Usage:
+    python benchmarks/asr_benchmark.py --fixtures DIR [--backends google vosk]
+        [--offline-model-path PATH] [--online-timeout 5]
+"""
+
+import os
+import sys
+import json
+import wave
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import libs.asr_backends as asr_backends  # noqa: E402
+import libs.audio_encoding as audio_encoding  # noqa: E402
+
+def word_errors(reference: str, hypothesis: str) -> int:
+    """Levenshtein distance between the word sequences."""
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    distances = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        previous, distances[0] = distances[0], i
+        for j, hyp_word in enumerate(hyp, 1):
+            current = min(distances[j] + 1, distances[j - 1] + 1, previous + (ref_word != hyp_word))
+            previous, distances[j] = distances[j], current
+    return distances[len(hyp)]
+
+def load_fixture(path: str):
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+            raise ValueError(f"{path}: expected 16-bit mono audio")
+        return wav.readframes(wav.getnframes()), wav.getframerate()
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare speech-recognition backends on recorded commands.')
+    parser.add_argument('--fixtures', type=str, required=True, help='Directory with WAV files and transcripts.json.')
+    parser.add_argument('--backends', nargs='+', default=['google', 'vosk'], help='Backends to compare.')
+    parser.add_argument('--offline-model-path', type=str, default=None, help='Vosk model directory.')
+    parser.add_argument('--online-timeout', type=float, default=5.0, help='Timeout of the online backend.')
+    args = parser.parse_args()
+
+    with open(os.path.join(args.fixtures, "transcripts.json")) as f:
+        transcripts = json.load(f)
+    selector = asr_backends.BackendSelector.from_config({
+        'backends': args.backends,
+        'offline_model_path': args.offline_model_path,
+        'online_timeout': args.online_timeout,
+    })
+    fixtures = [(name, *load_fixture(os.path.join(args.fixtures, name)), text)
+                for name, text in sorted(transcripts.items())]
+
+    print(f"{'backend':<10}{'n':>5}{'mean':>9}{'p95':>9}{'WER':>8}{'exact':>8}{'errors':>8}{'sent':>10}")
+    for backend in selector.backends:
+        if not backend.available:
+            print(f"{backend.name:<10}  unavailable")
+            continue
+        latencies, errors, words, exact, failures, sent = [], 0, 0, 0, 0, 0
+        for name, frame_data, sample_rate, reference in fixtures:
+            started = time.perf_counter()
+            try:
+                utterance = audio_encoding.PreparedUtterance(frame_data, sample_rate)
+                audio, codec = utterance.encoded(backend.codecs)
+                sent += len(audio)
+                hypothesis = backend.transcribe(audio, utterance.rate, codec)
+            except Exception as e:
+                hypothesis = ""
+                failures += 1
+                print(f"  {backend.name}: {name}: {e}", file=sys.stderr)
+            latencies.append(time.perf_counter() - started)
+            errors += word_errors(reference, hypothesis)
+            words += len(reference.split())
+            exact += hypothesis.lower().strip() == reference.lower().strip()
+        latencies = np.array(latencies)
+        print(f"{backend.name:<10}{len(fixtures):>5}{latencies.mean():>8.3f}s{np.percentile(latencies, 95):>8.3f}s"
+              f"{errors / max(words, 1):>8.1%}{exact / len(fixtures):>8.1%}{failures:>8}"
+              f"{sent / len(fixtures) / 1024:>8.1f}KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+End-to-end latency of the morning briefing, serial versus the async core.
+
+A local HTTP server stands in for OpenWeatherMap, NewsAPI, the LLM and the
+TTS service, answering each request after a configurable delay; playback is
+simulated as a sleep of --playback-wps words per second. Three flows are
+replayed against it:
+
+    serial  the original startMyDay: each request blocks in turn, one LLM call
+            per article, each segment synthesized when it is spoken
+    cold    libs/briefing.py on the async core with an empty bundle (no
+            precompute): greeting synthesis, weather and news all start at
+            once and each sentence plays as soon as its audio is ready
+    warm    the same after the bundle has been precomputed
+
+For each flow the script reports, averaged over --runs briefings:
+    - time to first audio
+    - total briefing time
+    - dead air: total time minus playback time
+the per-segment breakdown of the last cold run and the connection pool's
+per-host stats are printed.
+
+Usage:
+    python benchmarks/briefing_latency.py [--runs 3] [--llm 1.5] [--tts 0.6] [--weather 0.3] [--news 0.5]
+                                          [--articles 3] [--playback-wps 25]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import libs.async_core as async_core  # noqa: E402
+import libs.briefing as briefing  # noqa: E402
+import libs.http_client as http_client  # noqa: E402
+
+SUMMARY = ("Officials announced a new plan on Monday that aims to expand public transport in the city, "
+           "with construction expected to begin next year and finish within three years.")
+
+def make_server(delays: dict, articles: int) -> ThreadingHTTPServer:
+    """Start the simulated services on a free local port."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, as the real services
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, body: bytes, content_type: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.startswith("/weather"):
+                time.sleep(delays["weather"])
+                self._reply(json.dumps({"weather": "clear"}).encode(), "application/json")
+            else:
+                time.sleep(delays["news"])
+                items = [{"title": f"Article {i}", "content": SUMMARY} for i in range(articles)]
+                self._reply(json.dumps({"articles": items}).encode(), "application/json")
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if self.path.startswith("/llm"):
+                time.sleep(delays["llm"])
+                self._reply(json.dumps({"text": SUMMARY}).encode(), "application/json")
+            else:
+                time.sleep(delays["tts"])
+                self._reply(payload["text"].encode(), "application/octet-stream")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class Timeline:
+    """Collects first-audio and playback times of one briefing."""
+
+    def __init__(self, wps: float):
+        self.wps = wps
+        self.start = time.perf_counter()
+        self.first_audio = None
+        self.playback = 0.0
+
+    def play(self, audio: bytes) -> None:
+        if self.first_audio is None:
+            self.first_audio = time.perf_counter() - self.start
+        duration = len(audio.split()) / self.wps
+        self.playback += duration
+        time.sleep(duration)
+
+def serial_briefing(base: str, articles: int, timeline: Timeline) -> None:
+    with httpx.Client(timeout=30) as client:
+        def speak(text):
+            timeline.play(client.post(f"{base}/tts", json={"text": text}).content)
+
+        def summarize(prompt):
+            return client.post(f"{base}/llm", json={"prompt": prompt}).json()["text"]
+
+        speak("Good morning! Today is October 18th, 2026.")
+        weather = client.get(f"{base}/weather").json()
+        speak(summarize(json.dumps(weather)))
+        data = client.get(f"{base}/news").json()
+        headlines = [summarize(article["content"]) for article in data["articles"][:articles]]
+        speak("Here are the top news headlines:")
+        for headline in headlines:
+            speak(headline)
+
+def make_briefing(core: async_core.AsyncCore, base: str, articles: int, directory: str,
+                  timeline_ref: list) -> briefing.MorningBriefing:
+    """Build the assistant's briefing with sources that call the simulated services."""
+    client = core.client
+
+    async def summarize(prompt):
+        return (await client.post(f"{base}/llm", json={"prompt": prompt})).json()["text"]
+
+    async def greeting(context):
+        return ["Good morning! Today is October 18th, 2026."]
+
+    async def weather(context):
+        return [await summarize(json.dumps(await core.get_json(f"{base}/weather")))]
+
+    async def news(context):
+        data = await core.get_json(f"{base}/news")
+        headlines = await asyncio.gather(*(summarize(a["content"]) for a in data["articles"][:articles]))
+        return ["Here are the top news headlines:"] + list(headlines)
+
+    async def synthesize(text):
+        return (await client.post(f"{base}/tts", json={"text": text})).content
+
+    async def play(audio, cancel_event):
+        await core.to_thread(timeline_ref[0].play, audio)
+
+    bundle = briefing.BriefingBundle(directory, {"greeting": 3600, "weather": 3600, "news": 3600})
+    return briefing.MorningBriefing(bundle, {"greeting": greeting, "weather": weather, "news": news},
+                                    synthesize, play)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="briefings per flow")
+    parser.add_argument("--llm", type=float, default=1.5, help="LLM response delay (s)")
+    parser.add_argument("--tts", type=float, default=0.6, help="TTS response delay (s)")
+    parser.add_argument("--weather", type=float, default=0.3, help="weather API delay (s)")
+    parser.add_argument("--news", type=float, default=0.5, help="news API delay (s)")
+    parser.add_argument("--articles", type=int, default=3, help="articles per briefing")
+    parser.add_argument("--playback-wps", type=float, default=25.0, help="simulated playback speed (words/s)")
+    args = parser.parse_args()
+
+    server = make_server({"llm": args.llm, "tts": args.tts, "weather": args.weather, "news": args.news},
+                         args.articles)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    # All simulated services share one host, so lift the per-host cap above the briefing's fan-out
+    pool = http_client.configure({"timeout_s": 30, "per_host": 32})
+    core = async_core.AsyncCore(timeout=30)
+    core.start()
+    directory = tempfile.mkdtemp()
+    timeline_ref = [None]
+    morning = make_briefing(core, base, args.articles, directory, timeline_ref)
+    breakdown = {}
+
+    def cold(timeline):
+        morning.bundle.segments.clear()
+        breakdown.update(core.run(morning.play({})))
+
+    flows = {
+        "serial": lambda timeline: serial_briefing(base, args.articles, timeline),
+        "cold": cold,
+        "warm": lambda timeline: core.run(morning.play({})),
+    }
+    print(f"{'flow':<8}{'first audio':>13}{'total':>9}{'dead air':>10}")
+    try:
+        for name, flow in flows.items():
+            first, total, dead = [], [], []
+            for _ in range(args.runs):
+                timeline = timeline_ref[0] = Timeline(args.playback_wps)
+                flow(timeline)
+                elapsed = time.perf_counter() - timeline.start
+                first.append(timeline.first_audio)
+                total.append(elapsed)
+                dead.append(elapsed - timeline.playback)
+            print(f"{name:<8}{np.mean(first):>12.2f}s{np.mean(total):>8.2f}s{np.mean(dead):>9.2f}s")
+        print("\ncold briefing segments:")
+        for segment, timing in breakdown.items():
+            print(f"  {segment:<9}" + "".join(f"{field} {timing[field]:.2f}s  " for field in
+                                            ("fetch", "synth", "wait", "start", "play") if field in timing))
+        print("\nconnection pool:")
+        for host, stats in pool.stats().items():
+            print(f"  {host}: {stats['requests']} requests, {stats['reuse_rate']:.0%} on reused connections, "
+                  f"mean latency {stats['latency_mean']:.2f}s")
+    finally:
+        core.close()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
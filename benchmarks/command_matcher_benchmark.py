@@ -0,0 +1,170 @@
+"""
+Compare command dispatch with the linear scan + difflib and the compiled matcher.
+
+The corpus is a JSON-lines file of transcripts with the phrase they should
+dispatch (null for speech that is not a command):
+
+    {"transcript": "pause the musik", "expected": "pause music"}
+
+The transcript log written by the assistant ('commands.transcript_log' in
+conf/secrets.yaml) can be used directly: entries without "expected" fall back
+to the logged "phrase", so correct the wrong ones before benchmarking. Without
+--corpus a synthetic corpus (filler words, ASR confusions, misspellings and
+non-commands) is generated from the assistant's command phrases.
+
+For each method the script reports:
+    - dispatch time per transcript (mean and p99)
+    - confirmation rate: transcripts that would cost a "Did you mean ...?" round trip
+    - accuracy: transcripts resolved to the expected intent without asking
+    - wrong dispatches: transcripts dispatched to another intent without asking
+
+Usage:
+    python benchmarks/command_matcher_benchmark.py [--corpus FILE] [--repeat 20]
+                                                   [--dispatch-score 0.8] [--confirm-score 0.7]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import difflib
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import libs.command_matcher as command_matcher  # noqa: E402
+
+# Mirrors FamAssistant.command_mappings (phrase -> handler name)
+COMMANDS = {
+    "start my day": "start_my_day", "good morning": "start_my_day", "what time is it": "time",
+    "current time": "time", "what's the date": "date", "current date": "date", "add a new task": "add_task",
+    "add a task": "add_task", "search for task": "search_task", "play music": "play_music",
+    "pause music": "pause_music", "resume music": "resume_music", "stop music": "stop_music",
+    "play game": "play_game", "start game": "play_game", "stop game": "stop_game", "end game": "stop_game",
+    "download": "download", "how are you": "how_are_you", "time": "time", "date": "date",
+    "start": "start_my_day", "news": "news", "next": "next_track", "skip": "next_track",
+    "pause": "pause_music", "resume": "resume_music", "stop": "stop_music", "shutdown": "shutdown",
+    "enable raspotify": "enable_raspotify", "start raspotify": "enable_raspotify",
+    "enable spotify": "enable_raspotify", "enable discovery": "enable_raspotify",
+    "disable raspotify": "disable_raspotify", "stop raspotify": "disable_raspotify",
+    "disable spotify": "disable_raspotify", "disable discovery": "disable_raspotify",
+}
+
+CONFUSIONS = {
+    "music": ["musik", "muzak", "mucic"], "pause": ["paws", "pose", "pours"], "news": ["nudes", "noose"],
+    "game": ["gain", "gay m"], "raspotify": ["ras spotify", "rasp spotify", "respotify"],
+    "resume": ["resumé", "re zoom"], "shutdown": ["shut down", "shot down"], "task": ["tusk", "tax"],
+    "discovery": ["discover y", "the scovery"], "morning": ["mourning", "moaning"], "skip": ["skid"],
+    "download": ["down load", "don't load"], "date": ["data"], "time": ["tine"],
+}
+FILLERS = ["hey fam", "please", "can you", "could you", "uh", "okay", "now", "for me"]
+NON_COMMANDS = ["what's the capital of france", "tell me a joke", "i'm going out", "thank you",
+                "turn on the lights", "how tall is everest", "never mind", "who won the game last night"]
+
+def generate_corpus(count: int = 600, seed: int = 7) -> list:
+    """Build synthetic transcripts with the phrase each should dispatch."""
+    rng = random.Random(seed)
+    phrases = list(COMMANDS)
+    corpus = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.1:
+            corpus.append({"transcript": rng.choice(NON_COMMANDS), "expected": None})
+            continue
+        phrase = rng.choice(phrases)
+        words = phrase.split()
+        if kind < 0.65:
+            words = [rng.choice(CONFUSIONS[w]) if w in CONFUSIONS and rng.random() < 0.7 else w for w in words]
+        elif kind < 0.8:
+            position = rng.randrange(len(phrase))
+            text = phrase[:position] + phrase[position + 1:]
+            words = text.split() or words
+        if rng.random() < 0.5:
+            words = [rng.choice(FILLERS)] + words
+        if rng.random() < 0.3:
+            words = words + [rng.choice(FILLERS)]
+        corpus.append({"transcript": " ".join(words), "expected": phrase})
+    return corpus
+
+def load_corpus(path: str) -> list:
+    corpus = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                corpus.append({"transcript": entry["transcript"],
+                               "expected": entry.get("expected", entry.get("phrase"))})
+    return corpus
+
+def legacy_decide(command: str, phrases: list):
+    """The original process_command: substring scan, then difflib on a miss."""
+    command = command.lower().strip()
+    for phrase in phrases:
+        if phrase in command:
+            return phrase, command_matcher.DISPATCH
+    close_matches = difflib.get_close_matches(command, list(phrases), n=1, cutoff=0.7)
+    if close_matches:
+        return close_matches[0], command_matcher.CONFIRM
+    return None, None
+
+def evaluate(decide, corpus: list, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        for entry in corpus:
+            start = time.perf_counter()
+            decide(entry["transcript"])
+            timings.append(time.perf_counter() - start)
+    confirmations = correct = wrong = 0
+    for entry in corpus:
+        phrase, action = decide(entry["transcript"])[:2]
+        expected = COMMANDS.get(entry["expected"]) if entry["expected"] else None
+        intent = COMMANDS.get(phrase) if phrase else None
+        if action == command_matcher.CONFIRM:
+            confirmations += 1
+        elif action == command_matcher.DISPATCH:
+            if intent == expected:
+                correct += 1
+            else:
+                wrong += 1
+        elif expected is None:
+            correct += 1
+    timings = np.array(timings) * 1e6
+    return {
+        "mean_us": float(timings.mean()),
+        "p99_us": float(np.percentile(timings, 99)),
+        "confirm": confirmations / len(corpus),
+        "accuracy": correct / len(corpus),
+        "wrong": wrong,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=str, default=None, help="JSON-lines transcript corpus")
+    parser.add_argument("--repeat", type=int, default=20, help="timing passes over the corpus")
+    parser.add_argument("--dispatch-score", type=float, default=0.8)
+    parser.add_argument("--dispatch-margin", type=float, default=0.1)
+    parser.add_argument("--confirm-score", type=float, default=0.7)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else generate_corpus()
+    phrases = sorted(COMMANDS, key=len, reverse=True)
+    build_start = time.perf_counter()
+    matcher = command_matcher.CommandMatcher(COMMANDS, dispatch_score=args.dispatch_score,
+                                             dispatch_margin=args.dispatch_margin,
+                                             confirm_score=args.confirm_score)
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    results = {
+        "legacy": evaluate(lambda text: legacy_decide(text, phrases), corpus, args.repeat),
+        "matcher": evaluate(matcher.decide, corpus, args.repeat),
+    }
+    print(f"{len(corpus)} transcripts, matcher compiled in {build_ms:.2f} ms")
+    print(f"{'method':<9}{'mean':>10}{'p99':>10}{'confirm':>9}{'accuracy':>10}{'wrong':>7}")
+    for method, r in results.items():
+        print(f"{method:<9}{r['mean_us']:>8.1f}us{r['p99_us']:>8.1f}us{r['confirm']:>9.1%}"
+              f"{r['accuracy']:>10.1%}{r['wrong']:>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Replay recorded ultrasonic traces through the gesture detector.
+
+Traces are the files written by gesture_filters.TraceRecorder (set
+'gesture.trace_path' in conf/secrets.yaml to record one). Ground truth is read
+from labels.json in the trace directory, listing when each gesture began and
+ended, in seconds from the first reading:
+
+    {"kitchen_evening.csv": [[12.4, 13.3], [40.1, 40.9]], ...}
+
+Every trace is replayed with each filter, without sleeping, and the script
+reports per filter:
+    - detection latency: time from the start of a gesture to its detection
+    - false positives: detections outside every labelled gesture (plus --grace seconds)
+    - missed gestures
+    - throughput in readings per second
+
+Without --traces a synthetic set (approaching hands, people walking past,
+spurious echoes and dropouts) is generated so the harness can run anywhere.
+
+Usage:
+    python benchmarks/gesture_replay.py [--traces DIR] [--required-detections 4]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import libs.gesture_filters as gesture_filters  # noqa: E402
+
+def generate_traces(directory: str, count: int = 10, seconds: float = 60.0, rate: float = 30.0,
+                    seed: int = 11) -> None:
+    """Write synthetic traces and their labels to directory."""
+    rng = np.random.default_rng(seed)
+    labels = {}
+    for i in range(count):
+        timestamps = np.cumsum(rng.uniform(0.8, 1.2, int(seconds * rate)) / rate)
+        distances = np.full(len(timestamps), np.nan)
+        gestures = []
+        t = rng.uniform(2, 6)
+        while t < seconds - 5:
+            kind = rng.random()
+            if kind < 0.5:
+                # Hand approaches from ~40 cm, holds in the band, then leaves
+                approach, hold = rng.uniform(0.3, 0.8), rng.uniform(0.5, 1.2)
+                target = rng.uniform(2.5, 4.5)
+                span = (timestamps >= t) & (timestamps < t + approach + hold + 0.3)
+                local = timestamps[span] - t
+                path = np.interp(local, [0, approach, approach + hold, approach + hold + 0.3], [40, target, target, 40])
+                distances[span] = path
+                gestures.append([round(t + approach, 3), round(t + approach + hold, 3)])
+                t += approach + hold + rng.uniform(3, 8)
+            elif kind < 0.8:
+                # Someone walking past at 20-80 cm
+                span = (timestamps >= t) & (timestamps < t + rng.uniform(0.5, 1.5))
+                distances[span] = rng.uniform(20, 80)
+                t += rng.uniform(2, 6)
+            else:
+                t += rng.uniform(2, 6)
+        distances += rng.normal(0, 0.4, len(distances))
+        spikes = rng.random(len(distances)) < 0.01
+        distances[spikes] = rng.uniform(2, 5, spikes.sum())
+        distances[rng.random(len(distances)) < 0.05] = np.nan
+        name = f"synthetic_{i:02d}.csv"
+        np.savetxt(os.path.join(directory, name), np.column_stack((timestamps, distances)), delimiter=",",
+                   fmt="%.6f")
+        labels[name] = gestures
+    with open(os.path.join(directory, "labels.json"), "w") as f:
+        json.dump(labels, f, indent=2)
+
+def replay(detector, timestamps: np.ndarray, distances: np.ndarray) -> list:
+    """Feed a trace through the detector and return the detection times."""
+    detector.reset()
+    detector.last_gesture = None
+    detections = []
+    for timestamp, distance in zip(timestamps.tolist(), distances.tolist()):
+        if detector.feed(None if distance != distance else distance, timestamp):
+            detections.append(timestamp)
+    return detections
+
+def run(traces: str, required_detections: int, grace: float) -> None:
+    with open(os.path.join(traces, "labels.json")) as f:
+        labels = json.load(f)
+    loaded = {name: gesture_filters.load_trace(os.path.join(traces, name)) for name in sorted(labels)}
+    readings = sum(len(t) for t, _ in loaded.values())
+    total_gestures = sum(len(g) for g in labels.values())
+
+    print(f"{len(loaded)} traces, {readings} readings, {total_gestures} gestures\n")
+    print(f"{'filter':<13}{'latency p50':>12}{'p95':>8}{'false +':>9}{'missed':>8}{'readings/s':>12}")
+    for name in gesture_filters.FILTERS:
+        detector = gesture_filters.GestureDetector(gesture_filters.make_filter(name),
+                                                   required_detections=required_detections)
+        latencies, false_positives, missed, elapsed = [], 0, 0, 0.0
+        for trace, (timestamps, distances) in loaded.items():
+            started = time.perf_counter()
+            detections = replay(detector, timestamps, distances)
+            elapsed += time.perf_counter() - started
+            matched = set()
+            for detection in detections:
+                hit = next((i for i, (start, end) in enumerate(labels[trace])
+                            if start <= detection <= end + grace and i not in matched), None)
+                if hit is None:
+                    false_positives += 1
+                else:
+                    matched.add(hit)
+                    latencies.append(detection - labels[trace][hit][0])
+            missed += len(labels[trace]) - len(matched)
+        p50 = f"{np.percentile(latencies, 50):.3f}s" if latencies else "-"
+        p95 = f"{np.percentile(latencies, 95):.3f}s" if latencies else "-"
+        print(f"{name:<13}{p50:>12}{p95:>8}{false_positives:>9}{missed:>8}{readings / max(elapsed, 1e-9):>12.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay ultrasonic traces through the gesture detector.')
+    parser.add_argument('--traces', type=str, default=None, help='Directory with trace files and labels.json.')
+    parser.add_argument('--required-detections', type=int, default=4, help='Consecutive in-band readings needed.')
+    parser.add_argument('--grace', type=float, default=0.5, help='Seconds after a gesture a detection still counts.')
+    args = parser.parse_args()
+
+    if args.traces:
+        run(args.traces, args.required_detections, args.grace)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        generate_traces(directory)
+        run(directory, args.required_detections, args.grace)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compare CPU usage and jitter of polled and edge-timed ultrasonic readings.
+
+Run on the Pi with the sensor connected and a static target (e.g. a wall or
+a box) in front of it, or anywhere with --backend simulated (a fixed 20 cm
+target, or --trace to replay a recorded trace). For each timing mode the script takes --count readings
+at --rate Hz and reports:
+    - CPU time of the whole process (including the GPIO callback thread)
+      per reading and as a share of one core over the run
+    - mean and standard deviation of the distance (jitter)
+    - the number of timeouts
+
+Usage:
+    python benchmarks/ultrasonic_cpu.py [--trigger 18] [--echo 24] [--count 300] [--rate 15]
+                                        [--backend rpi|simulated] [--trace FILE]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import libs.ultrasonic as ultrasonic  # noqa: E402
+import libs.gpio_backend as gpio_backend  # noqa: E402
+
+def run(measure, count: int, rate: float) -> dict:
+    """Take count readings at rate Hz and collect CPU and distance statistics."""
+    distances, timeouts = [], 0
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    for _ in range(count):
+        cycle_start = time.perf_counter()
+        distance = ultrasonic.pulse_to_distance(measure())
+        if distance is None:
+            timeouts += 1
+        else:
+            distances.append(distance)
+        time.sleep(max(0.0, 1 / rate - (time.perf_counter() - cycle_start)))
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    distances = np.array(distances) if distances else np.array([np.nan])
+    return {
+        "cpu_ms": cpu / count * 1000,
+        "cpu_share": cpu / wall,
+        "mean": float(np.mean(distances)),
+        "std": float(np.std(distances)),
+        "timeouts": timeouts,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trigger", type=int, default=18, help="trigger pin (BCM)")
+    parser.add_argument("--echo", type=int, default=24, help="echo pin (BCM)")
+    parser.add_argument("--count", type=int, default=300, help="readings per mode")
+    parser.add_argument("--rate", type=float, default=15.0, help="readings per second")
+    parser.add_argument("--backend", choices=["rpi", "simulated"], default="rpi", help="GPIO backend")
+    parser.add_argument("--trace", type=str, default=None, help="trace replayed by the simulated backend")
+    args = parser.parse_args()
+
+    if args.backend == "simulated":
+        script = (gpio_backend.EchoScript.from_trace(args.trace) if args.trace
+                  else gpio_backend.EchoScript.from_sequence([20.0]))
+        GPIO = gpio_backend.SimulatedGPIO(script)
+    else:
+        GPIO = gpio_backend.load_gpio({'gpio_backend': 'rpi'})
+
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setup(args.trigger, GPIO.OUT)
+    GPIO.setup(args.echo, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+    GPIO.output(args.trigger, False)
+    time.sleep(0.5)
+
+    results = {}
+    try:
+        results["poll"] = run(lambda: ultrasonic.poll_echo(GPIO, args.trigger, args.echo), args.count, args.rate)
+        timer = ultrasonic.EdgeEchoTimer(GPIO, args.trigger, args.echo)
+        timer.start()
+        try:
+            results["edge"] = run(timer.measure, args.count, args.rate)
+        finally:
+            timer.stop()
+    finally:
+        GPIO.cleanup()
+
+    print(f"{'mode':<6}{'cpu/read':>11}{'cpu share':>11}{'mean':>9}{'std':>8}{'timeouts':>10}")
+    for mode, r in results.items():
+        print(f"{mode:<6}{r['cpu_ms']:>9.2f}ms{r['cpu_share']:>10.1%}{r['mean']:>7.1f}cm"
+              f"{r['std']:>6.2f}cm{r['timeouts']:>10}")
+
+if __name__ == "__main__":
+    main()
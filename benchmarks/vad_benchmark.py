@@ -0,0 +1,140 @@
+"""
+Benchmark the VAD endpointer over WAV fixtures.
+
+Each fixture is a 16-bit mono WAV file containing one utterance. Ground truth
+is read from labels.json in the fixture directory:
+
+    {"turn_on_the_lights.wav": [0.62, 1.88], ...}   # speech start/end in seconds
+
+For every fixture the endpointer is run as if the audio were streamed from the
+microphone, and the script reports:
+    - endpoint latency: time from the true end of speech to the endpoint decision
+    - truncation errors: utterances whose trimmed span cuts off real speech
+      (more than --tolerance seconds at either end)
+
+Without --fixtures a synthetic set (voiced bursts, fricatives and pauses over
+background noise) is generated so the benchmark can run anywhere.
+
+Usage:
+    python benchmarks/vad_benchmark.py [--fixtures DIR] [--hangover-ms 300]
+"""
+
+import os
+import sys
+import json
+import wave
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import libs.vad as vad  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+def read_wav(path: str) -> np.ndarray:
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+            raise ValueError(f"{path}: expected 16-bit mono audio")
+        if wav.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"{path}: expected {SAMPLE_RATE} Hz audio")
+        return np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+
+def write_wav(path: str, samples: np.ndarray) -> None:
+    with wave.open(path, "wb") as wav:
+        wav.setsampwidth(2)
+        wav.setnchannels(1)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.astype(np.int16).tobytes())
+
+def generate_fixtures(directory: str, count: int = 20, seed: int = 7) -> None:
+    """Write synthetic utterances and their labels to directory."""
+    rng = np.random.default_rng(seed)
+    labels = {}
+    for i in range(count):
+        lead = rng.uniform(0.3, 1.0)
+        tail = 1.5
+        noise_level = rng.uniform(30, 200)
+        pieces = []
+        for _ in range(rng.integers(2, 6)):
+            duration = rng.uniform(0.1, 0.4)
+            t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+            if rng.random() < 0.3:
+                # Unvoiced fricative: quiet broadband noise
+                piece = rng.normal(0, noise_level * 2.2, len(t))
+            else:
+                pitch = rng.uniform(90, 250)
+                envelope = np.sin(np.pi * t / duration)
+                piece = envelope * rng.uniform(1500, 6000) * (
+                    np.sin(2 * np.pi * pitch * t) + 0.5 * np.sin(2 * np.pi * 2 * pitch * t))
+            pieces.append(piece)
+            if rng.random() < 0.5:
+                pieces.append(np.zeros(int(rng.uniform(0.05, 0.2) * SAMPLE_RATE)))
+        while len(pieces[-1]) and not pieces[-1].any():
+            pieces.pop()
+        speech = np.concatenate(pieces)
+        total = int((lead + tail) * SAMPLE_RATE) + len(speech)
+        samples = rng.normal(0, noise_level, total)
+        start = int(lead * SAMPLE_RATE)
+        samples[start:start + len(speech)] += speech
+        name = f"synthetic_{i:02d}.wav"
+        write_wav(os.path.join(directory, name), np.clip(samples, -32768, 32767))
+        labels[name] = [start / SAMPLE_RATE, (start + len(speech)) / SAMPLE_RATE]
+    with open(os.path.join(directory, "labels.json"), "w") as f:
+        json.dump(labels, f, indent=2)
+
+def run(fixtures: str, hangover_ms: int, max_utterance_s: float, tolerance: float) -> None:
+    with open(os.path.join(fixtures, "labels.json")) as f:
+        labels = json.load(f)
+    detector = vad.VoiceActivityDetector(sample_rate=SAMPLE_RATE)
+    latencies, truncations, missed = [], 0, 0
+    processing = 0.0
+    audio_seconds = 0.0
+    print(f"{'fixture':<32}{'true end':>10}{'cut at':>10}{'latency':>10}  status")
+    for name, (true_start, true_end) in sorted(labels.items()):
+        samples = read_wav(os.path.join(fixtures, name))
+        audio_seconds += len(samples) / SAMPLE_RATE
+        started = time.perf_counter()
+        endpointer = vad.endpoint_samples(samples, detector, hangover_ms=hangover_ms, max_utterance_s=max_utterance_s)
+        processing += time.perf_counter() - started
+        span = endpointer.trimmed()
+        if span is None:
+            missed += 1
+            print(f"{name:<32}{true_end:>10.2f}{'-':>10}{'-':>10}  missed")
+            continue
+        start, end = span[0] / SAMPLE_RATE, span[1] / SAMPLE_RATE
+        latency = endpointer.decided_at / SAMPLE_RATE - true_end
+        latencies.append(latency)
+        truncated = start > true_start + tolerance or end < true_end - tolerance
+        truncations += truncated
+        print(f"{name:<32}{true_end:>10.2f}{end:>10.2f}{latency:>10.3f}  {'TRUNCATED' if truncated else 'ok'}")
+
+    print()
+    if latencies:
+        latencies = np.array(latencies)
+        print(f"utterances:          {len(labels)}")
+        print(f"endpoint latency:    mean {latencies.mean():.3f}s, p50 {np.percentile(latencies, 50):.3f}s, "
+              f"p95 {np.percentile(latencies, 95):.3f}s")
+    print(f"truncation errors:   {truncations}")
+    print(f"missed utterances:   {missed}")
+    print(f"processing speed:    {audio_seconds / max(processing, 1e-9):.0f}x real time")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark VAD endpointing over WAV fixtures.')
+    parser.add_argument('--fixtures', type=str, default=None, help='Directory with WAV files and labels.json.')
+    parser.add_argument('--hangover-ms', type=int, default=300, help='Trailing non-speech that ends an utterance.')
+    parser.add_argument('--max-utterance-s', type=float, default=10.0, help='Maximum utterance length.')
+    parser.add_argument('--tolerance', type=float, default=0.05, help='Allowed trim into speech, in seconds.')
+    args = parser.parse_args()
+
+    if args.fixtures:
+        run(args.fixtures, args.hangover_ms, args.max_utterance_s, args.tolerance)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        generate_fixtures(directory)
+        run(directory, args.hangover_ms, args.max_utterance_s, args.tolerance)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Pluggable speech-recognition backends.
+
+Every backend turns raw 16-bit mono PCM into text behind the same interface:
+
+- GoogleBackend: the online recognizer from SpeechRecognition 2.2.0
+  (FLAC upload), with a hard timeout so a slow link cannot stall a command.
+- VoskBackend: a CPU-only offline recognizer loaded from a local model.
+
+Each backend lists the codecs it accepts, most compact first; the utterance
+is encoded (see libs/audio_encoding.py) in the first one that is available.
+
+BackendSelector picks the backend for each utterance from the configured
+preference order and from measured latency. An online backend that is slower
+than the latency budget, or that just failed, is skipped for a cool-down
+period, and the offline engine answers instead.
+"""
+
+import json
+import time
+import logging
+import threading
+import concurrent.futures
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import libs.audio_encoding as audio_encoding
+
+import speech_recognition as sr  # type: ignore
+
+try:
+    import vosk  # type: ignore
+    vosk.SetLogLevel(-1)
+except ImportError:
+    vosk = None
+
+@lru_cache(maxsize=4)
+def load_vosk_model(model_path: str):
+    """
+    Load a Vosk model once per path, so backends can share it.
+
+    Args:
+        model_path (str): Path of the Vosk model directory
+
+    Returns:
+        vosk.Model: The loaded model
+
+    Raises:
+        RuntimeError: If Vosk is not installed
+    """
+    if vosk is None:
+        raise RuntimeError("Vosk is not installed")
+    logging.info("Loading Vosk model from %s", model_path)
+    return vosk.Model(model_path)
+
+class RecognizerBackend:
+    """
+    Interface of a speech-recognition backend.
+
+    Attributes:
+        name (str): Backend name used in configuration and stats
+        offline (bool): Whether the backend works without a network
+        codecs (tuple): Accepted audio codecs, most preferred first
+    """
+    name = "base"
+    offline = False
+    codecs = ("pcm",)
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def transcribe(self, audio: bytes, sample_rate: int, codec: str) -> str:
+        """
+        Transcribe one utterance.
+
+        Args:
+            audio (bytes): Encoded mono audio
+            sample_rate (int): Sample rate of the audio
+            codec (str): One of the backend's codecs
+
+        Returns:
+            str: Recognized text
+
+        Raises:
+            LookupError: If the speech was unintelligible
+        """
+        raise NotImplementedError
+
+class GoogleBackend(RecognizerBackend):
+    """
+    Online recognizer of SpeechRecognition 2.2.0, bounded by a timeout.
+
+    The 2.2.0 client always uploads 'audio/x-flac', so FLAC is the only codec.
+    """
+    name = "google"
+    offline = False
+    codecs = ("flac",)
+
+    def __init__(self, timeout: float = 5.0):
+        self.timeout = timeout
+        self.recognizer = sr.Recognizer()
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+    @property
+    def available(self) -> bool:
+        return audio_encoding.codec_available("flac")
+
+    def transcribe(self, audio: bytes, sample_rate: int, codec: str) -> str:
+        future = self.executor.submit(self.recognizer.recognize, sr.AudioData(sample_rate, audio))
+        try:
+            return future.result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            raise TimeoutError(f"Online recognition took longer than {self.timeout}s")
+
+class VoskBackend(RecognizerBackend):
+    """CPU-only offline recognizer using a local Vosk model."""
+    name = "vosk"
+    offline = True
+    codecs = ("pcm",)
+
+    def __init__(self, model_path: Optional[str]):
+        self.model_path = model_path
+        self.model = None
+        if vosk is None or not model_path:
+            return
+        try:
+            self.model = load_vosk_model(model_path)
+        except Exception as e:
+            logging.error(f"Failed to load offline recognizer model: {e}")
+
+    @property
+    def available(self) -> bool:
+        return self.model is not None
+
+    def transcribe(self, audio: bytes, sample_rate: int, codec: str) -> str:
+        recognizer = vosk.KaldiRecognizer(self.model, sample_rate)
+        recognizer.AcceptWaveform(audio)
+        text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+        if not text:
+            raise LookupError("Speech is unintelligible")
+        return text
+
+class BackendSelector:
+    """
+    Chooses a backend per utterance and falls back when one fails.
+
+    Attributes:
+        backends (List[RecognizerBackend]): Backends in order of preference
+        latency_budget (float): Mean latency above which an online backend is skipped
+        cooldown (float): Seconds a slow or failing online backend is skipped for
+        latencies (dict): Backend name -> exponential moving average latency in seconds
+    """
+
+    def __init__(self, backends: List[RecognizerBackend], latency_budget: float = 2.5,
+                 cooldown: float = 60.0, smoothing: float = 0.3):
+        self.backends = backends
+        self.latency_budget = latency_budget
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        self.latencies = {}
+        self.skip_until = {}
+        self.counts = {backend.name: {"ok": 0, "failed": 0} for backend in backends}
+        self.reports = deque(maxlen=50)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, speech_config: dict) -> 'BackendSelector':
+        """
+        Build the selector from the 'utilities.speech' configuration section.
+
+        Args:
+            speech_config (dict): Speech settings
+
+        Returns:
+            BackendSelector: Selector over the configured backends
+        """
+        factories = {
+            "google": lambda: GoogleBackend(timeout=float(speech_config.get('online_timeout', 5.0))),
+            "vosk": lambda: VoskBackend(speech_config.get('offline_model_path')),
+        }
+        backends = []
+        for name in speech_config.get('backends', ["google", "vosk"]):
+            if name not in factories:
+                logging.warning(f"Unknown speech backend '{name}' ignored.")
+                continue
+            backends.append(factories[name]())
+        return cls(
+            backends,
+            latency_budget=float(speech_config.get('online_latency_budget', 2.5)),
+            cooldown=float(speech_config.get('online_cooldown', 60.0)),
+        )
+
+    def candidates(self) -> List[RecognizerBackend]:
+        """
+        Return the usable backends for the next utterance, best first.
+
+        Returns:
+            List[RecognizerBackend]: Available backends that are not cooling down;
+                skipped ones are appended as a last resort
+        """
+        now = time.monotonic()
+        preferred, skipped = [], []
+        for backend in self.backends:
+            if not backend.available:
+                continue
+            if self.skip_until.get(backend.name, 0) > now:
+                skipped.append(backend)
+            else:
+                preferred.append(backend)
+        return preferred + skipped
+
+    def transcribe(self, utterance: audio_encoding.PreparedUtterance) -> Tuple[str, str]:
+        """
+        Transcribe with the best backend, falling back to the next on failure.
+
+        The utterance's stage report is completed with the backend, codec,
+        bytes sent and recognition time, logged, and kept in `reports`.
+
+        Args:
+            utterance (PreparedUtterance): Resampled and trimmed audio
+
+        Returns:
+            Tuple[str, str]: (text, name of the backend that produced it)
+
+        Raises:
+            LookupError: If every backend failed or none is available
+        """
+        last_error = None
+        for backend in self.candidates():
+            try:
+                audio, codec = utterance.encoded(backend.codecs)
+            except RuntimeError as e:
+                logging.warning(f"Speech backend {backend.name} skipped: {e}")
+                last_error = e
+                continue
+            started = time.perf_counter()
+            try:
+                text = backend.transcribe(audio, utterance.rate, codec)
+            except Exception as e:
+                # sr signals network and quota problems with IndexError/KeyError,
+                # which subclass LookupError; only a bare LookupError means the
+                # audio itself was unintelligible and another engine won't help.
+                unintelligible = type(e) is LookupError
+                self._record(backend, time.perf_counter() - started, ok=unintelligible)
+                logging.warning(f"Speech backend {backend.name} failed: {e}")
+                if unintelligible:
+                    raise
+                last_error = e
+                continue
+            elapsed = time.perf_counter() - started
+            self._record(backend, elapsed, ok=True)
+            utterance.report.update({"backend": backend.name, "codec": codec,
+                                     "sent_bytes": len(audio), "recognize_s": elapsed})
+            self.reports.append(dict(utterance.report))
+            logging.info("Recognition: %s", audio_encoding.format_report(utterance.report))
+            return text, backend.name
+        raise LookupError(f"No speech backend could transcribe the audio: {last_error}")
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Report per-backend latency and outcome counters.
+
+        Returns:
+            Dict[str, dict]: Backend name -> mean latency, ok/failed counts and cool-down state
+        """
+        now = time.monotonic()
+        with self.lock:
+            return {
+                backend.name: {
+                    "available": backend.available,
+                    "latency": self.latencies.get(backend.name),
+                    "cooling_down": self.skip_until.get(backend.name, 0) > now,
+                    **self.counts[backend.name],
+                }
+                for backend in self.backends
+            }
+
+    def _record(self, backend: RecognizerBackend, elapsed: float, ok: bool) -> None:
+        with self.lock:
+            # The first call after a cool-down re-measures from scratch
+            previous = None if self.skip_until.pop(backend.name, None) else self.latencies.get(backend.name)
+            latency = elapsed if previous is None else previous + self.smoothing * (elapsed - previous)
+            self.latencies[backend.name] = latency
+            self.counts[backend.name]["ok" if ok else "failed"] += 1
+            if not backend.offline and (not ok or latency > self.latency_budget):
+                self.skip_until[backend.name] = time.monotonic() + self.cooldown
+                logging.warning("Skipping %s for %.0fs (mean latency %.2fs, last call %s)",
+                                backend.name, self.cooldown, latency, "ok" if ok else "failed")
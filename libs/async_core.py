@@ -0,0 +1,168 @@
+"""
+Asyncio core for the network-bound request path.
+
+Handlers still run on the command scheduler's worker thread, but the I/O they
+wait on (weather, news, LLM and TTS requests) runs as coroutines on one event
+loop owned by a background thread, so independent requests overlap instead of
+adding up. The loop shares one httpx.AsyncClient built from the process-wide
+pool policy (libs/http_client.py), keeping connections alive between requests;
+the Groq and OpenAI SDK clients are handed the same client as their http_client.
+
+Two bridges connect the loop with the blocking world:
+
+- run() / submit(): blocking code (handlers) runs a coroutine on the loop and
+  waits for, or later collects, its result;
+- to_thread(): coroutines hand blocking calls (audio playback, GPIO, SDK calls
+  without an async variant) to a small thread pool so the loop never blocks.
+"""
+
+import asyncio
+import logging
+import functools
+import threading
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+import libs.http_client as http_client
+
+DEFAULT_TIMEOUT_S = 10.0
+
+class AsyncCore:
+    """
+    Event loop running in a background thread, with a shared HTTP client.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): The loop, once started
+        client (httpx.AsyncClient): Shared pooled HTTP client, created on the loop
+        timeout (float): Seconds to wait for the loop when closing the core
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT_S, blocking_workers: int = 4):
+        self.timeout = timeout
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.client: Optional[httpx.AsyncClient] = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.blocking = concurrent.futures.ThreadPoolExecutor(max_workers=blocking_workers,
+                                                              thread_name_prefix="async-blocking")
+
+    def start(self) -> None:
+        """Start the loop thread if it is not running yet."""
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self._run, name="async-core", daemon=True)
+            self.thread.start()
+        self.ready.wait()
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and wait for its result (from blocking code only).
+
+        Args:
+            coro (Awaitable): Coroutine to run
+            timeout (float, optional): Seconds to wait; the coroutine is cancelled when it expires
+
+        Returns:
+            Any: The coroutine's result
+
+        Raises:
+            RuntimeError: If called from the loop thread, where it would deadlock
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop without waiting for it.
+
+        Args:
+            coro (Awaitable): Coroutine to run
+
+        Returns:
+            concurrent.futures.Future: Future of the coroutine's result
+        """
+        self.start()
+        if threading.current_thread() is self.thread:
+            coro.close()
+            raise RuntimeError("AsyncCore.run() called from the event loop thread; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def to_thread(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking call in the worker pool without blocking the loop.
+
+        Args:
+            fn (Callable): Blocking function
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Any: The function's result
+        """
+        return await asyncio.get_running_loop().run_in_executor(self.blocking, functools.partial(fn, *args, **kwargs))
+
+    async def get_json(self, url: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> Any:
+        """
+        GET a URL and decode its JSON body.
+
+        Args:
+            url (str): Request URL
+            params (dict, optional): Query parameters
+            timeout (float, optional): Request timeout. Defaults to the pool's timeouts.
+
+        Returns:
+            Any: Decoded JSON
+
+        Raises:
+            httpx.HTTPError: On transport errors and non-2xx responses
+        """
+        response = await self.client.get(url, params=params, timeout=timeout or httpx.USE_CLIENT_DEFAULT)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self) -> None:
+        """Close the HTTP client and stop the loop."""
+        if self.thread is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.client.aclose(), self.loop).result(self.timeout)
+        except Exception as e:
+            logging.error(f"Error closing the HTTP client: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=self.timeout)
+        self.thread = None
+        self.ready.clear()
+
+    def _run(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.client = http_client.get_pool().async_client()
+        self.loop.call_soon(self.ready.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+_core = None
+_core_lock = threading.Lock()
+
+def get_core() -> AsyncCore:
+    """
+    Return the process-wide async core, creating it on first use.
+
+    Returns:
+        AsyncCore: The shared core (its loop starts on the first request)
+    """
+    global _core
+    with _core_lock:
+        if _core is None:
+            _core = AsyncCore()
+        return _core
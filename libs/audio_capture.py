@@ -0,0 +1,262 @@
+"""
+Persistent microphone capture.
+
+The microphone is opened once and kept running. Every frame goes into a ring
+buffer of 16-bit samples addressed by absolute sample position, together with
+its RMS energy. The noise floor is estimated continuously from the quietest
+recent frames, so listening needs no per-command ambient calibration, and a
+short pre-roll from before the trigger is included so the first syllables are
+not lost. End of speech is decided by the VAD endpointer in libs/vad.py.
+"""
+
+import time
+import logging
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+import pyaudio  # type: ignore
+import speech_recognition as sr  # type: ignore
+
+class CaptureStream(sr.AudioSource):
+    """
+    Always-on microphone stream with a sample ring buffer and noise-floor tracking.
+
+    Subclasses sr.AudioSource so sr.Recognizer can encode its audio.
+
+    Attributes:
+        SAMPLE_RATE (int): Capture rate in Hz
+        SAMPLE_WIDTH (int): Bytes per sample
+        CHANNELS (int): Always 1 (mono)
+        CHUNK (int): Frames per device buffer
+        buffer (np.ndarray): Ring buffer of int16 samples
+        energies (np.ndarray): Ring buffer of per-chunk RMS energies
+        position (int): Absolute index of the next sample to be written
+        noise_floor (float): Current noise-floor RMS estimate
+        last_time (float): time.monotonic() when the latest chunk arrived
+        listen_start (int): Absolute position where the last listen() began reading
+    """
+
+    def __init__(self, device_index: Optional[int] = None, sample_rate: int = 16000, chunk_size: int = 512,
+                 buffer_seconds: float = 30.0, noise_window_seconds: float = 5.0, noise_percentile: float = 20.0):
+        """
+        Initialize the capture stream (the device is opened by start()).
+
+        Args:
+            device_index (int, optional): PyAudio input device. Defaults to the system default.
+            sample_rate (int, optional): Capture rate in Hz. Defaults to 16000.
+            chunk_size (int, optional): Frames per device buffer. Defaults to 512.
+            buffer_seconds (float, optional): Ring buffer length. Defaults to 30.
+            noise_window_seconds (float, optional): History used for the noise floor. Defaults to 5.
+            noise_percentile (float, optional): Percentile of recent energies taken as the floor. Defaults to 20.
+        """
+        self.device_index = device_index
+        self.SAMPLE_RATE = sample_rate
+        self.SAMPLE_WIDTH = 2
+        self.CHANNELS = 1
+        self.CHUNK = chunk_size
+        # A whole number of chunks, so chunk-aligned frames never wrap (see view())
+        self.capacity = -(-int(buffer_seconds * sample_rate) // chunk_size) * chunk_size
+        self.buffer = np.zeros(self.capacity, dtype=np.int16)
+        self.energy_capacity = self.capacity // chunk_size
+        self.energies = np.zeros(self.energy_capacity, dtype=np.float32)
+        self.noise_chunks = max(1, int(noise_window_seconds * sample_rate / chunk_size))
+        self.noise_percentile = noise_percentile
+        self.position = 0
+        self.chunk_count = 0
+        self.noise_floor = 0.0
+        self.last_time = 0.0
+        self.listen_start = 0
+        self.overflows = 0
+        self.condition = threading.Condition()
+        self.audio = None
+        self.stream = None
+
+    def start(self) -> None:
+        """Open the microphone and start filling the ring buffer."""
+        if self.stream is not None:
+            return
+        self.audio = pyaudio.PyAudio()
+        self.stream = self.audio.open(
+            input_device_index=self.device_index,
+            format=pyaudio.paInt16,
+            rate=self.SAMPLE_RATE,
+            channels=self.CHANNELS,
+            frames_per_buffer=self.CHUNK,
+            input=True,
+            stream_callback=self._on_audio,
+        )
+        self.stream.start_stream()
+        logging.info("Capture stream started at %d Hz", self.SAMPLE_RATE)
+
+    def stop(self) -> None:
+        """Close the microphone."""
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+        if self.audio is not None:
+            self.audio.terminate()
+            self.audio = None
+        logging.info("Capture stream stopped.")
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """
+        Copy samples [start, end) out of the ring buffer.
+
+        Args:
+            start (int): Absolute start position
+            end (int): Absolute end position
+
+        Returns:
+            np.ndarray: int16 samples; the part older than the buffer is dropped
+        """
+        start = max(start, end - self.capacity, 0)
+        if end <= start:
+            return np.zeros(0, dtype=np.int16)
+        first, last = start % self.capacity, end % self.capacity
+        if first < last:
+            return self.buffer[first:last].copy()
+        return np.concatenate((self.buffer[first:], self.buffer[:last]))
+
+    def view(self, start: int, end: int) -> np.ndarray:
+        """
+        Return samples [start, end) as a view into the ring buffer when they do not wrap.
+
+        Views avoid copying for consumers that process audio immediately (wake-word
+        detector, VAD); the data is overwritten once the buffer wraps around.
+
+        Args:
+            start (int): Absolute start position
+            end (int): Absolute end position
+
+        Returns:
+            np.ndarray: int16 samples (a copy only if the span wraps)
+        """
+        start = max(start, end - self.capacity, 0)
+        first = start % self.capacity
+        if first + (end - start) <= self.capacity:
+            return self.buffer[first:first + max(0, end - start)]
+        return self.read(start, end)
+
+    def wait_for(self, position: int, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the write position reaches the given sample.
+
+        Args:
+            position (int): Absolute sample position
+            timeout (float, optional): Seconds to wait
+
+        Returns:
+            bool: True if the position was reached
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: self.position >= position, timeout)
+
+    def time_of(self, position: int) -> float:
+        """
+        Estimate when a sample was captured.
+
+        Args:
+            position (int): Absolute sample position
+
+        Returns:
+            float: time.monotonic() value at which the sample arrived
+        """
+        return self.last_time - (self.position - position) / self.SAMPLE_RATE
+
+    def listen(self, endpointer, pre_roll: float = 0.3, timeout: Optional[float] = 5.0,
+               on_chunk: Optional[Callable[[np.ndarray], bool]] = None,
+               start_position: Optional[int] = None) -> Optional[bytes]:
+        """
+        Capture one utterance from the running stream.
+
+        Audio from pre_roll seconds before the call is included in the search
+        for speech. The endpointer decides when the utterance is over, and only
+        its trimmed span is returned.
+
+        Args:
+            endpointer (vad.Endpointer): Endpointer configured for this stream's sample rate
+            pre_roll (float, optional): Seconds of audio before the call to consider. Defaults to 0.3.
+            timeout (float, optional): Seconds to wait for speech to begin. Defaults to 5.
+            on_chunk (Callable, optional): Called with every new block of samples; returning
+                True stops listening at once (e.g. a streaming recognizer committed early)
+            start_position (int, optional): Absolute position to start from instead of the
+                pre-roll, e.g. where the wake word ended
+
+        Returns:
+            Optional[bytes]: Raw 16-bit PCM (everything read so far if on_chunk stopped
+                listening), or None if no speech started before the timeout
+        """
+        if start_position is None:
+            start_position = self.position - int(pre_roll * self.SAMPLE_RATE)
+        start = max(0, start_position, self.position - self.capacity + self.CHUNK)
+        self.listen_start = start
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        endpointer.reset()
+        cursor = start
+        while True:
+            if not self.wait_for(cursor + self.CHUNK, 1.0):
+                logging.warning("Capture stream delivered no audio for 1s")
+                return None
+            end = self.position
+            samples = self.view(cursor, end)
+            if on_chunk is not None and on_chunk(samples):
+                return self.read(start, end).tobytes()
+            if endpointer.feed(samples, self.noise_floor):
+                span_start, span_end = endpointer.trimmed()
+                return self.read(start + span_start, start + span_end).tobytes()
+            cursor = end
+            if not endpointer.speech_started and deadline is not None and time.monotonic() > deadline:
+                return None
+
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """PyAudio callback: append a chunk and update the noise floor."""
+        if status & pyaudio.paInputOverflow:
+            self.overflows += 1
+        samples = np.frombuffer(in_data, dtype=np.int16)
+        energy = float(np.sqrt(np.mean(samples.astype(np.float32) ** 2))) if len(samples) else 0.0
+        with self.condition:
+            first = self.position % self.capacity
+            count = len(samples)
+            if first + count <= self.capacity:
+                self.buffer[first:first + count] = samples
+            else:
+                split = self.capacity - first
+                self.buffer[first:] = samples[:split]
+                self.buffer[:count - split] = samples[split:]
+            self.position += count
+            self.last_time = time.monotonic()
+            self.energies[self.chunk_count % self.energy_capacity] = energy
+            self.chunk_count += 1
+            self._update_noise_floor()
+            self.condition.notify_all()
+        return (None, pyaudio.paContinue)
+
+    def _update_noise_floor(self) -> None:
+        """Take a low percentile of recent chunk energies as the noise floor."""
+        if self.chunk_count % 8:
+            return
+        count = min(self.chunk_count, self.noise_chunks)
+        indices = np.arange(self.chunk_count - count, self.chunk_count) % self.energy_capacity
+        self.noise_floor = float(np.percentile(self.energies[indices], self.noise_percentile))
+
+_capture = None
+_capture_lock = threading.Lock()
+
+def get_capture(**kwargs) -> CaptureStream:
+    """
+    Return the process-wide capture stream, opening it on first use.
+
+    Args:
+        **kwargs: CaptureStream arguments, used only when the stream is created
+
+    Returns:
+        CaptureStream: The shared, running capture stream
+    """
+    global _capture
+    with _capture_lock:
+        if _capture is None:
+            _capture = CaptureStream(**kwargs)
+            _capture.start()
+        return _capture
@@ -0,0 +1,215 @@
+"""
+Compact encoding of captured speech before recognition.
+
+Captured utterances are prepared in three stages before they are handed to a
+recognition backend:
+
+1. resample to 16 kHz mono, the rate recognizers are trained on;
+2. trim leading and trailing non-speech with the VAD;
+3. encode with the most compact codec the backend accepts
+   ('flac' via the flac CLI, or raw 'pcm').
+
+The bytes produced and the time spent are recorded per stage.
+"""
+
+import time
+import shutil
+import logging
+import subprocess
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+TARGET_RATE = 16000
+
+def lowpass_kernel(cutoff: float, taps: int = 63) -> np.ndarray:
+    """
+    Build a Hamming-windowed sinc low-pass filter.
+
+    Args:
+        cutoff (float): Cutoff as a fraction of the input sample rate (0-0.5)
+        taps (int, optional): Filter length. Defaults to 63.
+
+    Returns:
+        np.ndarray: Normalized filter coefficients
+    """
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return kernel / kernel.sum()
+
+def resample(samples: np.ndarray, from_rate: int, to_rate: int = TARGET_RATE) -> np.ndarray:
+    """
+    Resample int16 mono audio, low-pass filtering first when downsampling.
+
+    Args:
+        samples (np.ndarray): int16 mono samples
+        from_rate (int): Input sample rate
+        to_rate (int, optional): Output sample rate. Defaults to 16000.
+
+    Returns:
+        np.ndarray: int16 samples at to_rate
+    """
+    if from_rate == to_rate or len(samples) == 0:
+        return samples
+    data = samples.astype(np.float32)
+    if to_rate < from_rate:
+        data = np.convolve(data, lowpass_kernel(0.45 * to_rate / from_rate), mode="same")
+    if from_rate % to_rate == 0:
+        data = data[::from_rate // to_rate]
+    else:
+        positions = np.arange(0, len(data), from_rate / to_rate)
+        data = np.interp(positions, np.arange(len(data)), data)
+    return np.clip(data, -32768, 32767).astype(np.int16)
+
+def trim(samples: np.ndarray, vad, noise_floor: float, pad_ms: int = 100) -> np.ndarray:
+    """
+    Cut leading and trailing non-speech, keeping a small pad.
+
+    Args:
+        samples (np.ndarray): int16 mono samples at vad.sample_rate
+        vad (VoiceActivityDetector): Frame classifier
+        noise_floor (float): Background RMS energy
+        pad_ms (int, optional): Audio kept around the speech. Defaults to 100.
+
+    Returns:
+        np.ndarray: Trimmed samples (unchanged if no speech frame is found)
+    """
+    speech = np.flatnonzero(vad.classify(samples, noise_floor))
+    if len(speech) == 0:
+        return samples
+    pad = int(pad_ms * vad.sample_rate / 1000)
+    start = max(0, speech[0] * vad.frame_length - pad)
+    end = min(len(samples), (speech[-1] + 1) * vad.frame_length + pad)
+    return samples[start:end]
+
+def encode(samples: np.ndarray, rate: int, codec: str) -> bytes:
+    """
+    Encode int16 mono samples.
+
+    Args:
+        samples (np.ndarray): int16 mono samples
+        rate (int): Sample rate
+        codec (str): 'pcm' or 'flac'
+
+    Returns:
+        bytes: Encoded audio
+
+    Raises:
+        ValueError: If the codec is unknown
+        RuntimeError: If the encoder is not installed or fails
+    """
+    pcm = samples.astype(np.int16).tobytes()
+    if codec == "pcm":
+        return pcm
+    if codec == "flac":
+        command = ["flac", "--stdout", "--totally-silent", "--best", "--force-raw-format", "--endian=little",
+                   "--sign=signed", "--channels=1", "--bps=16", f"--sample-rate={rate}", "-"]
+    else:
+        raise ValueError(f"Unknown codec: {codec}")
+    if shutil.which(command[0]) is None:
+        raise RuntimeError(f"{command[0]} is not installed")
+    result = subprocess.run(command, input=pcm, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError(f"{codec} encoding failed: {result.stderr.decode(errors='ignore').strip()}")
+    return result.stdout
+
+def codec_available(codec: str) -> bool:
+    """
+    Check whether a codec's encoder is installed.
+
+    Args:
+        codec (str): 'pcm' or 'flac'
+
+    Returns:
+        bool: True if encode() can produce the codec
+    """
+    return {"pcm": True, "flac": shutil.which("flac") is not None}.get(codec, False)
+
+class PreparedUtterance:
+    """
+    A captured utterance resampled and trimmed, with encodings made on demand.
+
+    Attributes:
+        samples (np.ndarray): 16 kHz int16 mono samples after trimming
+        rate (int): Sample rate of samples
+        report (dict): Bytes and seconds per stage
+    """
+
+    def __init__(self, frame_data: bytes, sample_rate: int, vad=None, noise_floor: float = 0.0,
+                 target_rate: int = TARGET_RATE):
+        """
+        Resample and trim captured audio.
+
+        Args:
+            frame_data (bytes): Raw 16-bit mono PCM as captured
+            sample_rate (int): Capture sample rate
+            vad (VoiceActivityDetector, optional): Classifier at target_rate used for trimming
+            noise_floor (float, optional): Background RMS energy for trimming
+            target_rate (int, optional): Recognition sample rate. Defaults to 16000.
+        """
+        self.report = {"captured_bytes": len(frame_data), "captured_rate": sample_rate}
+        samples = np.frombuffer(frame_data, dtype=np.int16)
+
+        started = time.perf_counter()
+        samples = resample(samples, sample_rate, target_rate)
+        self.report["resample_s"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if vad is not None:
+            samples = trim(samples, vad, noise_floor)
+        self.report["trim_s"] = time.perf_counter() - started
+        self.report["pcm_bytes"] = samples.nbytes
+
+        self.samples = samples
+        self.rate = target_rate
+        self.encodings = {}
+
+    def encoded(self, codecs: Sequence[str]) -> Tuple[bytes, str]:
+        """
+        Return the utterance in the first usable codec of a backend's preference list.
+
+        Args:
+            codecs (Sequence[str]): Codecs the backend accepts, most compact first
+
+        Returns:
+            Tuple[bytes, str]: (encoded audio, codec used)
+
+        Raises:
+            RuntimeError: If none of the codecs can be produced
+        """
+        for codec in codecs:
+            if codec in self.encodings:
+                return self.encodings[codec], codec
+            if not codec_available(codec):
+                continue
+            started = time.perf_counter()
+            try:
+                data = encode(self.samples, self.rate, codec)
+            except RuntimeError as e:
+                logging.warning(f"Falling back from {codec}: {e}")
+                continue
+            self.report[f"encode_{codec}_s"] = time.perf_counter() - started
+            self.report[f"{codec}_bytes"] = len(data)
+            self.encodings[codec] = data
+            return data, codec
+        raise RuntimeError(f"None of the codecs {list(codecs)} is available")
+
+def format_report(report: Dict[str, float]) -> str:
+    """
+    Render a stage report as a single log line.
+
+    Args:
+        report (Dict[str, float]): Report from PreparedUtterance plus recognition fields
+
+    Returns:
+        str: Human-readable summary
+    """
+    parts = []
+    for key, value in report.items():
+        if key.endswith("_s"):
+            parts.append(f"{key[:-2]} {value * 1000:.0f}ms")
+        elif key.endswith("_bytes"):
+            parts.append(f"{key[:-6]} {value}B")
+        else:
+            parts.append(f"{key} {value}")
+    return ", ".join(parts)
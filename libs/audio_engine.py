@@ -0,0 +1,568 @@
+"""
+In-process audio output engine.
+
+One long-lived engine owns all sound output. It drives the pygame mixer that
+PygameManager has already initialized, exposing named channels ('voice',
+'chime', 'alarm' on reserved mixer channels, and 'music' on the mixer's music
+stream) with a non-blocking play/queue/cancel API. Nothing forks a process to
+make a sound. Each channel reports its queue depth and underrun count.
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Optional
+
+import numpy as np
+import libs.pygame_manager as pygame_manager
+
+SOUND_CHANNELS = ('voice', 'chime', 'alarm')
+MUSIC_CHANNEL = 'music'
+
+# Maximum buffered stream chunks before StreamItem.write() blocks
+STREAM_BUFFER_CHUNKS = 32
+
+# Decoded audio files kept by AudioEngine.load_file()
+SOUND_CACHE_SIZE = 32
+
+class Resampler:
+    """
+    Linear-interpolation resampler for 16-bit PCM fed in chunks.
+
+    The fractional read position and the last input frame are carried from
+    one chunk to the next, so a stream resampled chunk by chunk is identical
+    to the whole stream resampled at once: no clicks at chunk boundaries and
+    no drift from dropped phase.
+
+    Attributes:
+        step (float): Input frames per output frame
+        phase (float): Read position of the next output frame, relative to the carried frame
+    """
+
+    def __init__(self, rate: int, target_rate: int):
+        self.step = rate / target_rate
+        self.phase = 0.0
+        self.last = None
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Resample the next chunk of a stream.
+
+        Args:
+            samples (np.ndarray): int16 frames, shape (frames, channels)
+
+        Returns:
+            np.ndarray: int16 frames at the target rate
+        """
+        if self.step == 1 or not len(samples):
+            return samples
+        frames = samples.astype(np.float64)
+        if self.last is not None:
+            frames = np.concatenate([self.last, frames])
+        end = len(frames) - 1
+        count = int(np.floor((end - self.phase) / self.step)) + 1 if end >= self.phase else 0
+        positions = self.phase + self.step * np.arange(count)
+        self.phase += count * self.step - end
+        self.last = frames[-1:]
+        indices = np.arange(len(frames))
+        resampled = np.stack([np.interp(positions, indices, frames[:, c]) for c in range(frames.shape[1])], axis=1)
+        return np.round(resampled).astype(np.int16)
+
+class PlaybackItem:
+    """
+    Handle for a sound submitted to a channel.
+
+    Attributes:
+        sound (pygame.mixer.Sound): Sound to play, or None for a stream
+        done (threading.Event): Set once the item finished or was cancelled
+        cancelled (bool): Whether the item was cancelled before it finished
+    """
+
+    def __init__(self, sound=None):
+        self.sound = sound
+        self.done = threading.Event()
+        self.cancelled = False
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the item has finished playing.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to no limit.
+
+        Returns:
+            bool: True if the item finished, False on timeout
+        """
+        return self.done.wait(timeout)
+
+    def cancel(self) -> None:
+        """Stop the item, whether it is queued or playing."""
+        self.cancelled = True
+
+class StreamItem(PlaybackItem):
+    """
+    Playback handle fed incrementally with PCM, for audio still being synthesized.
+
+    Attributes:
+        rate (int): Sample rate of the written PCM
+        channels (int): Channel count of the written PCM
+        chunks (deque): Converted chunks waiting to be played
+        closed (bool): Whether the writer has finished
+        resampler (Resampler): Rate conversion to the mixer rate, continuous across writes
+    """
+
+    def __init__(self, engine: 'AudioEngine', rate: int, channels: int):
+        super().__init__()
+        self.engine = engine
+        self.rate = rate
+        self.channels = channels
+        self.resampler = Resampler(rate, engine.mixer_format[0])
+        self.chunks = deque()
+        self.closed = False
+        self.space = threading.Condition()
+
+    def write(self, data: bytes) -> None:
+        """
+        Append 16-bit PCM to the stream, blocking while too much is buffered.
+
+        Args:
+            data (bytes): Interleaved 16-bit PCM at the stream's rate and channel count
+        """
+        sound = self.engine.make_pcm_sound(data, self.rate, self.channels, resampler=self.resampler)
+        with self.space:
+            while len(self.chunks) >= STREAM_BUFFER_CHUNKS and not self.cancelled:
+                self.space.wait(0.05)
+            if not self.cancelled:
+                self.chunks.append(sound)
+
+    def close(self) -> None:
+        """Mark the stream as complete; playback ends once the buffer drains."""
+        self.closed = True
+
+    def next_chunk(self):
+        """Pop the next chunk, or None if none is buffered."""
+        with self.space:
+            if not self.chunks:
+                return None
+            chunk = self.chunks.popleft()
+            self.space.notify()
+            return chunk
+
+class SoundChannel:
+    """
+    A named output channel backed by one reserved pygame mixer channel.
+
+    Attributes:
+        name (str): Channel name
+        mixer_channel (pygame.mixer.Channel): Underlying mixer channel
+        pending (deque): Items waiting to play
+        current (PlaybackItem): Item currently playing
+        underruns (int): Times a stream ran dry while it was still open
+        played (int): Items that finished playing
+        cancelled (int): Items that were cancelled
+    """
+
+    def __init__(self, name: str, mixer_channel):
+        self.name = name
+        self.mixer_channel = mixer_channel
+        self.pending = deque()
+        self.current = None
+        self.underruns = 0
+        self.played = 0
+        self.cancelled = 0
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name=f"audio-{name}", daemon=True)
+        self.thread.start()
+
+    def submit(self, item: PlaybackItem, interrupt: bool = False) -> PlaybackItem:
+        """
+        Add an item to the channel.
+
+        Args:
+            item (PlaybackItem): Item to play
+            interrupt (bool, optional): Cancel whatever is playing or queued first
+
+        Returns:
+            PlaybackItem: The submitted item
+        """
+        with self.condition:
+            if interrupt:
+                self._cancel_locked()
+            self.pending.append(item)
+            self.condition.notify()
+        return item
+
+    def cancel(self) -> None:
+        """Stop the current item and drop everything queued."""
+        with self.condition:
+            self._cancel_locked()
+
+    def queue_depth(self) -> int:
+        """Return the number of items and buffered stream chunks waiting to play."""
+        depth = len(self.pending)
+        current = self.current
+        if isinstance(current, StreamItem):
+            depth += len(current.chunks)
+        return depth
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue_depth(),
+            "underruns": self.underruns,
+            "played": self.played,
+            "cancelled": self.cancelled,
+            "busy": self.current is not None,
+        }
+
+    def _cancel_locked(self) -> None:
+        for item in self.pending:
+            item.cancel()
+            item.done.set()
+            self.cancelled += 1
+        self.pending.clear()
+        if self.current is not None:
+            self.current.cancel()
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                item = self.pending.popleft()
+                self.current = item
+            try:
+                if isinstance(item, StreamItem):
+                    self._play_stream(item)
+                else:
+                    self._play_sound(item)
+            except Exception as e:
+                logging.error(f"Error playing audio on channel {self.name}: {e}")
+            finally:
+                if item.cancelled:
+                    self.mixer_channel.stop()
+                    self.cancelled += 1
+                else:
+                    self.played += 1
+                self.current = None
+                item.done.set()
+
+    def _play_sound(self, item: PlaybackItem) -> None:
+        self.mixer_channel.play(item.sound)
+        while self.mixer_channel.get_busy() and not item.cancelled:
+            time.sleep(0.01)
+
+    def _play_stream(self, item: StreamItem) -> None:
+        started = False
+        starved = False
+        while not item.cancelled:
+            if self.mixer_channel.get_queue() is None:
+                chunk = item.next_chunk()
+                if chunk is not None:
+                    if self.mixer_channel.get_busy():
+                        self.mixer_channel.queue(chunk)
+                    else:
+                        self.mixer_channel.play(chunk)
+                    started = True
+                    starved = False
+                    continue
+                if item.closed:
+                    break
+                if started and not self.mixer_channel.get_busy() and not starved:
+                    # Writer is still open but the device has nothing left to play
+                    self.underruns += 1
+                    starved = True
+            time.sleep(0.005)
+        while self.mixer_channel.get_busy() and not item.cancelled:
+            time.sleep(0.01)
+
+class MusicChannel:
+    """
+    The 'music' channel, backed by the mixer's streaming music player.
+
+    MusicPlayer drives all music output through it. pygame can hold only one
+    queued track, so queue depth is 0 or 1.
+    """
+
+    def __init__(self):
+        self.name = MUSIC_CHANNEL
+        self.queued = 0
+        self.played = 0
+        self.cancelled = 0
+        self.paused = False
+
+    def play(self, file_path: str) -> None:
+        """
+        Play a track now, replacing the current one; its end posts PygameManager.END_EVENT.
+
+        Args:
+            file_path (str): Path of the track
+        """
+        pygame_manager.PygameManager.load_and_play(file_path)
+        pygame_manager.PygameManager.set_end_event()
+        self.queued = 0
+        self.paused = False
+        self.played += 1
+
+    def queue(self, file_path: str) -> None:
+        pygame_manager.PygameManager.queue(file_path)
+        self.queued = 1
+
+    def pause(self) -> None:
+        pygame_manager.PygameManager.pause()
+        self.paused = True
+
+    def unpause(self) -> None:
+        pygame_manager.PygameManager.unpause()
+        self.paused = False
+
+    def seek(self, seconds: float) -> None:
+        """
+        Move playback of the current track by a number of seconds.
+
+        Args:
+            seconds (float): Offset from the current position
+        """
+        pygame_manager.PygameManager.set_position(pygame_manager.PygameManager.get_position() + seconds)
+
+    def set_volume(self, volume: int) -> None:
+        """
+        Set the music volume.
+
+        Args:
+            volume (int): Volume level from 0-100
+        """
+        pygame_manager.PygameManager.set_volume(volume)
+
+    def cancel(self) -> None:
+        pygame_manager.PygameManager.stop()
+        self.queued = 0
+        self.paused = False
+        self.cancelled += 1
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queued,
+            "underruns": 0,
+            "played": self.played,
+            "cancelled": self.cancelled,
+            "paused": self.paused,
+            "busy": bool(pygame_manager.PygameManager.is_busy()),
+        }
+
+class AudioEngine:
+    """
+    Long-lived owner of all audio output.
+
+    Attributes:
+        channels (dict): Channel name -> SoundChannel
+        music (MusicChannel): The music channel
+        mixer_format (tuple): (frequency, size, channels) of the mixer
+        sounds (OrderedDict): File path -> decoded Sound, least recently used first
+    """
+
+    def __init__(self):
+        pygame_manager.PygameManager.initialize()
+        self.mixer_format = pygame_manager.PygameManager.get_mixer_format()
+        mixer_channels = pygame_manager.PygameManager.reserve_channels(len(SOUND_CHANNELS))
+        self.channels = {
+            name: SoundChannel(name, mixer_channel)
+            for name, mixer_channel in zip(SOUND_CHANNELS, mixer_channels)
+        }
+        self.music = MusicChannel()
+        self.sounds = OrderedDict()
+        self.sounds_lock = threading.Lock()
+        logging.info("AudioEngine initialized with mixer format %s", self.mixer_format)
+
+    def play(self, channel: str, sound, block: bool = False) -> PlaybackItem:
+        """
+        Play a sound now, cancelling anything playing or queued on the channel.
+
+        Args:
+            channel (str): Channel name
+            sound (pygame.mixer.Sound): Sound to play
+            block (bool, optional): Wait until it finishes. Defaults to False.
+
+        Returns:
+            PlaybackItem: Handle for the sound
+        """
+        item = self.channels[channel].submit(PlaybackItem(sound), interrupt=True)
+        if block:
+            item.wait()
+        return item
+
+    def queue(self, channel: str, sound, block: bool = False) -> PlaybackItem:
+        """
+        Play a sound after everything already queued on the channel.
+
+        Args:
+            channel (str): Channel name
+            sound (pygame.mixer.Sound): Sound to play
+            block (bool, optional): Wait until it finishes. Defaults to False.
+
+        Returns:
+            PlaybackItem: Handle for the sound
+        """
+        item = self.channels[channel].submit(PlaybackItem(sound))
+        if block:
+            item.wait()
+        return item
+
+    def play_file(self, channel: str, file_path: str, block: bool = False) -> PlaybackItem:
+        """
+        Decode an audio file (cached for repeated use) and queue it on a channel.
+
+        Args:
+            channel (str): Channel name
+            file_path (str): Path of the audio file
+            block (bool, optional): Wait until it finishes. Defaults to False.
+
+        Returns:
+            PlaybackItem: Handle for the sound
+        """
+        return self.queue(channel, self.load_file(file_path), block=block)
+
+    def open_stream(self, channel: str, rate: int, channels: int = 1) -> StreamItem:
+        """
+        Queue a stream that is fed with PCM as it becomes available.
+
+        Args:
+            channel (str): Channel name
+            rate (int): Sample rate of the PCM that will be written
+            channels (int, optional): Channel count of the PCM. Defaults to 1.
+
+        Returns:
+            StreamItem: Handle to write PCM to and close
+        """
+        item = StreamItem(self, rate, channels)
+        self.channels[channel].submit(item)
+        return item
+
+    def cancel(self, channel: str) -> None:
+        """
+        Stop the channel and drop its queue.
+
+        Args:
+            channel (str): Channel name
+        """
+        if channel == MUSIC_CHANNEL:
+            self.music.cancel()
+        else:
+            self.channels[channel].cancel()
+
+    def stats(self) -> dict:
+        """
+        Report per-channel counters.
+
+        Returns:
+            dict: Channel name -> queue depth, underruns, played, cancelled and busy flag
+        """
+        stats = {name: channel.stats() for name, channel in self.channels.items()}
+        stats[MUSIC_CHANNEL] = self.music.stats()
+        return stats
+
+    def make_pcm_sound(self, data: bytes, rate: int, channels: int, resampler: Optional[Resampler] = None):
+        """
+        Build a mixer Sound from 16-bit PCM, resampling to the mixer format if needed.
+
+        Args:
+            data (bytes): Interleaved 16-bit PCM
+            rate (int): Sample rate of data
+            channels (int): Channel count of data
+            resampler (Resampler, optional): Resampler of the stream data belongs to, so the
+                conversion continues from the previous chunk. Defaults to resampling data on its own.
+
+        Returns:
+            pygame.mixer.Sound: Sound in the mixer's format
+        """
+        mixer_rate, _size, mixer_channels = self.mixer_format
+        samples = np.frombuffer(data, dtype=np.int16).reshape(-1, channels)
+        samples = (resampler or Resampler(rate, mixer_rate)).process(samples)
+        if channels != mixer_channels:
+            samples = np.repeat(samples.mean(axis=1, keepdims=True).astype(np.int16), mixer_channels, axis=1)
+        return pygame_manager.PygameManager.make_sound(np.ascontiguousarray(samples))
+
+    def load_file(self, file_path: str):
+        """
+        Decode an audio file into a mixer Sound, reusing the last SOUND_CACHE_SIZE decoded files.
+
+        Args:
+            file_path (str): Path of the audio file
+
+        Returns:
+            pygame.mixer.Sound: Decoded sound in the mixer's format
+        """
+        with self.sounds_lock:
+            if file_path in self.sounds:
+                self.sounds.move_to_end(file_path)
+                return self.sounds[file_path]
+
+        from pydub import AudioSegment  # type: ignore
+
+        mixer_rate, _size, mixer_channels = self.mixer_format
+        segment = AudioSegment.from_file(file_path)
+        segment = segment.set_frame_rate(mixer_rate).set_channels(mixer_channels).set_sample_width(2)
+        sound = pygame_manager.PygameManager.make_sound(segment.raw_data)
+        with self.sounds_lock:
+            self.sounds[file_path] = sound
+            while len(self.sounds) > SOUND_CACHE_SIZE:
+                self.sounds.popitem(last=False)
+        return sound
+
+    def forget_file(self, file_path: Optional[str] = None) -> None:
+        """
+        Drop a decoded file from the cache so the next load_file() decodes it again.
+
+        Args:
+            file_path (str, optional): Path of the audio file; None drops every cached file
+        """
+        with self.sounds_lock:
+            if file_path is None:
+                self.sounds.clear()
+            else:
+                self.sounds.pop(file_path, None)
+
+class EngineSink:
+    """
+    PCM sink for StreamingSpeaker that writes into an engine channel.
+
+    Each open()/close() pair becomes one stream item on the channel; close()
+    blocks until the stream has been played or cancelled, like a device drain.
+    """
+
+    def __init__(self, engine: AudioEngine, channel: str = 'voice', rate: int = 24000, channels: int = 1):
+        self.engine = engine
+        self.channel = channel
+        self.rate = rate
+        self.channels = channels
+        self.stream = None
+
+    def open(self) -> None:
+        self.stream = self.engine.open_stream(self.channel, self.rate, self.channels)
+
+    def write(self, data: bytes) -> None:
+        if self.stream is None:
+            self.open()
+        self.stream.write(data)  # type: ignore
+
+    def close(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+            self.stream.wait()
+            self.stream = None
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> AudioEngine:
+    """
+    Return the process-wide audio engine, creating it on first use.
+
+    Returns:
+        AudioEngine: The shared engine
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = AudioEngine()
+        return _engine
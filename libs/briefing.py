@@ -0,0 +1,395 @@
+"""
+Precomputed morning briefing.
+
+The briefing is made of segments (greeting, weather, news), each a list of
+sentences with their rendered PCM. Segments are kept on disk in a bundle
+directory (a manifest.json plus one .pcm file per sentence) together with
+their creation time and a key describing their inputs (the date for the
+greeting, the city for the weather). A segment is fresh while it is younger
+than its TTL and its key still matches.
+
+A precompute job builds the whole bundle shortly before the configured wake
+time, so "good morning" starts playing from disk at once. When the briefing
+is played, fresh segments play straight from the bundle while every stale one
+is rebuilt concurrently from the start; each sentence is synthesized as soon
+as its text is known and played, in order, as soon as its audio is ready. The
+time each segment spent fetching, synthesizing and stalling playback is logged.
+A playback can be cancelled at any point through its cancel event, which
+stops the sentence being played and abandons the segments still being built.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import datetime
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+MANIFEST = "manifest.json"
+CANCEL_POLL_S = 0.1
+
+class BriefingBundle:
+    """
+    On-disk store of rendered briefing segments.
+
+    Attributes:
+        directory (str): Bundle directory
+        ttls (Dict[str, float]): Freshness TTL of each segment, in seconds
+        segments (Dict[str, dict]): Manifest entries: texts, audio file names, key and creation time
+    """
+
+    def __init__(self, directory: str, ttls: Dict[str, float]):
+        self.directory = directory
+        self.ttls = ttls
+        self.segments = {}
+        self.load()
+
+    def load(self) -> None:
+        """Read the manifest; a missing or damaged one leaves the bundle empty."""
+        try:
+            with open(os.path.join(self.directory, MANIFEST)) as f:
+                self.segments = json.load(f).get("segments", {})
+        except FileNotFoundError:
+            self.segments = {}
+        except (OSError, ValueError) as e:
+            logging.error(f"Ignoring damaged briefing manifest: {e}")
+            self.segments = {}
+
+    def fresh(self, name: str, key: Optional[str] = None, now: Optional[float] = None) -> bool:
+        """
+        Check whether a segment can be played as stored.
+
+        Args:
+            name (str): Segment name
+            key (str, optional): Current input key of the segment
+            now (float, optional): time.time() to check against
+
+        Returns:
+            bool: True if the segment exists, matches the key, is within its TTL and its audio is on disk
+        """
+        entry = self.segments.get(name)
+        if entry is None or entry.get("key") != key:
+            return False
+        now = time.time() if now is None else now
+        if now - entry["created"] >= self.ttls.get(name, 0):
+            return False
+        return all(os.path.exists(os.path.join(self.directory, f)) for f in entry["audio"])
+
+    def texts(self, name: str) -> List[str]:
+        return list(self.segments.get(name, {}).get("texts", []))
+
+    def audio(self, name: str) -> List[bytes]:
+        """
+        Read the rendered audio of a segment.
+
+        Args:
+            name (str): Segment name
+
+        Returns:
+            List[bytes]: PCM of each sentence
+        """
+        clips = []
+        for file_name in self.segments.get(name, {}).get("audio", []):
+            with open(os.path.join(self.directory, file_name), "rb") as f:
+                clips.append(f.read())
+        return clips
+
+    def store(self, name: str, texts: List[str], audio: List[bytes], key: Optional[str] = None) -> None:
+        """
+        Replace a segment and save the manifest.
+
+        Args:
+            name (str): Segment name
+            texts (List[str]): Sentences
+            audio (List[bytes]): PCM of each sentence
+            key (str, optional): Input key the segment was built from
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = int(time.time() * 1000)
+        files = []
+        for index, clip in enumerate(audio):
+            file_name = f"{name}_{stamp}_{index}.pcm"
+            self._write(file_name, clip)
+            files.append(file_name)
+        previous = self.segments.get(name, {}).get("audio", [])
+        self.segments[name] = {"texts": list(texts), "audio": files, "key": key, "created": time.time()}
+        self._write(MANIFEST, json.dumps({"segments": self.segments}, indent=2).encode())
+        for file_name in previous:
+            try:
+                os.remove(os.path.join(self.directory, file_name))
+            except OSError:
+                pass
+
+    def _write(self, file_name: str, data: bytes) -> None:
+        path = os.path.join(self.directory, file_name)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+Source = Callable[[dict], Awaitable[Optional[List[str]]]]
+
+class Playback:
+    """
+    Cancellation handle of one briefing playback, stoppable like a SpeechPipeline.
+
+    Attributes:
+        cancel_event (threading.Event): Passed to MorningBriefing.play(); set by cancel()
+    """
+
+    def __init__(self):
+        self.cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """Stop the briefing as soon as possible."""
+        if not self.cancel_event.is_set():
+            logging.info("Cancelling briefing.")
+        self.cancel_event.set()
+
+class MorningBriefing:
+    """
+    Builds, refreshes and plays the briefing bundle on the async core's loop.
+
+    Attributes:
+        bundle (BriefingBundle): Segment store
+        sources (Dict[str, Source]): Segment name -> coroutine returning its sentences (None on failure),
+            in playback order
+        keys (Dict[str, Callable]): Segment name -> function of the context returning its input key
+        fallbacks (Dict[str, Callable]): Segment name -> function of the context returning the sentence
+            spoken (but not stored) when the source fails
+        synthesize (Callable): Coroutine rendering a sentence to PCM
+        play (Callable): Coroutine playing PCM, called with (pcm, cancel_event)
+        on_segment (Callable): Optional coroutine called with (name, ok) before a segment plays
+        to_thread (Callable): Coroutine running a blocking call off the loop, used for bundle reads
+            and writes (asyncio.to_thread by default)
+    """
+
+    def __init__(self, bundle: BriefingBundle, sources: Dict[str, Source], synthesize: Callable[[str], Awaitable[bytes]],
+                 play: Callable[[bytes, Optional[threading.Event]], Awaitable[None]], keys: Optional[Dict[str, Callable[[dict], str]]] = None,
+                 fallbacks: Optional[Dict[str, Callable[[dict], str]]] = None,
+                 on_segment: Optional[Callable[[str, bool], Awaitable[None]]] = None,
+                 to_thread: Optional[Callable[..., Awaitable]] = None):
+        self.bundle = bundle
+        self.sources = sources
+        self.synthesize = synthesize
+        self.play_audio = play
+        self.keys = keys or {}
+        self.fallbacks = fallbacks or {}
+        self.on_segment = on_segment
+        self.to_thread = to_thread or asyncio.to_thread
+        self.locks: Dict[str, asyncio.Lock] = {}
+
+    def key(self, name: str, context: dict) -> Optional[str]:
+        key = self.keys.get(name)
+        return key(context) if key is not None else None
+
+    def stale(self, context: dict) -> List[str]:
+        """Names of the segments that must be rebuilt before they are played."""
+        return [name for name in self.sources if not self.bundle.fresh(name, self.key(name, context))]
+
+    async def build(self, name: str, context: dict, force: bool = False,
+                    rendering: Optional[asyncio.Future] = None) -> Tuple[List[str], List[bytes], bool]:
+        """
+        Rebuild one segment and store it if its source succeeded.
+
+        Synthesis of every sentence starts as soon as the source returns. If
+        `rendering` is given, it receives (texts, clips, ok, timing) at that
+        moment, where clips are the per-sentence synthesis tasks, so a player
+        can start on the first sentence before the others are rendered.
+
+        Args:
+            name (str): Segment name
+            context (dict): Briefing inputs (e.g. the location)
+            force (bool, optional): Rebuild even if the segment is fresh. Defaults to False.
+            rendering (asyncio.Future, optional): Receives the segment while it is being synthesized
+
+        Returns:
+            Tuple[List[str], List[bytes], bool]: Sentences, their PCM, and whether the source succeeded
+        """
+        lock = self.locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            key = self.key(name, context)
+            if not force and self.bundle.fresh(name, key):
+                # Built by a concurrent refresh while this one waited
+                texts, audio = self.bundle.texts(name), await self.to_thread(self.bundle.audio, name)
+                if rendering is not None and not rendering.done():
+                    rendering.set_result((texts, audio, True, {"source": "bundle"}))
+                return texts, audio, True
+            start = time.perf_counter()
+            try:
+                texts = await self.sources[name](context)
+            except Exception as e:
+                logging.error(f"Briefing segment '{name}' failed: {e}")
+                texts = None
+            timing = {"source": "rebuilt", "fetch": time.perf_counter() - start}
+            ok = bool(texts)
+            if not ok:
+                fallback = self.fallbacks.get(name)
+                texts = [fallback(context)] if fallback is not None else []
+            clips = [asyncio.ensure_future(self.synthesize(text)) for text in texts]
+            if rendering is not None and not rendering.done():
+                rendering.set_result((texts, clips, ok, timing))
+            audio = list(await asyncio.gather(*clips))
+            timing["synth"] = time.perf_counter() - start - timing["fetch"]
+            if ok:
+                await self.to_thread(self.bundle.store, name, texts, audio, key)
+            return texts, audio, ok
+
+    async def refresh(self, context: dict, force: bool = False) -> List[str]:
+        """
+        Rebuild the stale segments (or all of them) concurrently.
+
+        Args:
+            context (dict): Briefing inputs
+            force (bool, optional): Rebuild fresh segments too. Defaults to False.
+
+        Returns:
+            List[str]: Names of the rebuilt segments
+        """
+        names = list(self.sources) if force else self.stale(context)
+        await asyncio.gather(*(self.build(name, context, force) for name in names))
+        return names
+
+    async def play(self, context: dict, cancel_event: Optional[threading.Event] = None) -> Dict[str, dict]:
+        """
+        Play the briefing: fresh segments at once from the bundle, stale ones as they are rebuilt.
+
+        Every stale segment is launched the moment the briefing starts; each
+        sentence plays in order as soon as its audio is ready. A per-segment
+        timing breakdown is logged and returned. Setting `cancel_event` stops
+        playback within CANCEL_POLL_S and cancels the segments still being built.
+
+        Args:
+            context (dict): Briefing inputs
+            cancel_event (threading.Event, optional): Set (from any thread) to stop the briefing
+
+        Returns:
+            Dict[str, dict]: Segment name -> timings in seconds: 'fetch' and 'synth' (rebuilt
+                segments), 'wait' (playback stalled on the segment), 'start' (offset from the
+                start of the briefing) and 'play'
+        """
+        cancel_event = cancel_event or threading.Event()
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        renderings, tasks = {}, {}
+        for name in self.stale(context):
+            renderings[name] = loop.create_future()
+            tasks[name] = asyncio.ensure_future(self.build(name, context, rendering=renderings[name]))
+        if tasks:
+            logging.info(f"Refreshing briefing segments: {', '.join(tasks)}")
+        timings = {}
+        try:
+            for name in self.sources:
+                waited = time.perf_counter()
+                if name in tasks:
+                    # The rendering is published once synthesis starts; a build that fails earlier raises here
+                    if not await self._wait([renderings[name], tasks[name]], cancel_event):
+                        break
+                    if not renderings[name].done():
+                        await tasks[name]
+                    _, clips, ok, timing = renderings[name].result()
+                else:
+                    clips, ok, timing = await self.to_thread(self.bundle.audio, name), True, {"source": "bundle"}
+                timings[name] = timing
+                if self.on_segment is not None:
+                    await self.on_segment(name, ok)
+                playing = 0.0
+                for clip in clips:
+                    if asyncio.isfuture(clip):
+                        if not await self._wait([clip], cancel_event):
+                            break
+                        clip = clip.result()
+                    if cancel_event.is_set():
+                        break
+                    timing.setdefault("start", time.perf_counter() - start)
+                    began = time.perf_counter()
+                    await self.play_audio(clip, cancel_event)
+                    playing += time.perf_counter() - began
+                timing["wait"] = time.perf_counter() - waited - playing
+                timing["play"] = playing
+                if cancel_event.is_set():
+                    break
+            if cancel_event.is_set():
+                logging.info("Briefing cancelled.")
+            else:
+                # Let the rebuilt segments finish storing before reporting
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        self.log_timings(timings, time.perf_counter() - start)
+        return timings
+
+    @staticmethod
+    async def _wait(aws: list, cancel_event: threading.Event) -> bool:
+        """Wait until one of the awaitables is done; False if the briefing was cancelled first."""
+        while not cancel_event.is_set():
+            done, _ = await asyncio.wait(aws, timeout=CANCEL_POLL_S, return_when=asyncio.FIRST_COMPLETED)
+            if done:
+                return True
+        return False
+
+    @staticmethod
+    def log_timings(timings: Dict[str, dict], total: float) -> None:
+        first_audio = min((t["start"] for t in timings.values() if "start" in t), default=total)
+        parts = []
+        for name, t in timings.items():
+            detail = " ".join(f"{field} {t[field]:.2f}s" for field in ("fetch", "synth", "wait", "start", "play")
+                              if field in t)
+            parts.append(f"{name} ({t['source']}) {detail}")
+        logging.info(f"Briefing: total {total:.2f}s, first audio {first_audio:.2f}s; " + "; ".join(parts))
+
+class BriefingPrecompute:
+    """
+    Rebuilds the briefing every day shortly before the wake time.
+
+    Attributes:
+        wake_time (datetime.time): Time the user usually asks for the briefing
+        lead (datetime.timedelta): How long before the wake time the bundle is built
+    """
+
+    def __init__(self, refresh: Callable[[], None], wake_time: str, lead_minutes: float = 15.0):
+        """
+        Args:
+            refresh (Callable): Blocking call that rebuilds the stale segments
+            wake_time (str): 'HH:MM'
+            lead_minutes (float, optional): Minutes before the wake time. Defaults to 15.
+        """
+        self.refresh = refresh
+        self.wake_time = datetime.datetime.strptime(wake_time, "%H:%M").time()
+        self.lead = datetime.timedelta(minutes=lead_minutes)
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def next_run(self, now: Optional[datetime.datetime] = None) -> datetime.datetime:
+        """Return the next precompute time after now."""
+        now = now or datetime.datetime.now()
+        run = datetime.datetime.combine(now.date(), self.wake_time) - self.lead
+        while run <= now:
+            run += datetime.timedelta(days=1)
+        return run
+
+    def start(self) -> None:
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="briefing-precompute", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def _run(self) -> None:
+        while not self.stop_event.is_set():
+            run = self.next_run()
+            logging.info(f"Next briefing precompute at {run:%Y-%m-%d %H:%M}")
+            if self.stop_event.wait((run - datetime.datetime.now()).total_seconds()):
+                return
+            start = time.perf_counter()
+            try:
+                self.refresh()
+                logging.info(f"Briefing precomputed in {time.perf_counter() - start:.1f}s")
+            except Exception as e:
+                logging.error(f"Briefing precompute failed: {e}")
@@ -2,8 +2,8 @@ import libs.doubly_linked_list as dll
 import datetime
 import threading
 import time
-import subprocess
 import logging
+import libs.audio_engine as audio_engine
 
 class TaskManager:
     """
@@ -15,6 +15,7 @@ class TaskManager:
         stopwatch_start_time (datetime): The start time of the stopwatch.
         alarms (list): A list to store alarm times.
         last_reset_time (datetime): The last time the task list was reset.
+        alarm_chime (str): Path to the sound played when a timer or alarm goes off.
     Methods:
         check_and_reset_if_needed() -> None:
             Checks if the task list needs to be reset based on a 24-hour interval and resets if needed.
@@ -38,16 +39,19 @@ class TaskManager:
             Sets an alarm for a specific time and starts a thread to check alarms.
         check_alarms() -> None:
             Continuously checks for alarms and logs them when the time is reached.
+        ring() -> None:
+            Plays the alarm chime, logging any playback failure.
     Note:
         This class is still being tested and is in the early stages of development.
     """
-    def __init__(self):
+    def __init__(self, alarm_chime: str = None):
         self.tasks = dll.DoublyLinkedList()
         self.reminders = []
         self.timers = []
         self.stopwatch_start_time = None
         self.alarms = []
         self.last_reset_time = datetime.datetime.utcnow()
+        self.alarm_chime = alarm_chime
         logging.info("TaskManager initialized.")
 
     def check_and_reset_if_needed(self) -> None:
@@ -93,7 +97,7 @@ class TaskManager:
         def timer(seconds):
             time.sleep(seconds)
             logging.info("Time's up!")
-            subprocess.run(['ffplay', '-nodisp', '-autoexit', '/path/to/alarm_chime.mp3'], check=True)
+            self.ring()
 
         threading.Thread(target=timer, args=(seconds,)).start()
         logging.info(f"Timer set for {seconds} seconds.")
@@ -122,6 +126,15 @@ class TaskManager:
             for alarm in self.alarms:
                 if now >= alarm:
                     logging.info("Alarm ringing!")
-                    subprocess.run(['ffplay', '-nodisp', '-autoexit', '/path/to/alarm_chime.mp3'], check=True)
+                    self.ring()
                     self.alarms.remove(alarm)
-            time.sleep(60)  # Check every minute
\ No newline at end of file
+            time.sleep(60)  # Check every minute
+
+    def ring(self) -> None:
+        if not self.alarm_chime:
+            logging.warning("No alarm chime configured (utilities.audio_files.alarm).")
+            return
+        try:
+            audio_engine.get_engine().play_file('alarm', self.alarm_chime)
+        except Exception as e:
+            logging.error(f"Error playing alarm chime {self.alarm_chime}: {e}")
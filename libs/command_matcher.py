@@ -0,0 +1,198 @@
+"""
+Compiled command matcher.
+
+The command phrases are compiled once into:
+
+- an Aho-Corasick automaton, which finds every phrase contained in a
+  transcript in a single pass (the exact match keeps the rule of the old
+  linear scan: the longest contained phrase wins);
+- a character-trigram index over the phrase tokens, which proposes fuzzy
+  candidates for transcripts with recognition errors. Candidates are scored
+  with difflib's ratio against the whole transcript and against every window
+  of the same number of words, so extra words around a command do not hide it.
+
+decide() turns the scored candidates into an action: dispatch at once, ask
+for confirmation, or give up. Fuzzy matches dispatch without asking when they
+are both confident and clearly ahead of every candidate of another intent.
+"""
+
+import difflib
+from collections import Counter, defaultdict, deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+DISPATCH = "dispatch"
+CONFIRM = "confirm"
+
+class Candidate(NamedTuple):
+    phrase: str
+    intent: str
+    score: float
+    exact: bool
+
+class AhoCorasick:
+    """
+    Multi-pattern substring search automaton over characters.
+
+    Attributes:
+        patterns (List[str]): Compiled patterns
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(index)
+        # Breadth-first, so every failure link points at an already finished, shallower state
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def search(self, text: str) -> List[int]:
+        """
+        Find the patterns contained in a text.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            List[int]: Indices of the patterns found (each at most once)
+        """
+        state = 0
+        found = set()
+        for char in text:
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            found.update(self.output[state])
+        return sorted(found)
+
+def trigrams(token: str) -> List[str]:
+    padded = f" {token} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+class CommandMatcher:
+    """
+    Exact and fuzzy command matching, compiled once.
+
+    Attributes:
+        phrases (List[str]): Command phrases, longest first
+        intents (Dict[str, str]): Phrase -> intent name
+        dispatch_score (float): Fuzzy score at or above which a match may dispatch without asking
+        dispatch_margin (float): Lead over the best other intent required to dispatch without asking
+        confirm_score (float): Fuzzy score at or above which the user is asked to confirm
+    """
+
+    def __init__(self, intents: Dict[str, str], dispatch_score: float = 0.8, dispatch_margin: float = 0.1,
+                 confirm_score: float = 0.7, max_candidates: int = 5):
+        self.intents = {phrase.lower().strip(): intent for phrase, intent in intents.items()}
+        self.phrases = sorted(self.intents, key=len, reverse=True)
+        self.dispatch_score = dispatch_score
+        self.dispatch_margin = dispatch_margin
+        self.confirm_score = confirm_score
+        self.max_candidates = max_candidates
+        # Scores below this can neither be confirmed nor block a dispatch as the runner-up
+        self.floor = min(confirm_score, dispatch_score - dispatch_margin)
+        self.automaton = AhoCorasick(self.phrases)
+        self.phrase_tokens = [phrase.split() for phrase in self.phrases]
+        self.phrase_trigrams = [Counter(g for token in tokens for g in trigrams(token)) for tokens in self.phrase_tokens]
+        # SequenceMatcher caches its analysis of the second sequence, so keep one per phrase
+        self.scorers = [difflib.SequenceMatcher(None, "", phrase) for phrase in self.phrases]
+        self.index = defaultdict(list)
+        for phrase_id, grams in enumerate(self.phrase_trigrams):
+            for gram in grams:
+                self.index[gram].append(phrase_id)
+
+    def exact(self, command: str) -> Optional[str]:
+        """
+        Return the longest phrase contained in the command, as the linear scan did.
+
+        Args:
+            command (str): Lower-cased transcript
+
+        Returns:
+            Optional[str]: Phrase, or None
+        """
+        found = self.automaton.search(command)
+        return self.phrases[found[0]] if found else None
+
+    def candidates(self, command: str) -> List[Candidate]:
+        """
+        Score the phrases that share the most trigrams with the command.
+
+        Candidates that cannot reach the score floor are dropped; the cheap
+        upper bounds of SequenceMatcher reject most of them without a full
+        comparison.
+
+        Args:
+            command (str): Lower-cased transcript
+
+        Returns:
+            List[Candidate]: Best candidates first
+        """
+        tokens = command.split()
+        grams = Counter(g for token in tokens for g in trigrams(token))
+        overlap = Counter()
+        for gram, count in grams.items():
+            for phrase_id in self.index.get(gram, ()):
+                overlap[phrase_id] += min(count, self.phrase_trigrams[phrase_id][gram])
+        shortlist = [phrase_id for phrase_id, _ in overlap.most_common(self.max_candidates)]
+        scored = []
+        for phrase_id in shortlist:
+            phrase = self.phrases[phrase_id]
+            size = len(self.phrase_tokens[phrase_id])
+            windows = {" ".join(tokens[i:i + size]) for i in range(max(1, len(tokens) - size + 1))}
+            windows.add(command)
+            scorer = self.scorers[phrase_id]
+            score = None
+            for text in windows:
+                scorer.set_seq1(text)
+                bound = self.floor if score is None else score
+                if scorer.real_quick_ratio() >= bound and scorer.quick_ratio() >= bound:
+                    ratio = scorer.ratio()
+                    if ratio >= bound:
+                        score = ratio
+            if score is not None:
+                scored.append(Candidate(phrase, self.intents[phrase], score, False))
+        scored.sort(key=lambda c: c.score, reverse=True)
+        return scored
+
+    def decide(self, command: str) -> Tuple[Optional[str], Optional[str], List[Candidate]]:
+        """
+        Choose what to do with a transcript.
+
+        Args:
+            command (str): Transcript
+
+        Returns:
+            Tuple[Optional[str], Optional[str], List[Candidate]]: (phrase, action, candidates);
+                action is DISPATCH, CONFIRM or None when nothing matches well enough
+        """
+        command = command.lower().strip()
+        phrase = self.exact(command)
+        if phrase is not None:
+            return phrase, DISPATCH, [Candidate(phrase, self.intents[phrase], 1.0, True)]
+        scored = self.candidates(command)
+        if not scored or scored[0].score < self.confirm_score:
+            return None, None, scored
+        best = scored[0]
+        runner_up = next((c.score for c in scored[1:] if c.intent != best.intent), 0.0)
+        if best.score >= self.dispatch_score and best.score - runner_up >= self.dispatch_margin:
+            return best.phrase, DISPATCH, scored
+        return best.phrase, CONFIRM, scored
@@ -0,0 +1,99 @@
+"""
+Small-vocabulary on-device recognizer for control commands.
+
+A Vosk recognizer is constrained to a grammar built from the assistant's
+command phrases, so it can only answer with one of them (or '[unk]'). It runs
+on the captured audio before the cloud recognizer: a confident match is
+returned immediately with no network round trip, and anything else falls
+through to the general recognizer.
+
+Vosk is optional; without it (or without a model) the fast path is disabled.
+"""
+
+import json
+import time
+import logging
+from typing import Iterable, Optional, Tuple
+
+from libs.asr_backends import vosk, load_vosk_model
+
+UNKNOWN_TOKEN = "[unk]"
+
+class CommandRecognizer:
+    """
+    Grammar-constrained local recognizer.
+
+    Attributes:
+        model_path (str): Path of the Vosk model directory
+        sample_rate (int): Sample rate of the audio passed to recognize()
+        min_confidence (float): Confidence at or above which a match is accepted
+        phrases (set): Phrases the grammar allows
+        hits (int): Utterances answered locally
+        misses (int): Utterances passed on to the general recognizer
+    """
+
+    def __init__(self, model_path: Optional[str], sample_rate: int = 16000, min_confidence: float = 0.85):
+        self.model_path = model_path
+        self.sample_rate = sample_rate
+        self.min_confidence = min_confidence
+        self.phrases = set()
+        self.grammar = None
+        self.model = None
+        self.hits = 0
+        self.misses = 0
+        if vosk is None:
+            logging.warning("Vosk is not installed; on-device command recognition disabled.")
+        elif not model_path:
+            logging.warning("No command model configured; on-device command recognition disabled.")
+        else:
+            try:
+                self.model = load_vosk_model(model_path)
+                logging.info("Command recognizer model loaded from %s", model_path)
+            except Exception as e:
+                logging.error(f"Failed to load command recognizer model: {e}")
+
+    @property
+    def available(self) -> bool:
+        return self.model is not None and self.grammar is not None
+
+    def set_phrases(self, phrases: Iterable[str]) -> None:
+        """
+        Build the grammar from the command phrases.
+
+        Args:
+            phrases (Iterable[str]): Phrases to recognize, e.g. the command_mappings keys
+        """
+        self.phrases = {" ".join(phrase.lower().split()) for phrase in phrases}
+        self.grammar = json.dumps(sorted(self.phrases) + [UNKNOWN_TOKEN])
+        logging.info("Command grammar built with %d phrases", len(self.phrases))
+
+    def recognize(self, frame_data: bytes) -> Tuple[Optional[str], float]:
+        """
+        Recognize a command phrase in 16-bit mono PCM.
+
+        Args:
+            frame_data (bytes): Raw PCM at sample_rate
+
+        Returns:
+            Tuple[Optional[str], float]: (phrase, confidence); phrase is None
+                unless the audio confidently matches exactly one grammar phrase
+        """
+        if not self.available:
+            return None, 0.0
+        started = time.perf_counter()
+        recognizer = vosk.KaldiRecognizer(self.model, self.sample_rate, self.grammar)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(frame_data)
+        result = json.loads(recognizer.FinalResult())
+        text = " ".join(result.get("text", "").split())
+        words = result.get("result", [])
+        confidence = min((word.get("conf", 0.0) for word in words), default=0.0)
+        elapsed = time.perf_counter() - started
+
+        if text in self.phrases and UNKNOWN_TOKEN not in text and confidence >= self.min_confidence:
+            self.hits += 1
+            logging.info("Local command match '%s' (confidence %.2f) in %.3fs", text, confidence, elapsed)
+            return text, confidence
+        self.misses += 1
+        logging.debug("No confident local command match ('%s', confidence %.2f) in %.3fs", text, confidence, elapsed)
+        return None, confidence
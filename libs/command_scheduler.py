@@ -0,0 +1,230 @@
+"""
+Single-session command scheduler.
+
+Every assistant session (a wake word or a gesture followed by a command) and
+every command heard while a reply is being read out runs as a job on one
+worker thread, the scheduler's actor. Only one job is active at a time; the
+others wait in a priority queue (lowest value first, FIFO within a priority).
+
+Jobs can be submitted as `unique`, in which case a job of the same name that
+is already active or queued makes the submission a no-op: two gestures in a
+row start one session, not two. A `preempt` submission of a higher priority
+cancels the active job cooperatively: its cancel event is set and the cancel
+hooks run (e.g. stopping speech playback), and long handlers check
+cancelled() between steps and return early.
+
+The scheduler keeps the queue depth, the number of preemptions and the
+preemption latency: the time from the preempting submission until the
+cancelled job has returned and the worker is free for the new job.
+"""
+
+import time
+import heapq
+import logging
+import threading
+import itertools
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+URGENT = 0
+NORMAL = 10
+BACKGROUND = 20
+
+class Job:
+    """
+    A unit of work for the scheduler.
+
+    Attributes:
+        name (str): Job name, used for uniqueness and logging
+        fn (Callable): Work to run on the scheduler thread
+        priority (int): Lower runs first
+        submitted (float): time.monotonic() of the submission
+        cancel_event (threading.Event): Set when the job is cancelled
+    """
+
+    def __init__(self, name: str, fn: Callable[[], None], priority: int):
+        self.name = name
+        self.fn = fn
+        self.priority = priority
+        self.submitted = time.monotonic()
+        self.cancel_event = threading.Event()
+        self.preempted_at = None
+
+class CommandScheduler:
+    """
+    Priority queue of jobs run one at a time by a worker thread.
+
+    Attributes:
+        cancel_hooks (List[Callable]): Called when the active job is cancelled
+        preemptions (int): Active jobs cancelled by a preempting submission
+        dropped (int): Unique submissions ignored because the job was already pending
+    """
+
+    def __init__(self, latency_window: int = 100):
+        self.cancel_hooks: List[Callable[[], None]] = []
+        self.queue = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.active: Optional[Job] = None
+        self.running = False
+        self.thread = None
+        self.preemptions = 0
+        self.dropped = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.preempt_latencies = deque(maxlen=latency_window)
+        self.waits = deque(maxlen=latency_window)
+
+    def start(self) -> None:
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="command-scheduler", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Cancel the active job, drop the queue and stop the worker."""
+        with self.condition:
+            self.running = False
+            self.queue.clear()
+            self.condition.notify_all()
+        self.cancel_active()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
+        logging.info("Command scheduler stats: %s", self.stats())
+
+    def submit(self, name: str, fn: Callable[[], None], priority: int = NORMAL, preempt: bool = False,
+               unique: bool = False) -> bool:
+        """
+        Queue a job.
+
+        Args:
+            name (str): Job name
+            fn (Callable): Work to run
+            priority (int, optional): URGENT, NORMAL or BACKGROUND. Defaults to NORMAL.
+            preempt (bool, optional): Cancel the active job if it has a lower priority. Defaults to False.
+            unique (bool, optional): Ignore the job if one of the same name is active or queued.
+                Defaults to False.
+
+        Returns:
+            bool: False if the job was ignored
+        """
+        job = Job(name, fn, priority)
+        with self.condition:
+            if not self.running:
+                return False
+            if unique and any(j.name == name for j in self._pending()):
+                self.dropped += 1
+                logging.debug(f"Ignoring duplicate job '{name}'")
+                return False
+            heapq.heappush(self.queue, (priority, next(self.counter), job))
+            self.max_depth = max(self.max_depth, len(self.queue))
+            active = self.active
+            self.condition.notify()
+        if preempt and active is not None and active.priority > priority:
+            self.preemptions += 1
+            logging.info(f"'{name}' preempts '{active.name}'")
+            self.cancel_active(active)
+        return True
+
+    def cancel_active(self, job: Optional[Job] = None) -> None:
+        """
+        Cancel the active job cooperatively.
+
+        Args:
+            job (Job, optional): Only cancel if this job is still the active one
+        """
+        active = self.active
+        if active is None or (job is not None and active is not job) or active.cancel_event.is_set():
+            return
+        active.preempted_at = time.monotonic()
+        active.cancel_event.set()
+        for hook in self.cancel_hooks:
+            try:
+                hook()
+            except Exception as e:
+                logging.error(f"Error in cancel hook: {e}")
+
+    def cancelled(self) -> bool:
+        """
+        Check whether the job running on the calling thread has been cancelled.
+
+        Returns:
+            bool: True if the active job was cancelled (or the scheduler stopped)
+        """
+        active = self.active
+        if active is None or threading.current_thread() is not self.thread:
+            return False
+        return active.cancel_event.is_set()
+
+    def sleep(self, seconds: float) -> bool:
+        """
+        Sleep inside a job, waking early if it is cancelled.
+
+        Args:
+            seconds (float): Time to sleep
+
+        Returns:
+            bool: True if the full time elapsed, False if the job was cancelled
+        """
+        active = self.active
+        if active is None or threading.current_thread() is not self.thread:
+            time.sleep(seconds)
+            return True
+        return not active.cancel_event.wait(seconds)
+
+    @property
+    def depth(self) -> int:
+        return len(self.queue)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Report scheduler counters.
+
+        Returns:
+            Dict[str, float]: Queue depth (now and peak), jobs completed, failed and dropped,
+                preemptions, preemption latency (mean, p95, max) and mean queue wait, in seconds
+        """
+        latencies = np.array(self.preempt_latencies) if self.preempt_latencies else np.zeros(1)
+        waits = np.array(self.waits) if self.waits else np.zeros(1)
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "preemptions": self.preemptions,
+            "preempt_latency_mean": float(latencies.mean()),
+            "preempt_latency_p95": float(np.percentile(latencies, 95)),
+            "preempt_latency_max": float(latencies.max()),
+            "wait_mean": float(waits.mean()),
+        }
+
+    def _pending(self):
+        if self.active is not None:
+            yield self.active
+        for _, _, job in self.queue:
+            yield job
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while self.running and not self.queue:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                _, _, job = heapq.heappop(self.queue)
+                self.active = job
+            self.waits.append(time.monotonic() - job.submitted)
+            try:
+                job.fn()
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                logging.error(f"Error in job '{job.name}': {e}")
+            finally:
+                with self.condition:
+                    self.active = None
+                if job.preempted_at is not None:
+                    self.preempt_latencies.append(time.monotonic() - job.preempted_at)
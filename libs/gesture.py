@@ -0,0 +1,137 @@
+"""
+Ultrasonic hand-gesture sensor.
+
+GestureModule drives an HC-SR04 style sensor through an RPi.GPIO-compatible
+backend (libs/gpio_backend.py), filters the readings and detects a hand held
+close to the device. It runs either in a thread of the assistant or in the
+sampler process of libs/sensor_process.py.
+"""
+
+import time
+import logging
+import threading
+
+import libs.ultrasonic as ultrasonic
+import libs.gesture_filters as gesture_filters
+import libs.gpio_backend as gpio_backend
+
+class GestureModule:
+    """
+    Class to handle gesture detection using ultrasonic sensors.
+    
+    Attributes:
+        trigger_pin (int): GPIO pin for trigger signal
+        echo_pin (int): GPIO pin for echo signal
+        distance_range (tuple): Min and max distance (cm) for gesture detection
+        gesture_interval (float): Time between gesture checks in seconds
+        debounce_time (float): Minimum time between valid gestures
+        timing (str): 'edge' to time echoes from GPIO edge callbacks, 'poll' to busy-wait
+        echo_timer (EdgeEchoTimer): Edge-callback timer, or None when polling
+        detector (GestureDetector): Filter stage and gesture rules applied to raw readings
+        trace_recorder (TraceRecorder): Raw reading recorder, or None
+        gpio: RPi.GPIO or a compatible backend (see libs/gpio_backend.py)
+        on_sample (Callable): Called with (distance or None, monotonic time) for every raw reading
+    """
+
+    def __init__(self, trigger_pin=18, echo_pin=24, distance_range=(2, 5), gesture_interval=0.2, debounce_time=1.0,
+                 timing='edge', distance_filter='exponential', required_detections=4, trace_path=None, gpio=None,
+                 on_sample=None):
+        self.gpio = gpio if gpio is not None else gpio_backend.load_gpio()
+        self.trigger_pin = trigger_pin
+        self.echo_pin = echo_pin
+        self.distance_range = distance_range
+        self.gesture_interval = gesture_interval
+        self.debounce_time = debounce_time
+        self.detector = gesture_filters.GestureDetector(
+            gesture_filters.make_filter(distance_filter), distance_range,
+            required_detections=required_detections, debounce_time=debounce_time)
+        self.trace_recorder = gesture_filters.TraceRecorder(trace_path) if trace_path else None
+        self.on_sample = on_sample
+        self.is_gpio_active = True
+        self.last_valid_measurement = None
+        self.consecutive_timeouts = 0
+        self.timeouts = 0
+        self.max_timeouts = 5
+        self.timing = timing
+        self.echo_timer = None
+        self.setup_gpio()
+
+    def setup_gpio(self):
+        try:
+            self.gpio.setmode(self.gpio.BCM)
+            self.gpio.setup(self.trigger_pin, self.gpio.OUT)
+            self.gpio.setup(self.echo_pin, self.gpio.IN, pull_up_down=self.gpio.PUD_DOWN)
+            self.gpio.output(self.trigger_pin, False)
+            time.sleep(0.1)
+        except Exception as e:
+            logging.error(f"GPIO setup failed: {e}")
+            self.is_gpio_active = False
+            return
+        if self.timing == 'edge':
+            try:
+                self.echo_timer = ultrasonic.EdgeEchoTimer(self.gpio, self.trigger_pin, self.echo_pin)
+                self.echo_timer.start()
+            except RuntimeError as e:
+                logging.warning(f"Edge detection unavailable, falling back to polling: {e}")
+                self.echo_timer = None
+
+    def cleanup_gpio(self):
+        if self.echo_timer is not None:
+            self.echo_timer.stop()
+            self.echo_timer = None
+        self.gpio.cleanup()
+        self.is_gpio_active = False
+
+    def measure_distance(self):
+        if not self.is_gpio_active:
+            return None
+        try:
+            if self.echo_timer is not None:
+                pulse_duration = self.echo_timer.measure()
+            else:
+                pulse_duration = ultrasonic.poll_echo(self.gpio, self.trigger_pin, self.echo_pin)
+            if pulse_duration is None:
+                self.timeouts += 1
+                self.consecutive_timeouts += 1
+                if self.consecutive_timeouts > self.max_timeouts:
+                    logging.warning("Multiple consecutive timeouts detected")
+                return None
+            self.consecutive_timeouts = 0
+            distance = ultrasonic.pulse_to_distance(pulse_duration)
+            if distance is not None:
+                self.last_valid_measurement = distance
+                return round(distance, 1)
+            return None
+        except Exception as e:
+            logging.warning(f"Error measuring distance: {e}")
+            return None
+
+    def sample(self):
+        """Take one raw reading, recording and publishing it."""
+        distance = self.measure_distance()
+        timestamp = time.monotonic()
+        if self.trace_recorder is not None:
+            self.trace_recorder.record(distance, timestamp)
+        if self.on_sample is not None:
+            self.on_sample(distance, timestamp)
+        return distance
+
+    def detect_hand_gesture(self, readings=3, reading_interval=0.03):
+        if not self.is_gpio_active:
+            return False
+        for _ in range(readings):
+            if self.detector.feed(self.sample(), time.monotonic()):
+                logging.info(f"Hand gesture detected at {self.detector.last_distance:.1f}cm")
+                return True
+            time.sleep(reading_interval)
+        return False
+
+    def start_hand_gesture_detection(self):
+        hand_gesture_thread = threading.Thread(target=self.detect_hand_gesture, daemon=True)
+        hand_gesture_thread.start()
+
+    def stop(self):
+        logging.info("Stopping gesture detection...")
+        self.cleanup_gpio()
+        if self.trace_recorder is not None:
+            self.trace_recorder.close()
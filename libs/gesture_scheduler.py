@@ -0,0 +1,174 @@
+"""
+Duty-cycled sampling of the gesture sensor.
+
+The scheduler runs the sensor in one of three states:
+
+- idle: nothing is in range; a single cheap reading is taken at a low rate.
+- burst: an object came within the approach distance; full gesture detection
+  runs at a high rate until nothing has been in range for burst_hold_s.
+- paused: a command is being processed; no readings are taken.
+
+Wall time, CPU time of the sampling thread and wakeups are accounted per
+state and logged periodically.
+"""
+
+import time
+import logging
+from typing import Callable, Dict, Optional
+
+IDLE = "idle"
+BURST = "burst"
+PAUSED = "paused"
+
+class SamplingScheduler:
+    """
+    Adaptive gesture-sampling loop.
+
+    Attributes:
+        idle_rate (float): Readings per second while idle
+        burst_rate (float): Gesture detections per second while something is near
+        approach_cm (float): Distance below which sampling bursts
+        burst_hold_s (float): Seconds without anything in range before returning to idle
+        pause_check_s (float): How often a paused scheduler checks whether to resume
+        report_interval_s (float): Seconds between per-state usage log lines
+        state (str): Current state
+    """
+
+    def __init__(self, probe: Callable[[], Optional[float]], detect: Callable[[], bool],
+                 should_pause: Callable[[], bool], idle_rate: float = 2.0, burst_rate: float = 10.0,
+                 approach_cm: float = 30.0, burst_hold_s: float = 3.0, pause_check_s: float = 0.25,
+                 report_interval_s: float = 300.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            probe (Callable): Takes one distance reading (cm), or None if nothing echoed
+            detect (Callable): Runs full gesture detection; True if a gesture was seen
+            should_pause (Callable): True while sampling should be suspended
+            idle_rate (float, optional): Idle readings per second. Defaults to 2.
+            burst_rate (float, optional): Burst detections per second. Defaults to 10.
+            approach_cm (float, optional): Burst threshold in cm. Defaults to 30.
+            burst_hold_s (float, optional): Burst hold time. Defaults to 3.
+            pause_check_s (float, optional): Pause re-check interval. Defaults to 0.25.
+            report_interval_s (float, optional): Usage log interval. Defaults to 300.
+        """
+        self.probe = probe
+        self.detect = detect
+        self.should_pause = should_pause
+        self.idle_rate = idle_rate
+        self.burst_rate = burst_rate
+        self.approach_cm = approach_cm
+        self.burst_hold_s = burst_hold_s
+        self.pause_check_s = pause_check_s
+        self.report_interval_s = report_interval_s
+        self.state = IDLE
+        self.last_near = 0.0
+        self.usage = {state: {"seconds": 0.0, "cpu": 0.0, "wakeups": 0} for state in (IDLE, BURST, PAUSED)}
+        self.last_report = time.monotonic()
+
+    @classmethod
+    def from_config(cls, gesture_config: dict, probe, detect, should_pause) -> 'SamplingScheduler':
+        """
+        Build the scheduler from the 'gesture' configuration section.
+
+        Args:
+            gesture_config (dict): Sampling settings
+            probe (Callable): See __init__
+            detect (Callable): See __init__
+            should_pause (Callable): See __init__
+
+        Returns:
+            SamplingScheduler: Configured scheduler
+        """
+        return cls(
+            probe, detect, should_pause,
+            idle_rate=float(gesture_config.get('idle_rate_hz', 2.0)),
+            burst_rate=float(gesture_config.get('burst_rate_hz', 10.0)),
+            approach_cm=float(gesture_config.get('approach_cm', 30.0)),
+            burst_hold_s=float(gesture_config.get('burst_hold_s', 3.0)),
+            report_interval_s=float(gesture_config.get('report_interval_s', 300.0)),
+        )
+
+    def step(self) -> bool:
+        """
+        Run one wakeup of the current state and sleep until the next.
+
+        Returns:
+            bool: True if a gesture was detected
+        """
+        wall_start, cpu_start = time.monotonic(), time.thread_time()
+        state = self._next_state(wall_start)
+        gesture = False
+        if state == PAUSED:
+            interval = self.pause_check_s
+        elif state == IDLE:
+            interval = 1 / self.idle_rate
+            if self._in_range(self.probe()):
+                self.last_near = time.monotonic()
+                self.state = BURST
+                logging.debug("Gesture sampling: object approaching, bursting")
+        else:
+            interval = 1 / self.burst_rate
+            gesture = self.detect()
+            if gesture or self._in_range(self.probe()):
+                self.last_near = time.monotonic()
+
+        usage = self.usage[state]
+        usage["wakeups"] += 1
+        usage["cpu"] += time.thread_time() - cpu_start
+        time.sleep(max(0.0, interval - (time.monotonic() - wall_start)))
+        usage["seconds"] += time.monotonic() - wall_start
+        if time.monotonic() - self.last_report >= self.report_interval_s:
+            self.log_usage()
+        return gesture
+
+    def run(self, on_gesture: Callable[[], None], is_running: Callable[[], bool]) -> None:
+        """
+        Sample until is_running() turns False.
+
+        Args:
+            on_gesture (Callable): Called for every detected gesture
+            is_running (Callable): Loop condition
+        """
+        while is_running():
+            if self.step():
+                on_gesture()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Report resource usage per state.
+
+        Returns:
+            Dict[str, Dict[str, float]]: State -> seconds spent, CPU share of one core
+                and wakeups per minute
+        """
+        return {
+            state: {
+                "seconds": usage["seconds"],
+                "cpu_share": usage["cpu"] / usage["seconds"] if usage["seconds"] else 0.0,
+                "wakeups_per_min": 60 * usage["wakeups"] / usage["seconds"] if usage["seconds"] else 0.0,
+            }
+            for state, usage in self.usage.items()
+        }
+
+    def log_usage(self) -> None:
+        """Log the per-state usage."""
+        self.last_report = time.monotonic()
+        for state, entry in self.stats().items():
+            logging.info("Gesture sampling %s: %.0fs, CPU %.2f%%, %.0f wakeups/min", state,
+                         entry["seconds"], entry["cpu_share"] * 100, entry["wakeups_per_min"])
+
+    def _next_state(self, now: float) -> str:
+        if self.should_pause():
+            if self.state != PAUSED:
+                logging.debug("Gesture sampling paused")
+            self.state = PAUSED
+        elif self.state == PAUSED:
+            self.state = BURST if now - self.last_near < self.burst_hold_s else IDLE
+        elif self.state == BURST and now - self.last_near >= self.burst_hold_s:
+            self.state = IDLE
+            logging.debug("Gesture sampling: nothing in range, back to idle")
+        return self.state
+
+    def _in_range(self, distance: Optional[float]) -> bool:
+        return distance is not None and distance <= self.approach_cm
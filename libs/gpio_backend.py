@@ -0,0 +1,213 @@
+"""
+GPIO backend selection, with a simulated backend for headless runs.
+
+The gesture sensor code talks to an RPi.GPIO-compatible object. On the Pi it
+is RPi.GPIO itself; anywhere else SimulatedGPIO stands in, answering each
+trigger pulse with an echo whose length comes from an EchoScript (a scripted
+sequence of distances or a trace recorded by gesture_filters.TraceRecorder).
+Both the polling and the edge-callback timing paths work against it, so the
+whole assistant can boot and be benchmarked on a plain Linux box.
+
+RPi.GPIO is imported only when the 'rpi' backend is selected, never at module
+import time.
+"""
+
+import time
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+
+import libs.ultrasonic as ultrasonic
+import libs.gesture_filters as gesture_filters
+
+ECHO_DELAY_S = 0.0004
+
+class EchoScript:
+    """
+    Distances (cm) the simulated sensor reports over time.
+
+    Attributes:
+        timestamps (np.ndarray): Seconds from the start of the script
+        distances (np.ndarray): Distance at each timestamp, NaN for no echo
+        loop (bool): Whether the script restarts when it runs out
+    """
+
+    def __init__(self, timestamps: np.ndarray, distances: np.ndarray, loop: bool = True):
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.distances = np.asarray(distances, dtype=np.float64)
+        self.loop = loop
+        self.started = None
+
+    @classmethod
+    def from_sequence(cls, distances: Iterable[Optional[float]], interval: float = 0.1,
+                      loop: bool = True) -> 'EchoScript':
+        """
+        Script a sequence of distances, each held for `interval` seconds.
+
+        Args:
+            distances (Iterable[Optional[float]]): Distances in cm; None for no echo
+            interval (float, optional): Seconds per entry. Defaults to 0.1.
+            loop (bool, optional): Repeat the sequence. Defaults to True.
+
+        Returns:
+            EchoScript: The script
+        """
+        values = np.array([np.nan if d is None else d for d in distances], dtype=np.float64)
+        return cls(np.arange(len(values)) * interval, values, loop)
+
+    @classmethod
+    def from_trace(cls, path: str, loop: bool = True) -> 'EchoScript':
+        """
+        Replay a trace recorded by gesture_filters.TraceRecorder in real time.
+
+        Args:
+            path (str): Trace file
+            loop (bool, optional): Repeat the trace. Defaults to True.
+
+        Returns:
+            EchoScript: The script
+        """
+        timestamps, distances = gesture_filters.load_trace(path)
+        return cls(timestamps, distances, loop)
+
+    def distance_at(self, now: float) -> Optional[float]:
+        """
+        Return the scripted distance at a monotonic time.
+
+        Args:
+            now (float): time.monotonic() value
+
+        Returns:
+            Optional[float]: Distance in cm, or None for no echo
+        """
+        if len(self.timestamps) == 0:
+            return None
+        if self.started is None:
+            self.started = now
+        elapsed = now - self.started
+        duration = self.timestamps[-1] + (self.timestamps[1] - self.timestamps[0] if len(self.timestamps) > 1 else 0)
+        if elapsed >= duration:
+            if not self.loop:
+                return None
+            elapsed %= max(duration, 1e-9)
+        value = self.distances[max(0, np.searchsorted(self.timestamps, elapsed, side="right") - 1)]
+        return None if np.isnan(value) else float(value)
+
+class SimulatedGPIO:
+    """
+    In-process stand-in for the subset of RPi.GPIO used by the gesture sensor.
+
+    A falling edge on any output pin is treated as a sensor trigger: every
+    input pin then carries an echo pulse starting ECHO_DELAY_S later and
+    lasting as long as the scripted distance takes to travel there and back.
+    """
+    BCM = "BCM"
+    BOARD = "BOARD"
+    OUT = "OUT"
+    IN = "IN"
+    PUD_DOWN = "PUD_DOWN"
+    PUD_UP = "PUD_UP"
+    RISING = "RISING"
+    FALLING = "FALLING"
+    BOTH = "BOTH"
+
+    def __init__(self, script: Optional[EchoScript] = None):
+        self.script = script or EchoScript.from_sequence([None])
+        self.mode = None
+        self.pins = {}
+        self.levels = {}
+        self.callbacks: Dict[int, Callable[[int], None]] = {}
+        self.pulse = None
+        self.triggers = 0
+
+    def setmode(self, mode) -> None:
+        self.mode = mode
+
+    def setup(self, pin: int, direction, pull_up_down=None, initial=None) -> None:
+        self.pins[pin] = direction
+        self.levels[pin] = bool(initial)
+
+    def output(self, pin: int, value) -> None:
+        if self.pins.get(pin) != self.OUT:
+            raise RuntimeError(f"Pin {pin} is not set up as an output")
+        previous, self.levels[pin] = self.levels.get(pin, False), bool(value)
+        if previous and not value:
+            self._trigger()
+
+    def input(self, pin: int) -> int:
+        if self.pins.get(pin) != self.IN:
+            return int(self.levels.get(pin, False))
+        pulse = self.pulse
+        now = time.monotonic()
+        return int(pulse is not None and pulse[0] <= now < pulse[1])
+
+    def add_event_detect(self, pin: int, edge, callback: Callable[[int], None] = None, bouncetime=None) -> None:
+        if self.pins.get(pin) != self.IN:
+            raise RuntimeError(f"Failed to add edge detection on pin {pin}")
+        self.callbacks[pin] = callback
+
+    def remove_event_detect(self, pin: int) -> None:
+        self.callbacks.pop(pin, None)
+
+    def cleanup(self, pins=None) -> None:
+        self.callbacks.clear()
+        self.pins.clear()
+        self.levels.clear()
+
+    def _trigger(self) -> None:
+        self.triggers += 1
+        now = time.monotonic()
+        distance = self.script.distance_at(now)
+        if distance is None:
+            self.pulse = None
+            return
+        start = now + ECHO_DELAY_S
+        self.pulse = (start, start + 2 * distance / ultrasonic.SPEED_OF_SOUND_CM_S)
+        if self.callbacks:
+            threading.Thread(target=self._fire_edges, args=(self.pulse,), daemon=True).start()
+
+    def _fire_edges(self, pulse) -> None:
+        for moment in pulse:
+            # Sleep most of the way, then spin briefly so edge timestamps are accurate
+            remaining = moment - time.monotonic()
+            if remaining > 0.001:
+                time.sleep(remaining - 0.001)
+            while time.monotonic() < moment:
+                pass
+            for pin, callback in list(self.callbacks.items()):
+                if callback is not None:
+                    callback(pin)
+
+def load_gpio(gesture_config: Optional[dict] = None):
+    """
+    Select the GPIO backend from the 'gesture' configuration section.
+
+    'gpio_backend' is 'rpi', 'simulated' or 'auto' (RPi.GPIO if it can be
+    imported, the simulation otherwise). The simulation replays
+    'simulated_trace' if set, and otherwise reports no echo.
+
+    Args:
+        gesture_config (dict, optional): Gesture settings
+
+    Returns:
+        An RPi.GPIO-compatible object
+
+    Raises:
+        ImportError: If 'rpi' is selected and RPi.GPIO is not installed
+    """
+    gesture_config = gesture_config or {}
+    backend = gesture_config.get('gpio_backend', 'auto')
+    if backend in ('rpi', 'auto'):
+        try:
+            import RPi.GPIO as GPIO  # type: ignore
+            return GPIO
+        except (ImportError, RuntimeError):
+            if backend == 'rpi':
+                raise
+            logging.warning("RPi.GPIO is unavailable; using the simulated GPIO backend.")
+    elif backend != 'simulated':
+        raise ValueError(f"Unknown GPIO backend '{backend}'")
+    trace = gesture_config.get('simulated_trace')
+    return SimulatedGPIO(EchoScript.from_trace(trace) if trace else None)
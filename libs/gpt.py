@@ -1,6 +1,6 @@
 import base64
-import requests
-from groq import Groq
+import json
+from groq import AsyncGroq
 import wikipediaapi
 import datetime
 import yaml
@@ -9,6 +9,9 @@ from functools import lru_cache
 from difflib import SequenceMatcher
 from typing import Optional
 
+import libs.async_core as async_core
+import libs.http_client as http_client
+
 with open('conf/secrets.yaml', 'r') as file:
     config = yaml.safe_load(file)
 groqKey = config['main']['groq_api_key']
@@ -24,13 +27,20 @@ class Generation:
     Attributes:
         messages (list): List of conversation messages.
         max_messages (int): Maximum number of messages to store.
-        client (Groq): Groq API client instance.
+        async_client (AsyncGroq): Groq API client on the async core's pooled HTTP client,
+            created on first use on the event loop.
     """
 
     def __init__(self):
         self.messages = []
         self.max_messages = 10
-        self.client = Groq(api_key=groqKey)
+        self._async_client = None
+
+    @property
+    def async_client(self) -> AsyncGroq:
+        if self._async_client is None:
+            self._async_client = AsyncGroq(api_key=groqKey, http_client=async_core.get_core().client)
+        return self._async_client
 
     def encode_image(self, image_path: str) -> str:
         """
@@ -48,7 +58,19 @@ class Generation:
     
     def generate_text_response(self, text: str) -> str:
         """
-        Generate a text response using the Groq API.
+        Generate a text response using the Groq API (blocking wrapper of agenerate_text_response).
+
+        Args:
+            text (str): Input text prompt.
+
+        Returns:
+            str: Generated text response.
+        """
+        return async_core.get_core().run(self.agenerate_text_response(text))
+
+    async def agenerate_text_response(self, text: str) -> str:
+        """
+        Generate a text response using the Groq API, on the async core's event loop.
 
         Args:
             text (str): Input text prompt.
@@ -59,7 +81,7 @@ class Generation:
         current_time_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         system_message = f"Current time and date: {current_time_date}. Do as directed."
 
-        completion = self.client.chat.completions.create(
+        completion = await self.async_client.chat.completions.create(
             model="mixtral-8x7b-32768",
             messages=[{"role": "system", "content": system_message}, {"role": "user", "content": text}],
             temperature=1,
@@ -71,6 +93,36 @@ class Generation:
 
         response = completion.choices[0].message.content
         return str(response) if response is not None else ""
+
+    async def agenerate_json_response(self, text: str, max_tokens: int = 1024) -> dict:
+        """
+        Generate a JSON object response using the Groq API's JSON mode.
+
+        Args:
+            text (str): Input prompt; it must describe the expected JSON structure.
+            max_tokens (int): Upper bound on the response length (default is 1024).
+
+        Returns:
+            dict: Decoded response, or an empty dict if it was not valid JSON.
+        """
+        current_time_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        system_message = f"Current time and date: {current_time_date}. Respond only with a JSON object."
+
+        completion = await self.async_client.chat.completions.create(
+            model="mixtral-8x7b-32768",
+            messages=[{"role": "system", "content": system_message}, {"role": "user", "content": text}],
+            temperature=0.5,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+            stream=False,
+        )
+
+        response = completion.choices[0].message.content or ""
+        try:
+            result = json.loads(response)
+        except ValueError:
+            return {}
+        return result if isinstance(result, dict) else {}
     
     def generate_text_with_image(self, text: str, image: str) -> str:
         """
@@ -105,12 +157,27 @@ class Generation:
             "max_tokens": 300
         }
 
-        response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
+        response = http_client.get_pool().client.post("https://api.openai.com/v1/chat/completions",
+                                                      headers=headers, json=payload, timeout=30)
+        response.raise_for_status()
         return response.json()['choices'][0]['message']['content']
     
     def live_chat_with_ai(self, text: str) -> str:
         """
-        Conduct a live chat session with AI, including web search capabilities.
+        Conduct a live chat session with AI, including web search capabilities
+        (blocking wrapper of alive_chat_with_ai).
+
+        Args:
+            text (str): User's input text.
+
+        Returns:
+            str: AI's response, potentially including web search results.
+        """
+        return async_core.get_core().run(self.alive_chat_with_ai(text))
+
+    async def alive_chat_with_ai(self, text: str) -> str:
+        """
+        Conduct a live chat session with AI on the async core's event loop.
 
         Args:
             text (str): User's input text.
@@ -134,7 +201,7 @@ class Generation:
 
         last_response = ""
         while True:
-            completion = self.client.chat.completions.create(
+            completion = await self.async_client.chat.completions.create(
                 model="mixtral-8x7b-32768",
                 messages=self.messages,
                 temperature=0.7,
@@ -152,7 +219,7 @@ class Generation:
             if "SEARCH_WEB" in response:
                 search_term = self.extract_command_argument(response, "SEARCH_WEB")
                 if search_term:
-                    web_summary = self.search_web(search_term)
+                    web_summary = await async_core.get_core().to_thread(self.search_web, search_term)
                     # Replace the command with the search results
                     modified_response = response.replace(f"SEARCH_WEB {search_term}", web_summary)
                     self.messages.append({"role": "assistant", "content": modified_response})
@@ -252,8 +319,6 @@ class Generation:
         Returns:
             str: Search results or an error message if the search fails.
         """
-        import requests
-
         api_key = config['main']['serpapi_api_key']
         params = {
             "engine": "google",
@@ -262,7 +327,7 @@ class Generation:
         }
 
         try:
-            response = requests.get("https://serpapi.com/search", params=params, timeout=10)
+            response = http_client.get_pool().client.get("https://serpapi.com/search", params=params)
             data = response.json()
 
             if "error" in data:
@@ -0,0 +1,352 @@
+"""
+Shared, pooled HTTP clients for every outbound call.
+
+Weather, news, web search, image analysis and the simulated services of the
+benchmarks all go through one connection pool configuration, so a request to a
+host the assistant has talked to recently reuses its keep-alive connection
+instead of paying DNS, TCP and TLS setup again. Two clients share the policy:
+
+- `client`: a blocking httpx.Client for code running on handler threads;
+- `async_client()`: an httpx.AsyncClient for the async core's event loop.
+
+Both are wrapped in a transport that applies the policy per request:
+
+- at most `per_host` requests in flight per host (on top of the pool-wide
+  connection limits), released when the response is closed;
+- retries with exponential backoff for transport errors and 429/502/503/504
+  responses on idempotent methods, and for connection failures on any method
+  (the request was never sent);
+- per-host stats: requests, new versus reused connections, errors, retries
+  and the latency to the response headers.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import numpy as np
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUSES = {429, 502, 503, 504}
+
+class HostStats:
+    """
+    Request counters and latencies of one host.
+
+    Attributes:
+        requests (int): Requests sent (retries included)
+        new_connections (int): Requests that opened a new connection
+        reused_connections (int): Requests served on a kept-alive connection
+        errors (int): Requests that failed with a transport error
+        retries (int): Requests repeated by the retry policy
+        latencies (deque): Recent times to the response headers, in seconds
+    """
+
+    def __init__(self, window: int):
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.errors = 0
+        self.retries = 0
+        self.latencies = deque(maxlen=window)
+
+    def summary(self) -> Dict[str, float]:
+        latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+        connections = self.new_connections + self.reused_connections
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_rate": self.reused_connections / connections if connections else 0.0,
+            "errors": self.errors,
+            "retries": self.retries,
+            "latency_mean": float(latencies.mean()),
+            "latency_p95": float(np.percentile(latencies, 95)),
+        }
+
+class _Attempt:
+    """Bookkeeping of one request attempt, fed by the httpcore trace extension."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.connected = False
+
+    def trace(self, event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.started":
+            self.connected = True
+
+    async def atrace(self, event: str, info: dict) -> None:
+        self.trace(event, info)
+
+class _ReleasingStream(httpx.SyncByteStream):
+    def __init__(self, stream, release):
+        self.stream = stream
+        self.release = release
+
+    def __iter__(self):
+        yield from self.stream
+
+    def close(self) -> None:
+        try:
+            self.stream.close()
+        finally:
+            self.release()
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, release):
+        self.stream = stream
+        self.release = release
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            self.release()
+
+class HttpPool:
+    """
+    Connection-pool policy shared by the blocking and the async client.
+
+    Attributes:
+        timeout (httpx.Timeout): Default timeouts of both clients
+        limits (httpx.Limits): Pool-wide connection limits of each client
+        per_host (int): Requests in flight per host
+        retries (int): Retries per request
+        backoff (float): Delay before the first retry, doubled for each further one (seconds)
+        hosts (Dict[str, HostStats]): Stats per host
+    """
+
+    def __init__(self, timeout: float = 10.0, connect_timeout: float = 5.0, max_connections: int = 20,
+                 max_keepalive: int = 10, keepalive_expiry: float = 60.0, per_host: int = 6,
+                 retries: int = 2, backoff: float = 0.25, latency_window: int = 100):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive,
+                                   keepalive_expiry=keepalive_expiry)
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.latency_window = latency_window
+        self.hosts: Dict[str, HostStats] = {}
+        self.lock = threading.Lock()
+        self.host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._client: Optional[httpx.Client] = None
+
+    @classmethod
+    def from_config(cls, http_config: dict) -> "HttpPool":
+        """
+        Build a pool from the 'http' configuration section.
+
+        Args:
+            http_config (dict): 'http' section (all keys optional)
+
+        Returns:
+            HttpPool: The configured pool
+        """
+        return cls(
+            timeout=float(http_config.get('timeout_s', 10.0)),
+            connect_timeout=float(http_config.get('connect_timeout_s', 5.0)),
+            max_connections=int(http_config.get('max_connections', 20)),
+            max_keepalive=int(http_config.get('max_keepalive', 10)),
+            keepalive_expiry=float(http_config.get('keepalive_expiry_s', 60.0)),
+            per_host=int(http_config.get('per_host', 6)),
+            retries=int(http_config.get('retries', 2)),
+            backoff=float(http_config.get('retry_backoff_s', 0.25)),
+        )
+
+    @property
+    def client(self) -> httpx.Client:
+        """The shared blocking client, created on first use."""
+        with self.lock:
+            if self._client is None:
+                self._client = httpx.Client(timeout=self.timeout, transport=_PooledTransport(self))
+            return self._client
+
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        Create an async client with this pool's policy (one per event loop).
+
+        Returns:
+            httpx.AsyncClient: The client; the caller closes it
+        """
+        return httpx.AsyncClient(timeout=self.timeout, transport=_AsyncPooledTransport(self))
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Report the per-host stats.
+
+        Returns:
+            Dict[str, Dict[str, float]]: host -> requests, new and reused connections, reuse rate,
+                errors, retries and latency to the response headers (mean, p95) in seconds
+        """
+        with self.lock:
+            return {host: stats.summary() for host, stats in self.hosts.items()}
+
+    def close(self) -> None:
+        """Close the blocking client and log the per-host stats."""
+        with self.lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+        logging.info("HTTP pool stats: %s", self.stats())
+
+    def host_stats(self, host: str) -> HostStats:
+        with self.lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostStats(self.latency_window)
+            return self.hosts[host]
+
+    def host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self.lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self.host_slots[host]
+
+    def should_retry(self, request: httpx.Request, attempt: int, error: Optional[Exception] = None,
+                     status: Optional[int] = None) -> bool:
+        if attempt >= self.retries:
+            return False
+        if isinstance(error, httpx.ConnectError):
+            return True
+        if request.method not in IDEMPOTENT_METHODS:
+            return False
+        return isinstance(error, httpx.TransportError) or status in RETRY_STATUSES
+
+    def record(self, stats: HostStats, attempt: _Attempt, error: Optional[Exception] = None) -> None:
+        with self.lock:
+            stats.requests += 1
+            if error is not None:
+                stats.errors += 1
+                return
+            if attempt.connected:
+                stats.new_connections += 1
+            else:
+                stats.reused_connections += 1
+            stats.latencies.append(time.perf_counter() - attempt.start)
+
+class _PooledTransport(httpx.BaseTransport):
+    def __init__(self, pool: HttpPool):
+        self.pool = pool
+        self.transport = httpx.HTTPTransport(limits=pool.limits)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        host = urlsplit(str(request.url)).netloc
+        stats = self.pool.host_stats(host)
+        slot = self.pool.host_slot(host)
+        for retry in range(self.pool.retries + 1):
+            if retry:
+                with self.pool.lock:
+                    stats.retries += 1
+                time.sleep(self.pool.backoff * 2 ** (retry - 1))
+            slot.acquire()
+            attempt = _Attempt()
+            request.extensions["trace"] = attempt.trace
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError as e:
+                slot.release()
+                self.pool.record(stats, attempt, e)
+                if not self.pool.should_retry(request, retry, error=e):
+                    raise
+                logging.warning(f"Retrying {request.method} {host} after {e!r}")
+                continue
+            self.pool.record(stats, attempt)
+            if self.pool.should_retry(request, retry, status=response.status_code):
+                response.close()
+                slot.release()
+                logging.warning(f"Retrying {request.method} {host} after HTTP {response.status_code}")
+                continue
+            response.stream = _ReleasingStream(response.stream, _once(slot.release))
+            return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+class _AsyncPooledTransport(httpx.AsyncBaseTransport):
+    def __init__(self, pool: HttpPool):
+        self.pool = pool
+        self.transport = httpx.AsyncHTTPTransport(limits=pool.limits)
+        self.host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = urlsplit(str(request.url)).netloc
+        stats = self.pool.host_stats(host)
+        slot = self.host_slots.setdefault(host, asyncio.Semaphore(self.pool.per_host))
+        for retry in range(self.pool.retries + 1):
+            if retry:
+                with self.pool.lock:
+                    stats.retries += 1
+                await asyncio.sleep(self.pool.backoff * 2 ** (retry - 1))
+            await slot.acquire()
+            attempt = _Attempt()
+            request.extensions["trace"] = attempt.atrace
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                slot.release()
+                self.pool.record(stats, attempt, e)
+                if not self.pool.should_retry(request, retry, error=e):
+                    raise
+                logging.warning(f"Retrying {request.method} {host} after {e!r}")
+                continue
+            self.pool.record(stats, attempt)
+            if self.pool.should_retry(request, retry, status=response.status_code):
+                await response.aclose()
+                slot.release()
+                logging.warning(f"Retrying {request.method} {host} after HTTP {response.status_code}")
+                continue
+            response.stream = _AsyncReleasingStream(response.stream, _once(slot.release))
+            return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+def _once(fn):
+    """Wrap a release callback so closing a response twice releases its slot once."""
+    done = threading.Lock()
+
+    def call():
+        if done.acquire(blocking=False):
+            fn()
+    return call
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def configure(http_config: Optional[dict] = None) -> HttpPool:
+    """
+    Replace the process-wide pool with one built from the 'http' configuration section.
+
+    Call it before the first request; clients already handed out keep the old policy.
+
+    Args:
+        http_config (dict, optional): 'http' section
+
+    Returns:
+        HttpPool: The new pool
+    """
+    global _pool
+    with _pool_lock:
+        _pool = HttpPool.from_config(http_config or {})
+        return _pool
+
+def get_pool() -> HttpPool:
+    """
+    Return the process-wide pool, creating it with the defaults on first use.
+
+    Returns:
+        HttpPool: The shared pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HttpPool()
+        return _pool
@@ -4,6 +4,7 @@ import threading
 import time
 import logging
 import libs.pygame_manager as pygame_manager
+import libs.audio_engine as audio_engine
 import libs.utilities as utilities
 import difflib
 import libs.music_search as music_search
@@ -26,6 +27,7 @@ class MusicPlayer:
         is_playing (bool): Whether music is currently playing
         is_paused (bool): Whether playback is paused
         lock (threading.Lock): Thread lock for synchronization
+        engine (AudioEngine): Audio engine whose music channel plays the tracks
     """
 
     def __init__(self, music_directory: str, shuffle: bool = False):
@@ -50,9 +52,8 @@ class MusicPlayer:
         self.music_search = music_search.MusicSearch()
         logging.info("MusicPlayer initialized with directory: %s", music_directory)
 
-        # Initialize mixer and set up end event using pygame_manager
-        pygame_manager.PygameManager.initialize()
-        pygame_manager.PygameManager.set_end_event()
+        # All output goes through the engine's music channel; it also sets up the end event per track
+        self.engine = audio_engine.get_engine()
 
         # Start playlist sync in a separate thread
         self.spotify_playlist_url = "https://open.spotify.com/playlist/1R6uk3la3pREY7xF7jdvnY"
@@ -106,8 +107,7 @@ class MusicPlayer:
         while retries > 0:
             try:
                 current_song = self.playlist[self.current_index]  # Now using list indexing
-                pygame_manager.PygameManager.load_and_play(current_song)
-                pygame_manager.PygameManager.set_end_event()  # Ensure end event is set for each song
+                self.engine.music.play(current_song)
                 time.sleep(1)  # Ensure music starts playing
                 song_name = os.path.basename(current_song)
                 song_name_without_extension = os.path.splitext(song_name)[0]
@@ -149,7 +149,7 @@ class MusicPlayer:
         """Pause current playback if music is playing."""
         with self.lock:
             if self.is_playing and not self.is_paused:
-                pygame_manager.PygameManager.pause()
+                self.engine.music.pause()
                 self.is_paused = True
                 logging.info("Music paused.")
 
@@ -157,7 +157,7 @@ class MusicPlayer:
         """Resume playback if music is paused."""
         with self.lock:
             if self.is_playing and self.is_paused:
-                pygame_manager.PygameManager.unpause()
+                self.engine.music.unpause()
                 self.is_paused = False
                 logging.info("Music unpaused.")
 
@@ -165,7 +165,7 @@ class MusicPlayer:
         """Stop music playback and clean up resources."""
         with self.lock:
             self.is_playing = False
-            pygame_manager.PygameManager.stop()
+            self.engine.music.cancel()
             if self.thread is not None:
                 self.thread.join()
                 self.thread = None
@@ -182,7 +182,7 @@ class MusicPlayer:
             ValueError: If volume is outside valid range
         """
         if 0 <= volume <= 100:
-            pygame_manager.PygameManager.set_volume(volume)
+            self.engine.music.set_volume(volume)
             logging.info("Volume set to %d", volume)
         else:
             raise ValueError("Volume must be between 0 and 100")
@@ -195,9 +195,8 @@ class MusicPlayer:
             seconds (int): Number of seconds to seek forward
         """
         if self.is_playing:
-            current_pos = pygame_manager.PygameManager.get_position()
             try:
-                pygame_manager.PygameManager.set_position(current_pos + seconds)
+                self.engine.music.seek(seconds)
                 logging.info("Seeked forward by %d seconds", seconds)
             except pygame_manager.PygameManager.PygameError as e:
                 logging.error("Error seeking forward: %s", e)
@@ -223,7 +222,7 @@ class MusicPlayer:
                 else:
                     logging.info(f"Song '{song_name}' not found.")
                     return False
-            pygame_manager.PygameManager.load_and_play(song_path)
+            self.engine.music.play(song_path)
             self.is_playing = True
             self.is_paused = False
             logging.info("Playing specific song: %s", song_path)
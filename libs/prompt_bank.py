@@ -0,0 +1,196 @@
+"""
+Packed, memory-mapped bank of pre-decoded prompts and chimes.
+
+The canned prompts in tts_audio_files/ and the chimes in assets/audio/ are
+decoded once, at build time, into a single raw PCM file in the mixer's native
+format plus a JSON index of (offset, length) per prompt. At runtime the bank
+is memory-mapped and prompts are handed to the already initialized pygame
+mixer (through the audio engine), so playing one costs neither an MP3 decode
+nor a subprocess.
+
+Build the bank with:
+    python -m libs.prompt_bank --prompts tts_audio_files --chimes assets/audio --out assets/prompts.bank
+"""
+
+import os
+import json
+import mmap
+import argparse
+import logging
+from typing import Dict, Optional
+
+# pygame.mixer.init() defaults used by PygameManager
+DEFAULT_RATE = 44100
+DEFAULT_CHANNELS = 2
+SAMPLE_WIDTH = 2
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.ogg')
+
+def prompt_name(path: str) -> str:
+    """
+    Derive the bank name of a prompt file.
+
+    Args:
+        path (str): Path or file name of the prompt
+
+    Returns:
+        str: File stem without trailing dots (e.g. 'Raspotify_disabled')
+    """
+    return os.path.splitext(os.path.basename(path))[0].rstrip('.')
+
+def build_bank(sources: Dict[str, str], out_path: str, rate: int = DEFAULT_RATE, channels: int = DEFAULT_CHANNELS) -> dict:
+    """
+    Decode audio files and pack them into one PCM file with a JSON index.
+
+    Args:
+        sources (Dict[str, str]): Mapping of prompt name to audio file path
+        out_path (str): Path of the packed PCM file; the index is written to out_path + '.json'
+        rate (int, optional): Output sample rate. Defaults to 44100.
+        channels (int, optional): Output channel count. Defaults to 2.
+
+    Returns:
+        dict: The written index
+    """
+    from pydub import AudioSegment  # type: ignore
+
+    prompts = {}
+    offset = 0
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "wb") as bank:
+        for name, path in sorted(sources.items()):
+            segment = AudioSegment.from_file(path)
+            segment = segment.set_frame_rate(rate).set_channels(channels).set_sample_width(SAMPLE_WIDTH)
+            data = segment.raw_data
+            bank.write(data)
+            prompts[name] = [offset, len(data)]
+            offset += len(data)
+            logging.info("Packed %s (%d bytes)", name, len(data))
+    index = {
+        "format": {"rate": rate, "channels": channels, "sample_width": SAMPLE_WIDTH},
+        "prompts": prompts,
+    }
+    with open(f"{out_path}.json.tmp", "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, out_path)
+    os.replace(f"{out_path}.json.tmp", f"{out_path}.json")
+    logging.info("Prompt bank written to %s: %d prompts, %d bytes", out_path, len(prompts), offset)
+    return index
+
+def collect_sources(prompt_dir: Optional[str] = None, chime_dir: Optional[str] = None) -> Dict[str, str]:
+    """
+    Find the audio files to pack.
+
+    Chimes are named 'chime_<stem>' so they can't collide with prompts.
+
+    Args:
+        prompt_dir (str, optional): Directory of canned TTS prompts
+        chime_dir (str, optional): Directory of chime sounds
+
+    Returns:
+        Dict[str, str]: Mapping of prompt name to audio file path
+    """
+    sources = {}
+    for directory, prefix in ((prompt_dir, ""), (chime_dir, "chime_")):
+        if not directory:
+            continue
+        for file_name in os.listdir(directory):
+            if file_name.endswith(AUDIO_EXTENSIONS):
+                sources[prefix + prompt_name(file_name)] = os.path.join(directory, file_name)
+    return sources
+
+class PromptBank:
+    """
+    Memory-mapped prompt bank of mixer-ready sounds.
+
+    Attributes:
+        path (str): Path of the packed PCM file
+        format (dict): Sample rate, channel count and sample width of the bank
+        prompts (dict): Prompt name -> [offset, length] in bytes
+        sounds (dict): Mixer sounds created so far, by prompt name
+    """
+
+    def __init__(self, path: str):
+        """
+        Open and memory-map a bank built by build_bank().
+
+        Args:
+            path (str): Path of the packed PCM file
+
+        Raises:
+            OSError: If the bank or its index cannot be read
+        """
+        self.path = path
+        with open(f"{path}.json") as f:
+            index = json.load(f)
+        self.format = index["format"]
+        self.prompts = index["prompts"]
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        self.sounds = {}
+        logging.info("Prompt bank loaded from %s with %d prompts", path, len(self.prompts))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.prompts
+
+    def pcm(self, name: str) -> memoryview:
+        """
+        Return a zero-copy view of a prompt's PCM.
+
+        Args:
+            name (str): Prompt name
+
+        Returns:
+            memoryview: Raw interleaved 16-bit samples
+        """
+        offset, length = self.prompts[name]
+        return self.view[offset:offset + length]
+
+    def sound(self, name: str):
+        """
+        Return the mixer Sound for a prompt, creating it on first use.
+
+        Args:
+            name (str): Prompt name
+
+        Returns:
+            pygame.mixer.Sound: Sound backed by the prompt's PCM
+        """
+        sound = self.sounds.get(name)
+        if sound is None:
+            import libs.pygame_manager as pygame_manager
+            sound = pygame_manager.PygameManager.make_sound(self.pcm(name))
+            self._check_mixer_format(pygame_manager.PygameManager.get_mixer_format())
+            self.sounds[name] = sound
+        return sound
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self.sounds.clear()
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+    def _check_mixer_format(self, mixer_format) -> None:
+        """Warn if the mixer was initialized with a different format than the bank."""
+        if mixer_format is None:
+            return
+        frequency, _size, channels = mixer_format
+        if frequency != self.format["rate"] or channels != self.format["channels"]:
+            logging.warning("Prompt bank format %s does not match mixer format %s; rebuild the bank",
+                            self.format, mixer_format)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the packed prompt bank.')
+    parser.add_argument('--prompts', type=str, default='tts_audio_files', help='Directory of canned TTS prompts.')
+    parser.add_argument('--chimes', type=str, default='assets/audio', help='Directory of chime sounds.')
+    parser.add_argument('--out', type=str, default='assets/prompts.bank', help='Path of the packed PCM file.')
+    parser.add_argument('--rate', type=int, default=DEFAULT_RATE, help='Output sample rate.')
+    parser.add_argument('--channels', type=int, default=DEFAULT_CHANNELS, help='Output channel count.')
+    args = parser.parse_args()
+
+    sources = collect_sources(args.prompts, args.chimes)
+    build_bank(sources, args.out, rate=args.rate, channels=args.channels)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -21,6 +21,10 @@ class PygameManager:
         set_volume(cls, volume):
             Sets the volume of the music. The volume should be provided as a percentage (0-100).
             Logs the volume setting process.
+        make_sound(cls, buffer):
+            Creates a mixer Sound from raw PCM in the mixer's format, without decoding.
+        reserve_channels(cls, count):
+            Reserves the first `count` mixer channels for dedicated use and returns them.
     """
     _initialized = False
 
@@ -45,6 +49,29 @@ class PygameManager:
         pygame.mixer.music.play()
         logging.info("Music started playing.")
 
+    @classmethod
+    def make_sound(cls, buffer):
+        if not cls._initialized:
+            cls.initialize()
+        return pygame.mixer.Sound(buffer=buffer)
+
+    @classmethod
+    def get_mixer_format(cls):
+        return pygame.mixer.get_init()
+
+    @classmethod
+    def reserve_channels(cls, count):
+        if not cls._initialized:
+            cls.initialize()
+        pygame.mixer.set_reserved(count)
+        logging.info(f"Reserved {count} mixer channels.")
+        return [pygame.mixer.Channel(i) for i in range(count)]
+
+    @classmethod
+    def queue(cls, file_path):
+        logging.info(f"Queueing file: {file_path}")
+        pygame.mixer.music.queue(file_path)
+
     @classmethod
     def set_end_event(cls):
         pygame.mixer.music.set_endevent(cls.END_EVENT)
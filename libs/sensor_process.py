@@ -0,0 +1,295 @@
+"""
+Out-of-process gesture sampling.
+
+The ultrasonic sensor is sampled by a dedicated process, started with
+'spawn' so it never competes for the assistant's GIL. Spawn re-imports the
+main module in the child, so entry points must keep the assistant import
+(libs.utilities with its audio mixer, API clients and caches) out of module
+level; the sampler logs an error if any of those modules was imported anyway. The sampler publishes raw distance samples and gesture
+events into a single-producer ring buffer in shared memory:
+
+- each slot carries a sequence number that the writer clears before and sets
+  after filling it, so the reader detects slots overwritten under it;
+- the writer advances a shared write counter; the reader keeps its own cursor
+  and counts everything it could not read in time as dropped.
+
+No locks are shared between the processes. The sampler wakes the assistant
+through a pipe on every gesture and after every batch of samples, so the
+consumer thread blocks instead of polling. The assistant pauses and resumes
+sampling through a flag in the ring header.
+"""
+
+import sys
+import time
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+SAMPLE = 0
+GESTURE = 1
+
+RECORD = np.dtype([("seq", np.uint64), ("timestamp", np.float64), ("distance", np.float64), ("kind", np.uint8)],
+                  align=True)
+
+# Modules that must never be loaded in the sampler process
+ASSISTANT_MODULES = ("libs.utilities", "_fam_assistant")
+
+HEADER_SLOTS = 8
+WRITE, PAUSED, TIMEOUTS, CAPACITY = range(4)
+
+class SampleRing:
+    """
+    Single-producer, lock-free ring of sensor records in shared memory.
+
+    Attributes:
+        name (str): Shared-memory segment name
+        capacity (int): Number of record slots
+        cursor (int): Reader position (records consumed so far)
+        dropped (int): Records overwritten before the reader got to them
+    """
+
+    def __init__(self, name: Optional[str] = None, capacity: int = 4096):
+        """
+        Create a ring, or attach to an existing one by name.
+
+        Args:
+            name (str, optional): Segment to attach to; a new one is created if None
+            capacity (int, optional): Slots of a new ring. Defaults to 4096.
+        """
+        self.owner = name is None
+        if self.owner:
+            size = HEADER_SLOTS * 8 + capacity * RECORD.itemsize
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            # The spawned sampler shares the parent's resource tracker, which
+            # releases the segment once the creating side unlinks it
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.header = np.ndarray((HEADER_SLOTS,), dtype=np.uint64, buffer=self.shm.buf)
+        if self.owner:
+            self.header[:] = 0
+            self.header[CAPACITY] = capacity
+        self.capacity = int(self.header[CAPACITY])
+        self.records = np.ndarray((self.capacity,), dtype=RECORD, buffer=self.shm.buf, offset=HEADER_SLOTS * 8)
+        self.name = self.shm.name
+        self.cursor = int(self.header[WRITE])
+        self.dropped = 0
+
+    def publish(self, timestamp: float, distance: Optional[float], kind: int = SAMPLE) -> None:
+        """
+        Append a record (writer side only).
+
+        Args:
+            timestamp (float): time.monotonic() of the reading
+            distance (float): Distance in cm, or None if nothing echoed
+            kind (int, optional): SAMPLE or GESTURE. Defaults to SAMPLE.
+        """
+        count = int(self.header[WRITE])
+        slot = count % self.capacity
+        self.records["seq"][slot] = 0
+        self.records[slot] = (0, timestamp, np.nan if distance is None else distance, kind)
+        self.records["seq"][slot] = count + 1
+        self.header[WRITE] = count + 1
+
+    def read(self) -> np.ndarray:
+        """
+        Return the records published since the last call (reader side only).
+
+        Returns:
+            np.ndarray: Records of dtype RECORD, oldest first
+        """
+        end = int(self.header[WRITE])
+        start = self.cursor
+        if end - start > self.capacity:
+            self.dropped += end - start - self.capacity
+            start = end - self.capacity
+        self.cursor = end
+        if end == start:
+            return np.zeros(0, dtype=RECORD)
+        expected = np.arange(start + 1, end + 1, dtype=np.uint64)
+        slots = np.arange(start, end) % self.capacity
+        batch = self.records[slots]
+        valid = (batch["seq"] == expected) & (self.records["seq"][slots] == expected)
+        self.dropped += int(np.count_nonzero(~valid))
+        return batch[valid]
+
+    @property
+    def paused(self) -> bool:
+        return bool(self.header[PAUSED])
+
+    def set_paused(self, paused: bool) -> None:
+        self.header[PAUSED] = int(paused)
+
+    def close(self) -> None:
+        """Detach, and remove the segment if this side created it."""
+        self.header = self.records = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def run_sampler(ring_name: str, connection, stop_event, gesture_config: dict, notify_every: int = 32) -> None:
+    """
+    Entry point of the sampler process.
+
+    Args:
+        ring_name (str): Shared-memory ring to publish into
+        connection: Pipe end used to wake the consumer
+        stop_event: multiprocessing.Event that ends sampling
+        gesture_config (dict): 'gesture' configuration section
+        notify_every (int, optional): Samples per wake-up of the consumer. Defaults to 32.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    import libs.gpio_backend as gpio_backend
+    import libs.gesture_scheduler as gesture_scheduler
+    from libs.gesture import GestureModule
+
+    leaked = [name for name in ASSISTANT_MODULES if name in sys.modules]
+    if leaked:
+        logging.error(f"Gesture sampler imported assistant modules {leaked}; keep them out of the main "
+                      "module's top level")
+
+    ring = SampleRing(ring_name)
+    pending = 0
+
+    def on_sample(distance, timestamp):
+        nonlocal pending
+        ring.header[TIMEOUTS] = module.timeouts
+        ring.publish(timestamp, distance, SAMPLE)
+        pending += 1
+        if pending >= notify_every:
+            pending = 0
+            connection.send_bytes(b"s")
+
+    module = GestureModule(
+        distance_filter=gesture_config.get('filter', 'exponential'),
+        timing=gesture_config.get('timing', 'edge'),
+        required_detections=int(gesture_config.get('required_detections', 4)),
+        trace_path=gesture_config.get('trace_path'),
+        gpio=gpio_backend.load_gpio(gesture_config),
+        on_sample=on_sample,
+    )
+
+    def on_gesture():
+        ring.publish(time.monotonic(), module.detector.last_distance, GESTURE)
+        connection.send_bytes(b"g")
+
+    scheduler = gesture_scheduler.SamplingScheduler.from_config(
+        gesture_config, probe=module.sample, detect=module.detect_hand_gesture,
+        should_pause=lambda: ring.paused)
+    logging.info("Gesture sampler process started.")
+    try:
+        scheduler.run(on_gesture, lambda: not stop_event.is_set())
+    except (BrokenPipeError, EOFError):
+        pass
+    finally:
+        scheduler.log_usage()
+        module.stop()
+        ring.close()
+        connection.close()
+
+class SensorProcess:
+    """
+    Runs the gesture sampler in its own process and delivers its gestures.
+
+    Attributes:
+        gesture_config (dict): 'gesture' configuration section passed to the sampler
+        on_gesture (Callable): Called in the consumer thread for every gesture
+        latest_distance (float): Most recent distance sample, or None
+    """
+
+    def __init__(self, gesture_config: dict, on_gesture: Callable[[], None], capacity: int = 4096,
+                 notify_every: int = 32):
+        self.gesture_config = gesture_config
+        self.on_gesture = on_gesture
+        self.capacity = capacity
+        self.notify_every = notify_every
+        self.ring = None
+        self.process = None
+        self.consumer = None
+        self.latest_distance = None
+        self.samples = 0
+        self.gestures = 0
+        self.latencies = deque(maxlen=256)
+        self.context = multiprocessing.get_context("spawn")
+        self.stop_event = self.context.Event()
+
+    def start(self) -> None:
+        """Create the ring, spawn the sampler and start consuming."""
+        self.ring = SampleRing(capacity=self.capacity)
+        receiver, sender = self.context.Pipe(duplex=False)
+        self.process = self.context.Process(
+            target=run_sampler, name="gesture-sampler", daemon=True,
+            args=(self.ring.name, sender, self.stop_event, self.gesture_config, self.notify_every))
+        self.process.start()
+        sender.close()
+        self.consumer = threading.Thread(target=self._consume, args=(receiver,), daemon=True)
+        self.consumer.start()
+        logging.info("Gesture sampler process %d started.", self.process.pid)
+
+    def set_paused(self, paused: bool) -> None:
+        """Pause or resume sampling in the sampler process."""
+        if self.ring is not None:
+            self.ring.set_paused(paused)
+
+    def stop(self) -> None:
+        """Stop the sampler process and release the ring."""
+        self.stop_event.set()
+        if self.process is not None:
+            self.process.join(timeout=3)
+            if self.process.is_alive():
+                self.process.terminate()
+        if self.consumer is not None:
+            self.consumer.join(timeout=1)
+        # Read the ring's counters before it is released
+        logging.info("Gesture sampler stats: %s", self.stats())
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Report delivery counters.
+
+        Returns:
+            Dict[str, float]: Samples and gestures received, samples dropped in the ring,
+                echo timeouts in the sampler, and gesture delivery latency (mean, p95, max)
+        """
+        latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+        return {
+            "samples": self.samples,
+            "gestures": self.gestures,
+            "dropped": self.ring.dropped if self.ring is not None else 0,
+            "echo_timeouts": int(self.ring.header[TIMEOUTS]) if self.ring is not None else 0,
+            "latency_mean": float(latencies.mean()),
+            "latency_p95": float(np.percentile(latencies, 95)),
+            "latency_max": float(latencies.max()),
+        }
+
+    def _consume(self, receiver) -> None:
+        """Block on the wake-up pipe and drain the ring after every wake-up."""
+        try:
+            while True:
+                receiver.recv_bytes()
+                ring = self.ring
+                if ring is None:
+                    break
+                for record in ring.read():
+                    if record["kind"] == GESTURE:
+                        self.gestures += 1
+                        self.latencies.append(time.monotonic() - float(record["timestamp"]))
+                        try:
+                            self.on_gesture()
+                        except Exception as e:
+                            logging.error(f"Error handling gesture: {e}")
+                    else:
+                        self.samples += 1
+                        distance = float(record["distance"])
+                        self.latest_distance = None if np.isnan(distance) else distance
+        except (EOFError, OSError):
+            pass
+        finally:
+            receiver.close()
@@ -0,0 +1,153 @@
+"""
+Sentence-pipelined speech for long texts.
+
+Long replies are split into sentences. A background thread synthesizes
+sentence N+1 while sentence N is playing, keeping at most `lookahead`
+sentences ready, so the listener only waits for the first sentence instead of
+the whole text. A running pipeline can be cancelled at any point.
+"""
+
+import re
+import time
+import queue
+import logging
+import threading
+from typing import Callable, List
+
+# Sentence boundary: terminal punctuation followed by whitespace, or a blank line
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])[\"')\]]*\s+|\n\s*\n")
+
+_END = object()
+
+def split_sentences(text: str, min_chars: int = 20, max_chars: int = 300) -> List[str]:
+    """
+    Split text into speakable sentences.
+
+    Fragments shorter than min_chars are merged into the following sentence so
+    abbreviations and list markers don't become separate requests; sentences
+    longer than max_chars are split on the last comma before the limit, or on
+    the last space if there is no comma.
+
+    Args:
+        text (str): Text to split
+        min_chars (int, optional): Minimum sentence length. Defaults to 20.
+        max_chars (int, optional): Maximum sentence length. Defaults to 300.
+
+    Returns:
+        List[str]: Sentences in reading order
+    """
+    sentences = []
+    pending = ""
+    for part in SENTENCE_BOUNDARY.split(text):
+        part = " ".join(part.split())
+        if not part:
+            continue
+        pending = f"{pending} {part}" if pending else part
+        if len(pending) >= min_chars:
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        if sentences and len(pending) < min_chars:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+
+    result = []
+    for sentence in sentences:
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(", ", 0, max_chars)
+            if cut <= 0:
+                cut = sentence.rfind(" ", 0, max_chars)
+            # After a separator the cut keeps the comma (or drops the space); otherwise cut hard
+            end = cut + 1 if cut > 0 else max_chars
+            result.append(sentence[:end].strip())
+            sentence = sentence[end:].strip()
+        if sentence:
+            result.append(sentence)
+    return result
+
+class SpeechPipeline:
+    """
+    Overlaps synthesis of upcoming sentences with playback of the current one.
+
+    Attributes:
+        synthesize (Callable): Turns a sentence into playable audio
+        play (Callable): Plays audio; receives the cancel event as second argument
+        lookahead (int): Maximum number of synthesized sentences waiting to play
+        cancel_event (threading.Event): Set when the pipeline is cancelled
+    """
+
+    def __init__(self, synthesize: Callable, play: Callable, lookahead: int = 2):
+        self.synthesize = synthesize
+        self.play = play
+        self.lookahead = lookahead
+        self.cancel_event = threading.Event()
+
+    def run(self, text: str) -> bool:
+        """
+        Speak text sentence by sentence, blocking until done or cancelled.
+
+        Args:
+            text (str): Text to speak
+
+        Returns:
+            bool: True if every sentence was played, False if cancelled or failed
+        """
+        sentences = split_sentences(text)
+        if not sentences:
+            return True
+        ready = queue.Queue(maxsize=self.lookahead)
+        producer = threading.Thread(target=self._produce, args=(sentences, ready), daemon=True)
+        start = time.perf_counter()
+        producer.start()
+
+        played = 0
+        try:
+            while not self.cancel_event.is_set():
+                try:
+                    item = ready.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    logging.error(f"Speech synthesis failed: {item}")
+                    break
+                if played == 0:
+                    logging.info("First sentence ready after %.3fs", time.perf_counter() - start)
+                self.play(item, self.cancel_event)
+                played += 1
+        finally:
+            self.cancel_event.set()  # release a producer blocked on a full queue
+            producer.join()
+        logging.info("Spoke %d/%d sentences in %.3fs", played, len(sentences), time.perf_counter() - start)
+        return played == len(sentences)
+
+    def cancel(self) -> None:
+        """Stop playback and synthesis as soon as possible."""
+        if not self.cancel_event.is_set():
+            logging.info("Cancelling speech pipeline.")
+        self.cancel_event.set()
+
+    def _produce(self, sentences: List[str], ready: queue.Queue) -> None:
+        """Synthesize sentences in order, blocking while the lookahead queue is full."""
+        for sentence in sentences:
+            if self.cancel_event.is_set():
+                return
+            try:
+                item = self.synthesize(sentence)
+            except Exception as e:
+                item = e
+            if not self._put(ready, item) or isinstance(item, Exception):
+                return
+        self._put(ready, _END)
+
+    def _put(self, ready: queue.Queue, item) -> bool:
+        """Put item on the queue, giving up if the pipeline is cancelled meanwhile."""
+        while not self.cancel_event.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
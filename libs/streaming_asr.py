@@ -0,0 +1,270 @@
+"""
+Streaming recognition with early command dispatch.
+
+While the capture stream is still listening, audio is fed chunk by chunk to a
+Vosk recognizer that emits partial hypotheses. As soon as a partial
+unambiguously names a command phrase (no other command could still be
+completed from it) and the hypothesis keeps naming it for `stable_ms` of
+audio, or as soon as a final result names a command, the command is committed
+and the rest of the utterance is neither endpointed nor sent to a recognizer. Short control phrases like "pause" or "next" are then dispatched
+while the speaker is still trailing off.
+
+The end-to-end latency from speech onset to a ready command is tracked per
+command for both the early and the full path, so the saving can be reported.
+"""
+
+import json
+import time
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from libs.asr_backends import vosk, load_vosk_model
+
+def normalize(text: str) -> List[str]:
+    """
+    Lower-case and split a transcript into words.
+
+    Args:
+        text (str): Transcript
+
+    Returns:
+        List[str]: Words
+    """
+    return text.lower().split()
+
+class PartialCommandMatcher:
+    """
+    Decides when a partial transcript is safe to dispatch.
+
+    A partial commits to a phrase when the phrase occurs in it (longest phrase
+    first, on word boundaries, as process_command would pick it) and no phrase
+    of another intent could still be completed from the trailing words.
+
+    Attributes:
+        intents (Dict[str, str]): Command phrase -> intent name
+        final_only (set): Intents that need the full transcript (e.g. ones taking arguments)
+        stable_ms (float): Audio during which partials must keep naming the phrase before committing
+    """
+
+    def __init__(self, intents: Dict[str, str], final_only: Iterable[str] = (), stable_ms: float = 100.0):
+        self.intents = {" ".join(normalize(phrase)): intent for phrase, intent in intents.items()}
+        self.phrases = sorted(self.intents, key=len, reverse=True)
+        self.final_only = set(final_only)
+        self.stable_ms = stable_ms
+
+    def match(self, words: List[str]) -> Optional[str]:
+        """
+        Find the command phrase a transcript would dispatch to.
+
+        Args:
+            words (List[str]): Transcript words
+
+        Returns:
+            Optional[str]: Matched phrase, or None
+        """
+        padded = f" {' '.join(words)} "
+        for phrase in self.phrases:
+            if f" {phrase} " in padded:
+                return phrase
+        return None
+
+    def is_unambiguous(self, words: List[str], phrase: str) -> bool:
+        """
+        Check that no phrase of another intent could still be completed.
+
+        Args:
+            words (List[str]): Partial transcript words
+            phrase (str): Phrase matched in the partial
+
+        Returns:
+            bool: True if dispatching the phrase's intent now is safe
+        """
+        intent = self.intents[phrase]
+        if intent in self.final_only:
+            return False
+        for other in self.phrases:
+            if self.intents[other] == intent:
+                continue
+            other_words = other.split()
+            for count in range(1, min(len(words), len(other_words) - 1) + 1):
+                if words[-count:] == other_words[:count]:
+                    return False
+        return True
+
+class StreamingSession:
+    """
+    One utterance of streaming recognition.
+
+    Attributes:
+        committed (str): Phrase committed early, or None
+        partials (list): (seconds since start, partial text) for each new partial
+        audio_seconds (float): Audio consumed so far
+    """
+
+    def __init__(self, recognizer, sample_rate: int, matcher: PartialCommandMatcher):
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.matcher = matcher
+        self.committed = None
+        self.partials = []
+        self.audio_seconds = 0.0
+        self.started = time.perf_counter()
+        self.candidate = None
+        self.candidate_since = 0.0
+        self.last_partial = None
+
+    def accept(self, samples: np.ndarray) -> bool:
+        """
+        Feed the next block of audio and check the partial hypothesis.
+
+        Args:
+            samples (np.ndarray): int16 mono samples following the previous block
+
+        Returns:
+            bool: True once a command has been committed; the caller should stop listening
+        """
+        if self.committed is not None:
+            return True
+        self.audio_seconds += len(samples) / self.sample_rate
+        final = self.recognizer.AcceptWaveform(samples.tobytes())
+        if final:
+            text = json.loads(self.recognizer.Result()).get("text", "")
+        else:
+            text = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        if text != self.last_partial:
+            self.last_partial = text
+            self.partials.append((time.perf_counter() - self.started, text))
+            logging.debug("%s transcript: %s", "Final" if final else "Partial", text)
+
+        words = normalize(text)
+        phrase = self.matcher.match(words)
+        if final and phrase is not None and self.matcher.intents[phrase] not in self.matcher.final_only:
+            # The recognizer has endpointed this segment; its words will not change any more
+            return self.commit(phrase)
+        if phrase is None or not self.matcher.is_unambiguous(words, phrase):
+            self.candidate = None
+            return False
+        if phrase != self.candidate:
+            # Stability is measured from the start of this block
+            self.candidate = phrase
+            self.candidate_since = self.audio_seconds - len(samples) / self.sample_rate
+        if (self.audio_seconds - self.candidate_since) * 1000 >= self.matcher.stable_ms:
+            return self.commit(phrase)
+        return False
+
+    def commit(self, phrase: str) -> bool:
+        self.committed = phrase
+        logging.info("Early command commit '%s' after %.2fs of audio", phrase, self.audio_seconds)
+        return True
+
+class StreamingRecognizer:
+    """
+    Factory of streaming sessions over a shared Vosk model.
+
+    Attributes:
+        model_path (str): Path of the Vosk model directory
+        matcher (PartialCommandMatcher): Early-commit rules, set by set_commands()
+    """
+
+    def __init__(self, model_path: Optional[str], stable_ms: float = 100.0):
+        self.model_path = model_path
+        self.stable_ms = stable_ms
+        self.matcher = None
+        self.model = None
+        if vosk is None or not model_path:
+            logging.warning("Streaming recognition disabled (Vosk or model missing).")
+            return
+        try:
+            self.model = load_vosk_model(model_path)
+        except Exception as e:
+            logging.error(f"Failed to load streaming recognizer model: {e}")
+
+    @property
+    def available(self) -> bool:
+        return self.model is not None and self.matcher is not None
+
+    def set_commands(self, intents: Dict[str, str], final_only: Iterable[str] = ()) -> None:
+        """
+        Configure the phrases that may be dispatched early.
+
+        Args:
+            intents (Dict[str, str]): Command phrase -> intent name
+            final_only (Iterable[str], optional): Intents that must wait for the final transcript
+        """
+        self.matcher = PartialCommandMatcher(intents, final_only, self.stable_ms)
+
+    def session(self, sample_rate: int) -> StreamingSession:
+        """
+        Start recognizing a new utterance.
+
+        Args:
+            sample_rate (int): Sample rate of the audio that will be fed
+
+        Returns:
+            StreamingSession: Session to feed with accept()
+        """
+        return StreamingSession(vosk.KaldiRecognizer(self.model, sample_rate), sample_rate, self.matcher)
+
+class DispatchLatency:
+    """
+    Speech-onset-to-command latency per command, split by early and full path.
+    """
+
+    def __init__(self):
+        self.samples = defaultdict(lambda: {"early": [], "full": []})
+
+    def record(self, command: str, latency: float, early: bool) -> None:
+        """
+        Record how long a command took to become ready.
+
+        Args:
+            command (str): Dispatched command phrase (or transcript)
+            latency (float): Seconds from speech onset to the command being ready
+            early (bool): Whether it was committed from a partial
+        """
+        self.samples[command]["early" if early else "full"].append(latency)
+        entry = self.summary().get(command, {})
+        logging.info("Command '%s' ready %.0fms after speech onset (%s path)%s", command, latency * 1000,
+                     "early" if early else "full",
+                     f"; saving {entry['saving'] * 1000:.0f}ms" if entry.get("saving") is not None else "")
+
+    def summary(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Summarize latencies per command.
+
+        Returns:
+            Dict[str, Dict[str, Optional[float]]]: Command -> mean early and full latency,
+                counts and the saving (full minus early) once both paths have been seen
+        """
+        report = {}
+        for command, paths in self.samples.items():
+            early = float(np.mean(paths["early"])) if paths["early"] else None
+            full = float(np.mean(paths["full"])) if paths["full"] else None
+            report[command] = {
+                "early": early,
+                "full": full,
+                "early_count": len(paths["early"]),
+                "full_count": len(paths["full"]),
+                "saving": full - early if early is not None and full is not None else None,
+            }
+        return report
+
+def onset_time(source, listen_start: int, endpointer) -> Tuple[float, bool]:
+    """
+    Estimate the monotonic time at which speech began.
+
+    Args:
+        source (CaptureStream): Stream the utterance was captured from
+        listen_start (int): Absolute sample position where listening began
+        endpointer (vad.Endpointer): Endpointer used for the utterance
+
+    Returns:
+        Tuple[float, bool]: (time, whether the endpointer saw the onset); without an
+            onset the start of listening is used
+    """
+    if endpointer.start_frame is None:
+        return source.time_of(listen_start), False
+    return source.time_of(listen_start + endpointer.start_frame * endpointer.vad.frame_length), True
@@ -0,0 +1,113 @@
+"""
+Small JSON-file cache with per-entry expiry.
+
+Values are JSON-serializable objects stored under string keys, each with the
+time it expires. The whole cache is one JSON file rewritten atomically on
+every update, which suits the few dozen entries it holds (news summaries per
+article URL, weather observations per city) and lets them survive restarts.
+Expired entries are dropped when the file is written.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Any, Optional
+
+class TTLCache:
+    """
+    Persistent key -> value cache whose entries expire after a TTL.
+
+    Attributes:
+        path (str): JSON file backing the cache
+        ttl (float): Default time to live of an entry, in seconds
+        entries (dict): key -> {"value", "stored", "expires"}
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that found nothing or an expired entry
+    """
+
+    def __init__(self, path: str, ttl: float):
+        """
+        Initialize the cache and load the file if it exists.
+
+        Args:
+            path (str): JSON file backing the cache
+            ttl (float): Default time to live in seconds
+        """
+        self.path = path
+        self.ttl = ttl
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self._load()
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[Any]:
+        """
+        Look up a live entry.
+
+        Args:
+            key (str): Entry key
+            now (float, optional): time.time() to check expiry against
+
+        Returns:
+            Optional[Any]: The value, or None if missing or expired
+        """
+        now = time.time() if now is None else now
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry["expires"] <= now:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry["value"]
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store an entry and persist the cache.
+
+        Args:
+            key (str): Entry key
+            value (Any): JSON-serializable value
+            ttl (float, optional): Time to live in seconds. Defaults to the cache's TTL.
+        """
+        self.put_many({key: value}, ttl)
+
+    def put_many(self, values: dict, ttl: Optional[float] = None) -> None:
+        """
+        Store several entries with a single write.
+
+        Args:
+            values (dict): key -> JSON-serializable value
+            ttl (float, optional): Time to live in seconds. Defaults to the cache's TTL.
+        """
+        now = time.time()
+        expires = now + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            for key, value in values.items():
+                self.entries[key] = {"value": value, "stored": now, "expires": expires}
+            self.entries = {k: e for k, e in self.entries.items() if e["expires"] > now}
+            self._save()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+        except (OSError, ValueError) as e:
+            logging.error(f"Ignoring damaged cache file {self.path}: {e}")
+            self.entries = {}
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logging.error(f"Failed to write cache file {self.path}: {e}")
@@ -0,0 +1,234 @@
+"""
+Content-addressed cache for synthesized speech.
+
+Audio returned by the TTS service is stored on disk under a hash of
+(text, model, voice, format), so a repeated phrase is played straight from the
+SD card instead of being synthesized again. An on-disk JSON index keeps the
+entries in least-recently-used order and the total size is bounded by evicting
+the oldest entries first. Hits only update the access times in memory; the
+index is written when an entry is added or evicted and on close(), so the
+speak path never waits on an SD-card write.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+# Files written by the old uuid4-per-call speak() implementation
+LEGACY_FILE_PATTERN = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\.mp3$")
+
+class TTSCache:
+    """
+    A size-bounded LRU cache of synthesized speech files.
+
+    Attributes:
+        cache_dir (str): Directory holding the cached audio files and index
+        max_bytes (int): Upper bound on the total size of cached audio
+        index_path (str): Path of the JSON index file
+        entries (OrderedDict): key -> {"file", "size", "last_used"}, oldest first
+        hits (int): Number of lookups served from disk
+        misses (int): Number of lookups that needed synthesis
+        evictions (int): Number of entries removed to stay under max_bytes
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 64 * 1024 * 1024, index_name: str = "index.json"):
+        """
+        Initialize the cache and load the on-disk index.
+
+        Args:
+            cache_dir (str): Directory holding the cached audio files
+            max_bytes (int, optional): Maximum total size in bytes. Defaults to 64 MiB.
+            index_name (str, optional): File name of the index. Defaults to 'index.json'.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, index_name)
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.dirty = False
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+        self._remove_legacy_files()
+        logging.info(f"TTSCache initialized with {len(self.entries)} entries ({self.total_bytes} bytes) in {cache_dir}")
+
+    @staticmethod
+    def make_key(text: str, model: str, voice: str, response_format: str = "mp3") -> str:
+        """
+        Build the content address of a phrase.
+
+        Args:
+            text (str): Text that is spoken
+            model (str): TTS model name
+            voice (str): TTS voice name
+            response_format (str, optional): Audio format. Defaults to 'mp3'.
+
+        Returns:
+            str: Hex SHA-256 digest identifying the audio
+        """
+        payload = "\x1f".join((text.strip(), model, voice, response_format))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached file and mark it as most recently used.
+
+        Args:
+            key (str): Key returned by make_key()
+
+        Returns:
+            Optional[str]: Path of the cached file, or None on a miss
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                path = os.path.join(self.cache_dir, entry["file"])
+                if os.path.exists(path):
+                    entry["last_used"] = time.time()
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    self.dirty = True
+                    return path
+                # File vanished behind our back; forget the entry
+                self.total_bytes -= entry["size"]
+                del self.entries[key]
+                self.dirty = True
+            self.misses += 1
+            return None
+
+    def put(self, key: str, data: bytes, ext: str = "mp3") -> str:
+        """
+        Store audio under a key, evicting old entries if the cache is full.
+
+        Args:
+            key (str): Key returned by make_key()
+            data (bytes): Encoded audio
+            ext (str, optional): File extension. Defaults to 'mp3'.
+
+        Returns:
+            str: Path of the stored file
+        """
+        file_name = f"{key}.{ext}"
+        path = os.path.join(self.cache_dir, file_name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous["size"]
+            self.entries[key] = {"file": file_name, "size": len(data), "last_used": time.time()}
+            self.total_bytes += len(data)
+            self._evict()
+            self._save_index()
+        logging.debug(f"Cached {len(data)} bytes of speech as {file_name}")
+        return path
+
+    def flush(self) -> None:
+        """Write the index if access times changed since it was last written."""
+        with self.lock:
+            if self.dirty:
+                self._save_index()
+
+    def close(self) -> None:
+        """Flush the index and log the cache counters."""
+        self.flush()
+        logging.info(f"TTS cache stats: {self.stats()}")
+
+    def stats(self) -> dict:
+        """
+        Report cache counters.
+
+        Returns:
+            dict: Entry count, size, hits, misses, evictions and hit rate
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            key, entry = self.entries.popitem(last=False)
+            self.total_bytes -= entry["size"]
+            self.evictions += 1
+            try:
+                os.remove(os.path.join(self.cache_dir, entry["file"]))
+            except OSError as e:
+                logging.warning(f"Failed to remove evicted cache file {entry['file']}: {e}")
+
+    def _load_index(self) -> None:
+        """Read the index, dropping malformed entries and entries whose files no longer exist."""
+        try:
+            with open(self.index_path) as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable TTS cache index: {e}")
+            return
+        if not isinstance(raw, dict):
+            logging.warning("Ignoring TTS cache index that is not a JSON object")
+            return
+        valid = {key: entry for key, entry in raw.items() if self._valid_entry(entry)}
+        if len(valid) < len(raw):
+            logging.warning(f"Dropping {len(raw) - len(valid)} malformed TTS cache index entries")
+            self.dirty = True
+        for key, entry in sorted(valid.items(), key=lambda item: item[1]["last_used"]):
+            if os.path.exists(os.path.join(self.cache_dir, entry["file"])):
+                self.entries[key] = entry
+                self.total_bytes += entry["size"]
+            else:
+                self.dirty = True
+        with self.lock:
+            self._evict()
+
+    @staticmethod
+    def _valid_entry(entry) -> bool:
+        """Check that an index entry has a file name, a size and an access time of the right types."""
+        return (isinstance(entry, dict) and isinstance(entry.get("file"), str)
+                and isinstance(entry.get("size"), int) and entry["size"] >= 0
+                and isinstance(entry.get("last_used"), (int, float)))
+
+    def _save_index(self) -> None:
+        """Atomically write the index to disk. Caller must hold the lock."""
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.index_path)
+            self.dirty = False
+        except OSError as e:
+            logging.error(f"Failed to write TTS cache index: {e}")
+
+    def _remove_legacy_files(self) -> None:
+        """Delete the unreferenced uuid4 files left behind by the old speak()."""
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if LEGACY_FILE_PATTERN.match(name):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                    removed += 1
+                except OSError as e:
+                    logging.warning(f"Failed to remove legacy cache file {name}: {e}")
+        if removed:
+            logging.info(f"Removed {removed} legacy TTS cache files")
@@ -0,0 +1,276 @@
+"""
+Streaming text-to-speech playback.
+
+Instead of waiting for the whole synthesized file, response chunks are written
+to the audio device as they arrive. Raw PCM is requested from the TTS service
+so no MP3 decode sits between the network and the speaker. First-byte and
+first-audio latencies are recorded for every utterance.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Iterable, Optional, Tuple
+
+import openai
+import pyaudio  # type: ignore
+
+import libs.async_core as async_core
+
+# OpenAI's 'pcm' response format: 24kHz, 16-bit signed little-endian, mono
+PCM_SAMPLE_RATE = 24000
+PCM_SAMPLE_WIDTH = 2
+PCM_CHANNELS = 1
+
+class PyAudioSink:
+    """
+    Blocking PCM sink writing to the default output device through PyAudio.
+
+    Attributes:
+        rate (int): Sample rate in Hz
+        channels (int): Number of interleaved channels
+        frames_per_buffer (int): Device buffer size in frames
+    """
+
+    def __init__(self, rate: int = PCM_SAMPLE_RATE, channels: int = PCM_CHANNELS, frames_per_buffer: int = 1024):
+        self.rate = rate
+        self.channels = channels
+        self.frames_per_buffer = frames_per_buffer
+        self.audio = pyaudio.PyAudio()
+        self.stream = None
+
+    def open(self) -> None:
+        """Open the output stream."""
+        self.stream = self.audio.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.rate,
+            frames_per_buffer=self.frames_per_buffer,
+            output=True,
+        )
+
+    def write(self, data: bytes) -> None:
+        """Queue PCM bytes on the device, blocking while its buffer is full."""
+        if self.stream is None:
+            self.open()
+        self.stream.write(data)  # type: ignore
+
+    def close(self) -> None:
+        """Drain pending audio and close the output stream."""
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+
+class StreamingSpeaker:
+    """
+    Plays TTS responses while they are still being downloaded.
+
+    Attributes:
+        model (str): TTS model name
+        voice (str): TTS voice name
+        cache (TTSCache): Optional cache the complete PCM is stored in
+        sink (PyAudioSink): Output the chunks are written to
+        chunk_size (int): Size of the network reads in bytes
+        latencies (deque): Recent per-utterance latency records
+    """
+
+    def __init__(self, model: str, voice: str, cache=None, sink: Optional[PyAudioSink] = None, chunk_size: int = 4096):
+        self.model = model
+        self.voice = voice
+        self.cache = cache
+        self.sink = sink or PyAudioSink()
+        self.chunk_size = chunk_size
+        self.latencies = deque(maxlen=100)
+        self.lock = threading.Lock()
+        self.async_client = None
+
+    def speak(self, text: str, cancel_event: Optional[threading.Event] = None) -> dict:
+        """
+        Synthesize and play text, starting playback with the first chunk.
+
+        Args:
+            text (str): The text to be spoken
+            cancel_event (threading.Event, optional): Set to interrupt playback
+
+        Returns:
+            dict: Latency record with 'first_byte', 'first_audio' and 'total'
+                  in seconds, and 'cached' telling whether the network was skipped
+        """
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(text, self.model, self.voice, "pcm")
+            cached_path = self.cache.get(key)
+            if cached_path is not None:
+                return self._play(self._read_file(cached_path), cached=True, cancel_event=cancel_event)
+
+        with openai.audio.speech.with_streaming_response.create(
+            model=self.model,
+            voice=self.voice,
+            input=text,
+            response_format="pcm",
+        ) as response:
+            received = []
+            record = self._play(self._tee(response.iter_bytes(self.chunk_size), received),
+                                cached=False, cancel_event=cancel_event)
+
+        if record["complete"]:
+            self._store(key, b"".join(received))
+        return record
+
+    def synthesize_pcm(self, text: str) -> bytes:
+        """
+        Fetch the complete PCM rendering of text, using the cache when possible.
+
+        Args:
+            text (str): The text to be spoken
+
+        Returns:
+            bytes: 24kHz 16-bit mono PCM
+        """
+        key, data = self._lookup(text)
+        if data is not None:
+            return data
+
+        response = openai.audio.speech.create(
+            model=self.model,
+            voice=self.voice,
+            input=text,
+            response_format="pcm",
+        )
+        data = response.content
+        self._store(key, data)
+        return data
+
+    async def asynthesize_pcm(self, text: str) -> bytes:
+        """
+        Fetch the complete PCM rendering of text without blocking the event loop.
+
+        Args:
+            text (str): The text to be spoken
+
+        Returns:
+            bytes: 24kHz 16-bit mono PCM
+        """
+        core = async_core.get_core()
+        key, data = await core.to_thread(self._lookup, text)
+        if data is not None:
+            return data
+
+        if self.async_client is None:
+            self.async_client = openai.AsyncOpenAI(api_key=openai.api_key, http_client=core.client)
+        response = await self.async_client.audio.speech.create(
+            model=self.model,
+            voice=self.voice,
+            input=text,
+            response_format="pcm",
+        )
+        data = response.content
+        await core.to_thread(self._store, key, data)
+        return data
+
+    def _lookup(self, text: str) -> Tuple[Optional[str], Optional[bytes]]:
+        """Cache key of text (None without a cache) and its cached PCM, or None on a miss (blocking)."""
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(text, self.model, self.voice, "pcm")
+        cached_path = self.cache.get(key)
+        if cached_path is None:
+            return key, None
+        with open(cached_path, "rb") as f:
+            return key, f.read()
+
+    def _store(self, key: Optional[str], data: bytes) -> None:
+        if key is not None:
+            self.cache.put(key, data, ext="pcm")
+
+    def play_pcm(self, data: bytes, cancel_event: Optional[threading.Event] = None) -> dict:
+        """
+        Play already synthesized PCM, stopping early if cancel_event is set.
+
+        Args:
+            data (bytes): 24kHz 16-bit mono PCM
+            cancel_event (threading.Event, optional): Set to interrupt playback
+
+        Returns:
+            dict: Latency record as returned by speak()
+        """
+        chunks = (data[i:i + self.chunk_size] for i in range(0, len(data), self.chunk_size))
+        return self._play(chunks, cached=True, cancel_event=cancel_event)
+
+    def latency_summary(self) -> dict:
+        """
+        Summarize the recorded latencies.
+
+        Returns:
+            dict: Utterance count and mean first-byte/first-audio/total seconds,
+                  computed separately for network and cached playback
+        """
+        summary = {}
+        for cached in (False, True):
+            records = [r for r in self.latencies if r["cached"] == cached]
+            if not records:
+                continue
+            label = "cached" if cached else "network"
+            summary[label] = {
+                "count": len(records),
+                "first_byte": sum(r["first_byte"] for r in records) / len(records),
+                "first_audio": sum(r["first_audio"] for r in records) / len(records),
+                "total": sum(r["total"] for r in records) / len(records),
+            }
+        return summary
+
+    def _play(self, chunks: Iterable[bytes], cached: bool, cancel_event: Optional[threading.Event] = None) -> dict:
+        """Write chunks to the sink, keeping samples aligned and timing the stream."""
+        start = time.perf_counter()
+        first_byte = first_audio = None
+        remainder = b""
+        complete = False
+        with self.lock:
+            try:
+                for chunk in chunks:
+                    if cancel_event is not None and cancel_event.is_set():
+                        break
+                    if first_byte is None:
+                        first_byte = time.perf_counter() - start
+                    data = remainder + chunk
+                    aligned = len(data) - len(data) % PCM_SAMPLE_WIDTH
+                    remainder = data[aligned:]
+                    if aligned:
+                        self.sink.write(data[:aligned])
+                        if first_audio is None:
+                            first_audio = time.perf_counter() - start
+                else:
+                    complete = True
+            finally:
+                self.sink.close()
+        total = time.perf_counter() - start
+        record = {
+            "first_byte": first_byte if first_byte is not None else total,
+            "first_audio": first_audio if first_audio is not None else total,
+            "total": total,
+            "cached": cached,
+            "complete": complete,
+        }
+        self.latencies.append(record)
+        logging.info("Speech %s: first byte %.3fs, first audio %.3fs, total %.3fs",
+                     "from cache" if cached else "streamed",
+                     record["first_byte"], record["first_audio"], total)
+        return record
+
+    def _read_file(self, path: str) -> Iterable[bytes]:
+        """Yield a cached PCM file in chunk_size pieces."""
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    @staticmethod
+    def _tee(chunks: Iterable[bytes], received: list) -> Iterable[bytes]:
+        """Pass chunks through while keeping a copy for the cache."""
+        for chunk in chunks:
+            received.append(chunk)
+            yield chunk
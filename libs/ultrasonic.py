@@ -0,0 +1,156 @@
+"""
+Echo timing for HC-SR04 style ultrasonic sensors.
+
+Two ways of timing the echo pulse are provided:
+
+- EdgeEchoTimer (the default): the GPIO library's edge-detection thread
+  calls back on both echo edges, each stamped with time.monotonic_ns(); the
+  measuring thread just waits on an Event, so nothing spins and wall-clock
+  jumps cannot corrupt a reading.
+- poll_echo: the original busy-wait on GPIO.input(), timed with
+  time.monotonic_ns(), kept as a fallback and as the baseline for
+  benchmarks/ultrasonic_cpu.py.
+"""
+
+import time
+import threading
+from typing import Optional
+
+SPEED_OF_SOUND_CM_S = 34300
+MAX_RANGE_CM = 400
+ECHO_TIMEOUT_S = 0.02
+
+def send_trigger(gpio, trigger_pin: int) -> None:
+    """
+    Send the 10 µs trigger pulse that starts a measurement.
+
+    Args:
+        gpio: RPi.GPIO-compatible module
+        trigger_pin (int): Trigger pin (BCM numbering)
+    """
+    gpio.output(trigger_pin, False)
+    time.sleep(0.000005)
+    gpio.output(trigger_pin, True)
+    time.sleep(0.00001)
+    gpio.output(trigger_pin, False)
+
+def pulse_to_distance(pulse_seconds: Optional[float]) -> Optional[float]:
+    """
+    Convert an echo pulse length to a distance.
+
+    Args:
+        pulse_seconds (float): Echo pulse length, or None
+
+    Returns:
+        Optional[float]: Distance in cm, or None if out of range
+    """
+    if pulse_seconds is None:
+        return None
+    distance = (pulse_seconds * SPEED_OF_SOUND_CM_S) / 2
+    return distance if 0 <= distance <= MAX_RANGE_CM else None
+
+def poll_echo(gpio, trigger_pin: int, echo_pin: int, timeout: float = ECHO_TIMEOUT_S) -> Optional[float]:
+    """
+    Time the echo pulse by busy-waiting on the echo pin.
+
+    Args:
+        gpio: RPi.GPIO-compatible module
+        trigger_pin (int): Trigger pin
+        echo_pin (int): Echo pin
+        timeout (float, optional): Seconds to wait for the echo. Defaults to 0.02.
+
+    Returns:
+        Optional[float]: Pulse length in seconds, or None on timeout
+    """
+    send_trigger(gpio, trigger_pin)
+    deadline = time.monotonic_ns() + int(timeout * 1e9)
+    pulse_start = pulse_end = time.monotonic_ns()
+    while gpio.input(echo_pin) == 0:
+        pulse_start = time.monotonic_ns()
+        if pulse_start > deadline:
+            return None
+    while gpio.input(echo_pin) == 1:
+        pulse_end = time.monotonic_ns()
+        if pulse_end > deadline:
+            return None
+    return (pulse_end - pulse_start) / 1e9
+
+class EdgeEchoTimer:
+    """
+    Times echo pulses from GPIO edge callbacks.
+
+    Each callback reads the echo pin's level: an edge counts as the rise only
+    while the pin is high, and as the fall only after a rise while the pin is
+    low. Edges stamped before the current trigger (e.g. the late fall of a
+    timed-out previous ping) are dropped. A pulse so short that it has ended
+    before the rising callback reads the pin is lost as a timeout rather than
+    misread.
+
+    Attributes:
+        trigger_pin (int): Trigger pin
+        echo_pin (int): Echo pin
+        timeout (float): Seconds to wait for the echo
+        rise (int): monotonic_ns of the accepted rising edge of the current pulse, or None
+        fall (int): monotonic_ns of the accepted falling edge, or None
+    """
+
+    def __init__(self, gpio, trigger_pin: int, echo_pin: int, timeout: float = ECHO_TIMEOUT_S):
+        self.gpio = gpio
+        self.trigger_pin = trigger_pin
+        self.echo_pin = echo_pin
+        self.timeout = timeout
+        self.rise = None
+        self.fall = None
+        self.armed_ns = None
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+        self.active = False
+
+    def start(self) -> None:
+        """
+        Register the edge callback.
+
+        Raises:
+            RuntimeError: If the GPIO library cannot add edge detection on the pin
+        """
+        if not self.active:
+            self.gpio.add_event_detect(self.echo_pin, self.gpio.BOTH, callback=self._on_edge)
+            self.active = True
+
+    def stop(self) -> None:
+        """Remove the edge callback."""
+        if self.active:
+            self.gpio.remove_event_detect(self.echo_pin)
+            self.active = False
+
+    def measure(self) -> Optional[float]:
+        """
+        Trigger the sensor and wait for both echo edges.
+
+        Returns:
+            Optional[float]: Pulse length in seconds, or None on timeout
+        """
+        with self.lock:
+            self.rise = self.fall = None
+            self.done.clear()
+            self.armed_ns = time.monotonic_ns()
+        send_trigger(self.gpio, self.trigger_pin)
+        timed_out = not self.done.wait(self.timeout)
+        with self.lock:
+            self.armed_ns = None
+            if timed_out:
+                return None
+            return (self.fall - self.rise) / 1e9
+
+    def _on_edge(self, channel) -> None:
+        now = time.monotonic_ns()
+        high = bool(self.gpio.input(self.echo_pin))
+        with self.lock:
+            if self.armed_ns is None or now < self.armed_ns or self.fall is not None:
+                return
+            if self.rise is None:
+                if high:
+                    self.rise = now
+            elif not high:
+                self.fall = now
+                self.done.set()
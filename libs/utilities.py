@@ -16,26 +16,36 @@ Dependencies:
     - speech_recognition: For speech input
     - pydub: For audio processing
     - yaml: For configuration management
-    - requests: For API calls
+    - httpx: For API calls (on the async core's event loop)
     - smtplib: For email functionality
 """
 
 import libs.gpt as gpt
+import libs.tts_cache as tts_cache
+import libs.tts_stream as tts_stream
+import libs.speech_pipeline as speech_pipeline
+import libs.prompt_bank as prompt_bank
+import libs.audio_engine as audio_engine
+import libs.audio_capture as audio_capture
+import libs.vad as vad
+import libs.command_recognizer as command_recognizer
+import libs.asr_backends as asr_backends
+import libs.audio_encoding as audio_encoding
+import libs.streaming_asr as streaming_asr
+import libs.async_core as async_core
+import libs.briefing as briefing
+import libs.ttl_cache as ttl_cache
+import os
 import random
 import time
-import speech_recognition as sr # type: ignore
-from functools import lru_cache
 import yaml
-import requests
-import shutil
+import httpx
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 import smtplib
 import openai
-import subprocess
 from pydub import AudioSegment  # type: ignore
-import uuid
 import logging
 
 # Configure logging
@@ -52,11 +62,46 @@ author = config['utilities']['author']
 success = config['utilities']['audio_files']['success']
 error = config['utilities']['audio_files']['error']
 load = config['utilities']['audio_files']['load']
+alarm = config['utilities']['audio_files'].get('alarm', success)
 newsAPI = config['utilities']['news_api_key']
 weatherAPI = config['utilities']['weather_api_key']
+ttsConfig = config['utilities'].get('tts', {})
+promptBankPath = config['utilities'].get('prompt_bank_path', '/home/pi/FAM/assets/prompts.bank')
+speechConfig = config['utilities'].get('speech', {})
+briefingConfig = config['utilities'].get('briefing', {})
+newsConfig = config['utilities'].get('news', {})
+weatherConfig = config['utilities'].get('weather', {})
+
+TTS_MODEL = ttsConfig.get('model', 'tts-1')
+TTS_VOICE = ttsConfig.get('voice', 'shimmer')
+TTS_CACHE_DIR = ttsConfig.get('cache_dir', '/home/pi/FAM/assets/cache')
+TTS_CACHE_MAX_BYTES = int(ttsConfig.get('cache_max_mb', 64)) * 1024 * 1024
+TTS_STREAMING = ttsConfig.get('streaming', True)
+TTS_LOOKAHEAD = int(ttsConfig.get('lookahead_sentences', 2))
+BRIEFING_LOCATION = briefingConfig.get('location', 'Allahabad')
+WEATHER_UNAVAILABLE = "Unable to fetch weather data at the moment."
+WEATHER_FAILED = "An error occurred while processing the weather data."
+WEATHER_TIMEOUT_S = float(weatherConfig.get('timeout_s', 5))
+WEATHER_REPHRASE = bool(weatherConfig.get('llm_rephrase', False))
+NEWS_SUMMARY_MAX_TOKENS = int(newsConfig.get('summary_max_tokens', 1024))
 
 Gpt = gpt.Generation()
 openai.api_key = config['main']['openai_api_key']
+ttsCache = tts_cache.TTSCache(TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_BYTES)
+audioEngine = audio_engine.get_engine()
+asyncCore = async_core.get_core()
+summaryCache = ttl_cache.TTLCache(
+    newsConfig.get('summary_cache', '/home/pi/FAM/assets/cache/news_summaries.json'),
+    ttl=float(newsConfig.get('summary_ttl_min', 720)) * 60,
+)
+weatherCache = ttl_cache.TTLCache(
+    weatherConfig.get('cache', '/home/pi/FAM/assets/cache/weather.json'),
+    ttl=float(weatherConfig.get('ttl_min', 15)) * 60,
+)
+streamingSpeaker = tts_stream.StreamingSpeaker(
+    TTS_MODEL, TTS_VOICE, cache=ttsCache,
+    sink=audio_engine.EngineSink(audioEngine, 'voice', rate=tts_stream.PCM_SAMPLE_RATE),
+)
 
 class Utilities:
     """
@@ -81,8 +126,86 @@ class Utilities:
             "error": error,
             "load": load
         }
+        self.speech_pipeline = None
+        self.speaking_listeners = []
+        self.prompt_bank = self.load_prompt_bank(promptBankPath)
+        self.asr = asr_backends.BackendSelector.from_config(speechConfig)
+        self.endpointer = vad.Endpointer(
+            vad.VoiceActivityDetector(sample_rate=int(speechConfig.get('sample_rate', 16000))),
+            hangover_ms=int(speechConfig.get('hangover_ms', 300)),
+            max_utterance_s=float(speechConfig.get('max_utterance_s', 10.0)),
+        )
+        self.trim_vad = vad.VoiceActivityDetector(sample_rate=audio_encoding.TARGET_RATE)
+        self.command_recognizer = command_recognizer.CommandRecognizer(
+            speechConfig.get('command_model_path'),
+            sample_rate=audio_encoding.TARGET_RATE,
+            min_confidence=float(speechConfig.get('command_min_confidence', 0.85)),
+        )
+        self.streaming_recognizer = streaming_asr.StreamingRecognizer(
+            speechConfig.get('offline_model_path') if speechConfig.get('streaming_partials', True) else None,
+            stable_ms=float(speechConfig.get('early_dispatch_stable_ms', 100)),
+        )
+        self.dispatch_latency = streaming_asr.DispatchLatency()
+        self.briefing = briefing.MorningBriefing(
+            briefing.BriefingBundle(briefingConfig.get('bundle_dir', '/home/pi/FAM/assets/briefing'), ttls={
+                'greeting': 24 * 3600,
+                'weather': float(briefingConfig.get('weather_ttl_min', 60)) * 60,
+                'news': float(briefingConfig.get('news_ttl_min', 180)) * 60,
+            }),
+            sources={'greeting': self.briefing_greeting, 'weather': self.briefing_weather, 'news': self.briefing_news},
+            synthesize=streamingSpeaker.asynthesize_pcm,
+            play=lambda data, cancel_event: asyncCore.to_thread(streamingSpeaker.play_pcm, data, cancel_event),
+            keys={'greeting': lambda context: self.greeting_text(), 'weather': lambda context: context['location']},
+            fallbacks={
+                'weather': lambda context: f"Sorry, I couldn't fetch the weather for {context['location']}.",
+                'news': lambda context: "Sorry, I couldn't fetch the news headlines.",
+            },
+            on_segment=self.on_briefing_segment,
+            to_thread=asyncCore.to_thread,
+        )
+        self.briefing_precompute = None
+        if briefingConfig.get('wake_time'):
+            self.briefing_precompute = briefing.BriefingPrecompute(
+                self.refreshBriefing, str(briefingConfig['wake_time']),
+                lead_minutes=float(briefingConfig.get('precompute_lead_min', 15)))
         logging.info("Utilities class initialized.")
 
+    def load_prompt_bank(self, path: str):
+        """
+        Memory-map the packed prompt bank if it has been built.
+
+        Args:
+            path (str): Path of the packed PCM file
+
+        Returns:
+            PromptBank: The loaded bank, or None to decode prompt files on demand
+        """
+        if not os.path.exists(path):
+            logging.warning(f"Prompt bank not found at {path}; run 'python -m libs.prompt_bank' to build it.")
+            return None
+        try:
+            return prompt_bank.PromptBank(path)
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Failed to load prompt bank: {e}")
+            return None
+
+    def playPrompt(self, file_path: str, channel: str = 'voice') -> None:
+        """
+        Play a canned prompt, from the prompt bank when it has been built.
+
+        Args:
+            file_path (str): Path of the prompt file
+            channel (str, optional): Audio engine channel. Defaults to 'voice'.
+        """
+        try:
+            name = prompt_bank.prompt_name(file_path)
+            if self.prompt_bank is not None and name in self.prompt_bank:
+                audioEngine.queue(channel, self.prompt_bank.sound(name), block=True)
+            else:
+                audioEngine.play_file(channel, file_path, block=True)
+        except Exception as e:
+            logging.error(f"Error playing prompt {file_path}: {e}")
+
     def playChime(self, type: str) -> None:
         """
         Play a chime sound of the specified type.
@@ -96,60 +219,221 @@ class Utilities:
         try:
             if type in self.audio_files:
                 logging.debug(f"Playing chime of type: {type}")
-                subprocess.run(['ffplay', '-nodisp', '-autoexit', self.audio_files[type]], check=True)
+                chime = f"chime_{type}"
+                if self.prompt_bank is not None and chime in self.prompt_bank:
+                    audioEngine.play('chime', self.prompt_bank.sound(chime), block=True)
+                else:
+                    audioEngine.play('chime', audioEngine.load_file(self.audio_files[type]), block=True)
             else:
                 raise ValueError(f"Unknown chime type: {type}")
         except Exception as e:
             logging.error(f"Error in playChime: {e}")
 
-    def speak(self, text: str) -> None:
+    def speak(self, text: str, stream=None) -> None:
         """
         Convert text to speech and play it.
 
         Args:
             text (str): The text to be converted to speech
+            stream (bool, optional): Play PCM chunks as they arrive instead of
+                waiting for the whole file. Defaults to the 'tts.streaming' setting.
 
         Notes:
-            Uses OpenAI's TTS model 'tts-1' with 'shimmer' voice
+            Uses OpenAI's TTS model 'tts-1' with 'shimmer' voice by default.
+            Synthesized audio is kept in a content-addressed cache, so repeated
+            phrases are played from disk without a network round trip.
         """
+        if stream is None:
+            stream = TTS_STREAMING
         if text.strip():  # Check if the text is not empty or whitespace
             try:
-                logging.debug(f"Generating speech for text: {text}")
-                response = openai.audio.speech.create(
-                    model="tts-1",
-                    voice="shimmer",
-                    input=text,
-                )
-                save_file_path = f"/home/pi/FAM/assets/cache/{uuid.uuid4()}.mp3"
-                response.stream_to_file(save_file_path)
-                logging.info(f"{save_file_path}: A new audio file was saved successfully!")
-                subprocess.run(['ffplay', '-nodisp', '-autoexit', save_file_path], check=True)
+                if stream:
+                    streamingSpeaker.speak(text)
+                    return
+                save_file_path = self.synthesize(text)
+                audioEngine.play_file('voice', save_file_path, block=True)
             except Exception as e:
                 logging.error(f"Error in speak: {e}")
         else:
             logging.error("Text to be spoken is empty or whitespace.")
 
-    def getSpeech(self) -> str:
+    def speak_long(self, text: str) -> bool:
+        """
+        Speak a long text sentence by sentence, synthesizing ahead of playback.
+
+        Args:
+            text (str): The text to be converted to speech
+
+        Returns:
+            bool: True if the whole text was spoken, False if it was stopped or failed
+        """
+        if not text.strip():
+            logging.error("Text to be spoken is empty or whitespace.")
+            return False
+        pipeline = speech_pipeline.SpeechPipeline(
+            streamingSpeaker.synthesize_pcm,
+            streamingSpeaker.play_pcm,
+            lookahead=TTS_LOOKAHEAD,
+        )
+        self.speech_pipeline = pipeline
+        self.notify_speaking()
+        try:
+            return pipeline.run(text)
+        except Exception as e:
+            logging.error(f"Error in speak_long: {e}")
+            return False
+        finally:
+            if self.speech_pipeline is pipeline:
+                self.speech_pipeline = None
+            self.notify_speaking()
+
+    def is_speaking(self) -> bool:
+        """
+        Check whether a long text is currently being spoken.
+
+        Returns:
+            bool: True while speak_long() or the morning briefing is running
+        """
+        return self.speech_pipeline is not None
+
+    def notify_speaking(self) -> None:
+        """Call the speaking_listeners after is_speaking() changed."""
+        for listener in self.speaking_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logging.error(f"Error in speaking listener: {e}")
+
+    def stop_speaking(self) -> None:
+        """Cancel the text currently being spoken by speak_long() or the briefing, if any."""
+        pipeline = self.speech_pipeline
+        if pipeline is not None:
+            pipeline.cancel()
+            audioEngine.cancel('voice')
+
+    def synthesize(self, text: str) -> str:
+        """
+        Return the path of an MP3 rendering of the text, synthesizing it on a cache miss.
+
+        Args:
+            text (str): The text to be converted to speech
+
+        Returns:
+            str: Path of the cached MP3 file
+        """
+        key = ttsCache.make_key(text, TTS_MODEL, TTS_VOICE)
+        cached_path = ttsCache.get(key)
+        if cached_path is not None:
+            logging.debug(f"TTS cache hit for text: {text}")
+            return cached_path
+        logging.debug(f"Generating speech for text: {text}")
+        response = openai.audio.speech.create(
+            model=TTS_MODEL,
+            voice=TTS_VOICE,
+            input=text,
+        )
+        save_file_path = ttsCache.put(key, response.content)
+        logging.info(f"{save_file_path}: A new audio file was saved successfully!")
+        return save_file_path
+
+    def setCommandPhrases(self, phrases) -> None:
+        """
+        Build the on-device command grammar.
+
+        Args:
+            phrases (Iterable[str]): Command phrases that getSpeech(commands=True) may answer locally
+        """
+        self.command_recognizer.set_phrases(phrases)
+
+    def setEarlyCommands(self, intents, final_only=()) -> None:
+        """
+        Enable early dispatch of commands from partial transcripts.
+
+        Args:
+            intents (Dict[str, str]): Command phrase -> intent name; phrases of the same
+                intent do not make each other ambiguous
+            final_only (Iterable[str], optional): Intents that need the full transcript
+        """
+        self.streaming_recognizer.set_commands(intents, final_only)
+
+    def record_dispatch(self, text: str, onset: float, early: bool) -> None:
+        """
+        Record the speech-onset-to-command latency of a recognized command.
+
+        Args:
+            text (str): Committed phrase or final transcript
+            onset (float): time.monotonic() at speech onset
+            early (bool): Whether the command was committed from a partial
+        """
+        matcher = self.streaming_recognizer.matcher
+        command = (matcher.match(streaming_asr.normalize(text)) if matcher else None) or text.lower()
+        self.dispatch_latency.record(command, time.monotonic() - onset, early)
+
+    def capture_stream(self):
+        """
+        Return the shared, always-open microphone stream.
+
+        Returns:
+            CaptureStream: The capture stream, started on first use
+        """
+        return audio_capture.get_capture(sample_rate=int(speechConfig.get('sample_rate', 16000)))
+
+    def getSpeech(self, commands: bool = False, start_position: int = None) -> str:
         """
         Listen for and recognize speech input.
 
+        Args:
+            commands (bool, optional): Stream partial transcripts and dispatch a command
+                as soon as one is unambiguous, then try the on-device command recognizer
+                and return a confident command phrase without going to the network.
+                Defaults to False.
+            start_position (int, optional): Capture position to listen from (e.g. where
+                the wake word ended) instead of the pre-roll. Defaults to None.
+
         Returns:
             str: The recognized text, or empty string if recognition fails
 
         Notes:
-            Requires FLAC codec to be installed on the system
+            The online backend requires the FLAC codec; backends are chosen by
+            the 'speech.backends' order and their measured latency. Audio comes from
+            the persistent capture stream, whose rolling noise floor replaces
+            per-command ambient calibration and whose pre-roll keeps the first
+            syllables spoken right after the trigger. A local VAD cuts the
+            utterance as soon as the speaker stops; it is then resampled to
+            16 kHz, trimmed and encoded in the backend's most compact codec.
         """
-        if not shutil.which("flac"):
-            logging.error("FLAC conversion utility not available. Please install FLAC.")
-            return ""
         try:
-            r = sr.Recognizer()
-            with sr.Microphone() as source:
-                logging.info("Listening for speech...")
-                r.adjust_for_ambient_noise(source, duration=1)
-                audio = r.listen(source)
-            text = r.recognize(audio)
-            logging.info(f"Recognized speech: {text}")
+            source = self.capture_stream()
+            session = None
+            if commands and self.streaming_recognizer.available:
+                session = self.streaming_recognizer.session(source.SAMPLE_RATE)
+            logging.info("Listening for speech...")
+            frame_data = source.listen(
+                self.endpointer,
+                pre_roll=float(speechConfig.get('pre_roll', 0.3)),
+                timeout=float(speechConfig.get('listen_timeout', 5.0)),
+                on_chunk=session.accept if session is not None else None,
+                start_position=start_position,
+            )
+            if frame_data is None:
+                raise LookupError("No speech detected")
+            onset, _ = streaming_asr.onset_time(source, source.listen_start, self.endpointer)
+            if session is not None and session.committed:
+                self.record_dispatch(session.committed, onset, early=True)
+                self.playChime('success')
+                return session.committed
+            utterance = audio_encoding.PreparedUtterance(
+                frame_data, source.SAMPLE_RATE, vad=self.trim_vad, noise_floor=source.noise_floor)
+            if commands:
+                phrase, _confidence = self.command_recognizer.recognize(utterance.samples.tobytes())
+                if phrase:
+                    self.record_dispatch(phrase, onset, early=False)
+                    self.playChime('success')
+                    return phrase
+            text, backend = self.asr.transcribe(utterance)
+            logging.info(f"Recognized speech ({backend}): {text}")
+            if commands:
+                self.record_dispatch(text, onset, early=False)
             self.playChime('success')
             return text
         except Exception as e:
@@ -198,7 +482,7 @@ class Utilities:
     
     def getWeather(self, city: str, api_key=weatherAPI) -> str:
         """
-        Fetch weather information for a specified city.
+        Fetch weather information for a specified city (blocking wrapper of agetWeather).
 
         Args:
             city (str): Name of the city
@@ -207,54 +491,111 @@ class Utilities:
         Returns:
             str: Formatted weather report or error message
         """
-        url = f"http://api.openweathermap.org/data/2.5/weather?q={city},in&appid={api_key}"
+        return asyncCore.run(self.agetWeather(city, api_key))
+
+    async def agetWeather(self, city: str, api_key=weatherAPI, rephrase=None) -> str:
+        """
+        Build the spoken weather report for a city on the async core's event loop.
+
+        The report is rendered locally from the (cached) observation; the LLM is
+        only asked to rephrase it when utilities.weather.llm_rephrase is set.
+
+        Args:
+            city (str): Name of the city
+            api_key (str, optional): OpenWeatherMap API key
+            rephrase (bool, optional): Rephrase the report with the LLM. Defaults to the config setting.
+
+        Returns:
+            str: Formatted weather report or error message
+        """
         try:
-            logging.debug(f"Fetching weather data for city: {city}")
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-    
-            # Convert temperatures from Kelvin to Celsius
-            for key in {"temp", "feels_like", "temp_min", "temp_max"}:
-                data["main"][key] -= 273.15
-    
-            # Extract only the necessary information
-            weather_data = {
-                "condition": data["weather"][0]["main"],
-                "description": data["weather"][0]["description"],
-                "temp": round(data["main"]["temp"], 2),
-                "feels_like": round(data["main"]["feels_like"], 2),
-                "temp_min": round(data["main"]["temp_min"], 2),
-                "temp_max": round(data["main"]["temp_max"], 2),
-                "humidity": data["main"]["humidity"],
-                "wind_speed": data["wind"]["speed"],
-                "location": data["name"],
-            }
-    
-            logging.debug(f"Weather data: {weather_data}")
-    
-            # Generate a concise weather report
-            prompt = (
-                f"Weather report for {weather_data['location']}: "
-                f"Condition: {weather_data['condition']} ({weather_data['description']}). "
-                f"Temperature: {weather_data['temp']}°C (feels like {weather_data['feels_like']}°C). "
-                f"Min/Max: {weather_data['temp_min']}°C/{weather_data['temp_max']}°C. "
-                f"Humidity: {weather_data['humidity']}%. "
-                f"Wind speed: {weather_data['wind_speed']} m/s."
-            )
-    
-            return Gpt.generate_text_response(prompt)
-        except requests.exceptions.RequestException as e:
+            weather_data = await self.agetWeatherData(city, api_key)
+            report = self.weatherReport(weather_data)
+            if not (WEATHER_REPHRASE if rephrase is None else rephrase):
+                return report
+            try:
+                return await Gpt.agenerate_text_response(
+                    f"Rephrase this weather report as a short, friendly spoken update: {report}")
+            except Exception as e:
+                logging.error(f"Weather rephrase failed, using the template: {e}")
+                return report
+        except httpx.HTTPError as e:
             logging.error(f"Error in getWeather: {e}")
-            return "Unable to fetch weather data at the moment."
+            return WEATHER_UNAVAILABLE
         except Exception as e:
             logging.error(f"Unexpected error in getWeather: {e}")
-            return "An error occurred while processing the weather data."
+            return WEATHER_FAILED
+
+    async def agetWeatherData(self, city: str, api_key=weatherAPI) -> dict:
+        """
+        Get the current observation for a city, from the weather cache when it is fresh.
+
+        Args:
+            city (str): Name of the city
+            api_key (str, optional): OpenWeatherMap API key
+
+        Returns:
+            dict: Condition, description, temperatures in °C, humidity, wind speed and location
+
+        Raises:
+            httpx.HTTPError: If the observation is not cached and the request fails
+        """
+        key = city.strip().lower()
+        weather_data = weatherCache.get(key)
+        if weather_data is not None:
+            logging.debug(f"Weather for {city} served from cache")
+            return weather_data
+
+        url = f"http://api.openweathermap.org/data/2.5/weather?q={city},in&appid={api_key}"
+        logging.debug(f"Fetching weather data for city: {city}")
+        data = await asyncCore.get_json(url, timeout=WEATHER_TIMEOUT_S)
+
+        # Convert temperatures from Kelvin to Celsius
+        for field in {"temp", "feels_like", "temp_min", "temp_max"}:
+            data["main"][field] -= 273.15
+
+        # Extract only the necessary information
+        weather_data = {
+            "condition": data["weather"][0]["main"],
+            "description": data["weather"][0]["description"],
+            "temp": round(data["main"]["temp"], 2),
+            "feels_like": round(data["main"]["feels_like"], 2),
+            "temp_min": round(data["main"]["temp_min"], 2),
+            "temp_max": round(data["main"]["temp_max"], 2),
+            "humidity": data["main"]["humidity"],
+            "wind_speed": data["wind"]["speed"],
+            "location": data["name"],
+        }
+        logging.debug(f"Weather data: {weather_data}")
+
+        await asyncCore.to_thread(weatherCache.put, key, weather_data)
+        return weather_data
+
+    def weatherReport(self, weather_data: dict) -> str:
+        """
+        Render a weather observation as a spoken report.
+
+        Args:
+            weather_data (dict): Observation as returned by agetWeatherData
+
+        Returns:
+            str: The report
+        """
+        temp = round(weather_data["temp"])
+        feels_like = round(weather_data["feels_like"])
+        report = f"In {weather_data['location']} it's {temp} degrees with {weather_data['description']}"
+        if feels_like != temp:
+            report += f", feeling like {feels_like}"
+        return (
+            f"{report}. Expect a high of {round(weather_data['temp_max'])} "
+            f"and a low of {round(weather_data['temp_min'])} degrees. "
+            f"Humidity is {weather_data['humidity']} percent "
+            f"and the wind is blowing at {round(weather_data['wind_speed'])} metres per second."
+        )
     
-    @lru_cache(maxsize=32)
     def getNews(self, api_key=newsAPI, num_articles=3) -> set:
         """
-        Fetch and summarize top news articles.
+        Fetch and summarize top news articles (blocking wrapper of agetNews).
 
         Args:
             api_key (str, optional): News API key
@@ -264,14 +605,31 @@ class Utilities:
             set: Set of summarized news articles
 
         Notes:
-            Results are cached using lru_cache
+            Articles are sampled afresh on every call; only their summaries are
+            cached, on disk per article URL.
+        """
+        return asyncCore.run(self.agetNews(api_key, num_articles))
+
+    async def agetNews(self, api_key=newsAPI, num_articles=3, chime=True) -> set:
+        """
+        Fetch top news articles and summarize them on the async core's event loop.
+
+        Summaries are looked up in the on-disk summary cache by article URL; the
+        articles that miss are summarized together in a single LLM request. An
+        article the model skipped falls back to its description, which is not cached.
+
+        Args:
+            api_key (str, optional): News API key
+            num_articles (int, optional): Number of articles to fetch (default: 3)
+            chime (bool, optional): Play a chime once the summaries are ready and on errors (default: True)
+
+        Returns:
+            set: Set of summarized news articles
         """
         url = f"https://newsapi.org/v2/top-headlines?country=in&apiKey={api_key}"
         try:
             logging.debug("Fetching news data")
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
+            data = await asyncCore.get_json(url)
     
             logging.debug(f"API Response: {data}")
     
@@ -281,37 +639,75 @@ class Utilities:
                 return {0}
     
             selected_articles = random.sample(articles, min(num_articles, len(articles)))
+            keys = [article.get("url") or article.get("title", "") for article in selected_articles]
+            summaries = {key: summaryCache.get(key) for key in keys}
+            missing = [(key, article) for key, article in zip(keys, selected_articles) if not summaries[key]]
+            logging.debug(f"News summaries: {len(keys) - len(missing)} cached, {len(missing)} to generate")
+
+            if missing:
+                generated = await self.summarizeArticles([article for _, article in missing])
+                fresh = {}
+                for index, (key, article) in enumerate(missing):
+                    summary = generated.get(index)
+                    if summary:
+                        fresh[key] = summary
+                    else:
+                        logging.warning(f"No summary for '{article.get('title', '')}', using its description")
+                    summaries[key] = summary or article.get("description") or article.get("title", "")
+                if fresh:
+                    await asyncCore.to_thread(summaryCache.put_many, fresh)
+
+            if chime:
+                await asyncCore.to_thread(self.playChime, 'success')
     
-            newsSet = set()
-            for article in selected_articles:
-                # Extract necessary information to minimize token usage
-                title = article.get("title", "")
-                description = article.get("description", "")
-                content = article.get("content", "")
-    
-                # Create a concise prompt for the GPT model
-                prompt = (
-                    f"Summarize the following article in a journalistic style, focusing on the key points and events. "
-                    f"Title: {title}\n"
-                    f"Description: {description}\n"
-                    f"Content: {content}\n"
-                    "Please avoid including any hyperlinks."
-                )
-    
-                news = Gpt.generate_text_response(prompt)
-                self.playChime('success')
-                newsSet.add(news)
-    
-            return newsSet
-        except requests.exceptions.RequestException as e:
-            self.playChime('error')
+            return {summary for summary in summaries.values() if summary}
+        except httpx.HTTPError as e:
+            if chime:
+                await asyncCore.to_thread(self.playChime, 'error')
             logging.error(f"Error in getNews: {e}")
             return set()
         except Exception as e:
-            self.playChime('error')
+            if chime:
+                await asyncCore.to_thread(self.playChime, 'error')
             logging.error(f"Unexpected error in getNews: {e}")
             return set()
 
+    async def summarizeArticles(self, articles: list) -> dict:
+        """
+        Summarize several news articles with one structured LLM request.
+
+        Args:
+            articles (list): NewsAPI article dicts
+
+        Returns:
+            dict: Article index -> summary, for the articles the model summarized
+        """
+        listing = "\n\n".join(
+            f"id: {index}\n"
+            f"Title: {article.get('title') or ''}\n"
+            f"Description: {article.get('description') or ''}\n"
+            f"Content: {article.get('content') or ''}"
+            for index, article in enumerate(articles)
+        )
+        prompt = (
+            "Summarize each of the following news articles in a journalistic style, in two or three "
+            "sentences focusing on the key points and events. Do not include any hyperlinks.\n"
+            'Reply with a JSON object of the form {"summaries": [{"id": <article id>, "summary": "<text>"}]}.\n\n'
+            f"{listing}"
+        )
+        result = await Gpt.agenerate_json_response(prompt, max_tokens=NEWS_SUMMARY_MAX_TOKENS)
+
+        summaries = {}
+        for item in result.get("summaries", []):
+            try:
+                index = int(item["id"])
+                summary = str(item["summary"]).strip()
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= index < len(articles) and summary:
+                summaries[index] = summary
+        return summaries
+
     def get_part_of_day(self) -> str:
         """
         Determine the current part of the day.
@@ -338,44 +734,80 @@ class Utilities:
             logging.error(f"Error in get_part_of_day: {e}")
             return "unknown"
 
-    def startMyDay(self, location='Allahabad') -> None:
+    def startMyDay(self, location=None) -> None:
         """
         Provide a morning briefing with date, weather, and news.
 
         Args:
-            location (str, optional): City for weather info (default: 'Allahabad')
+            location (str, optional): City for weather info (default: 'briefing.location' setting)
 
         Notes:
-            Combines multiple utility functions to create a comprehensive briefing
+            Plays the precomputed briefing bundle; stale segments are rebuilt
+            concurrently while the fresh ones play. Counts as speaking, so
+            stop_speaking() and barge-in cover it.
         """
+        playback = briefing.Playback()
+        self.speech_pipeline = playback
+        self.notify_speaking()
         try:
-            part_of_day = self.get_part_of_day()
-            date = self.getDate()
-            time = self.getTime()
-            
-            # Combine greetings, date, and time into a single speech output
-            self.speak(f"Good {part_of_day}! Today is {date}.")
-            
-            # Fetch and speak the weather report
-            weather_report = self.getWeather(location)
-            if weather_report:
-                self.speak(f"{weather_report}")
-            else:
-                self.speak(f"Sorry, I couldn't fetch the weather for {location}.")
-            
-            # Fetch and speak the news headlines
-            news_headlines = self.getNews()
-            if news_headlines:
-                self.playChime('success')
-                self.speak("Here are the top news headlines:")
-                for news in news_headlines:
-                    self.speak(news)
-            else:
-                self.playChime('error')
-                self.speak("Sorry, I couldn't fetch the news headlines.")
+            asyncCore.run(self.abriefing(location or BRIEFING_LOCATION, playback.cancel_event))
+        finally:
+            if self.speech_pipeline is playback:
+                self.speech_pipeline = None
+            self.notify_speaking()
+
+    async def abriefing(self, location=BRIEFING_LOCATION, cancel_event=None) -> None:
+        """
+        Speak the morning briefing from the bundle on the async core's event loop.
+
+        Args:
+            location (str, optional): City for weather info
+            cancel_event (threading.Event, optional): Set to stop the briefing
+        """
+        try:
+            await self.briefing.play({'location': location}, cancel_event)
         except Exception as e:
             logging.error(f"Error in startMyDay: {e}")
-            self.speak("An error occurred while starting your day.")
+            await asyncCore.to_thread(self.speak, "An error occurred while starting your day.")
+
+    def refreshBriefing(self, force=False) -> list:
+        """
+        Rebuild the stale (or all) briefing segments, including their audio.
+
+        Args:
+            force (bool, optional): Rebuild fresh segments too (default: False)
+
+        Returns:
+            list: Names of the rebuilt segments
+        """
+        return asyncCore.run(self.briefing.refresh({'location': BRIEFING_LOCATION}, force))
+
+    def start_briefing_precompute(self) -> None:
+        """Start the daily briefing precompute, if a wake time is configured."""
+        if self.briefing_precompute is not None:
+            self.briefing_precompute.start()
+
+    def stop_briefing_precompute(self) -> None:
+        if self.briefing_precompute is not None:
+            self.briefing_precompute.stop()
+
+    def greeting_text(self) -> str:
+        return f"Good {self.get_part_of_day()}! Today is {self.getDate()}."
+
+    async def briefing_greeting(self, context: dict) -> list:
+        return [self.greeting_text()]
+
+    async def briefing_weather(self, context: dict):
+        report = await self.agetWeather(context['location'])
+        return [report] if report and report not in (WEATHER_UNAVAILABLE, WEATHER_FAILED) else None
+
+    async def briefing_news(self, context: dict):
+        headlines = [h for h in await self.agetNews(chime=False) if isinstance(h, str) and h]
+        return ["Here are the top news headlines:"] + headlines if headlines else None
+
+    async def on_briefing_segment(self, name: str, ok: bool) -> None:
+        if name == 'news':
+            await asyncCore.to_thread(self.playChime, 'success' if ok else 'error')
 
     def send_email(self, recipient: str, subject: str, plain_content: str, html_content: str = "") -> None:
         """
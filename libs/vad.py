@@ -0,0 +1,216 @@
+"""
+Energy / zero-crossing voice activity detection and utterance endpointing.
+
+Frames are classified in bulk with NumPy. A frame is speech when its RMS
+energy clearly exceeds the noise floor, or when it is moderately loud and has
+the high zero-crossing rate of unvoiced consonants ('s', 'f', 't'), which
+plain energy gating tends to clip. The Endpointer turns the per-frame
+decisions into an utterance: it opens on a short run of speech frames, closes
+after a configurable hangover of non-speech, and never runs past a maximum
+utterance length. Only the trimmed speech (plus a small pad) is returned.
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+def frame_features(samples: np.ndarray, frame_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute per-frame RMS energy and zero-crossing rate.
+
+    Args:
+        samples (np.ndarray): int16 mono samples; a trailing partial frame is ignored
+        frame_length (int): Samples per frame
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (rms energy, zero-crossing rate in crossings per sample)
+    """
+    count = len(samples) // frame_length
+    if count == 0:
+        return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+    frames = samples[:count * frame_length].reshape(count, frame_length).astype(np.float32)
+    energy = np.sqrt(np.mean(frames * frames, axis=1))
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame_length - 1)
+    return energy, zcr.astype(np.float32)
+
+class VoiceActivityDetector:
+    """
+    Vectorized frame classifier.
+
+    Attributes:
+        sample_rate (int): Sample rate in Hz
+        frame_length (int): Samples per analysis frame
+        energy_ratio (float): Speech threshold as a multiple of the noise floor
+        weak_energy_ratio (float): Lower threshold used for high-ZCR (fricative) frames
+        zcr_range (tuple): Zero-crossing rate band of unvoiced speech
+        min_energy (float): Lower bound of the energy threshold
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20, energy_ratio: float = 2.5,
+                 weak_energy_ratio: float = 1.5, zcr_range: Tuple[float, float] = (0.1, 0.5), min_energy: float = 100.0):
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.energy_ratio = energy_ratio
+        self.weak_energy_ratio = weak_energy_ratio
+        self.zcr_range = zcr_range
+        self.min_energy = min_energy
+
+    def classify(self, samples: np.ndarray, noise_floor: float) -> np.ndarray:
+        """
+        Classify frames as speech or non-speech.
+
+        Args:
+            samples (np.ndarray): int16 mono samples
+            noise_floor (float): Background RMS energy
+
+        Returns:
+            np.ndarray: Boolean array, one entry per complete frame
+        """
+        energy, zcr = frame_features(samples, self.frame_length)
+        strong = energy > max(self.min_energy, noise_floor * self.energy_ratio)
+        weak = energy > max(self.min_energy, noise_floor * self.weak_energy_ratio)
+        fricative = weak & (zcr >= self.zcr_range[0]) & (zcr <= self.zcr_range[1])
+        return strong | fricative
+
+    def estimate_noise_floor(self, samples: np.ndarray, percentile: float = 20.0) -> float:
+        """
+        Estimate the noise floor of a recording from its quietest frames.
+
+        Args:
+            samples (np.ndarray): int16 mono samples
+            percentile (float, optional): Percentile of frame energies. Defaults to 20.
+
+        Returns:
+            float: Noise-floor RMS energy
+        """
+        energy, _ = frame_features(samples, self.frame_length)
+        return float(np.percentile(energy, percentile)) if len(energy) else 0.0
+
+class Endpointer:
+    """
+    Streaming utterance endpointer over VAD frame decisions.
+
+    Feed samples as they arrive; once the utterance is complete, `end` is set
+    and trimmed() gives the speech span.
+
+    Attributes:
+        vad (VoiceActivityDetector): Frame classifier
+        hangover_frames (int): Non-speech frames that close the utterance
+        onset_frames (int): Consecutive speech frames that open it
+        max_frames (int): Maximum utterance length in frames
+        pad_frames (int): Frames kept on either side of the speech
+        start (int): Sample index where speech began, or None
+        end (int): Sample index where speech ended, or None while open
+        decided_at (int): Samples consumed when the endpoint was decided
+        truncated (bool): Whether the utterance hit max_frames
+    """
+
+    def __init__(self, vad: VoiceActivityDetector, hangover_ms: int = 300, onset_ms: int = 60,
+                 max_utterance_s: float = 10.0, pad_ms: int = 100):
+        self.vad = vad
+        frame_ms = 1000 * vad.frame_length / vad.sample_rate
+        self.hangover_frames = max(1, int(hangover_ms / frame_ms))
+        self.onset_frames = max(1, int(onset_ms / frame_ms))
+        self.max_frames = int(max_utterance_s * 1000 / frame_ms)
+        self.pad_frames = int(pad_ms / frame_ms)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget any utterance in progress."""
+        self.pending = np.zeros(0, dtype=np.int16)
+        self.frame_index = 0
+        self.run = 0
+        self.silence = 0
+        self.start_frame = None
+        self.last_speech_frame = None
+        self.start = None
+        self.end = None
+        self.decided_at = None
+        self.truncated = False
+
+    @property
+    def speech_started(self) -> bool:
+        return self.start_frame is not None
+
+    def feed(self, samples: np.ndarray, noise_floor: float) -> bool:
+        """
+        Consume new samples.
+
+        Args:
+            samples (np.ndarray): int16 mono samples following the previous call
+            noise_floor (float): Current background RMS energy
+
+        Returns:
+            bool: True once the utterance has been endpointed
+        """
+        if self.end is not None:
+            return True
+        frame_length = self.vad.frame_length
+        data = np.concatenate((self.pending, samples)) if len(self.pending) else samples
+        usable = len(data) - len(data) % frame_length
+        self.pending = data[usable:]
+        decisions = self.vad.classify(data[:usable], noise_floor)
+        for is_speech in decisions:
+            if self.start_frame is None:
+                self.run = self.run + 1 if is_speech else 0
+                if self.run >= self.onset_frames:
+                    self.start_frame = self.frame_index - self.run + 1
+                    self.last_speech_frame = self.frame_index
+            elif is_speech:
+                self.last_speech_frame = self.frame_index
+                self.silence = 0
+            else:
+                self.silence += 1
+            self.frame_index += 1
+            if self.start_frame is None:
+                continue
+            length = self.frame_index - self.start_frame
+            if self.silence >= self.hangover_frames or length >= self.max_frames:
+                self.truncated = self.silence < self.hangover_frames
+                self._close(frame_length)
+                return True
+        return False
+
+    def finish(self) -> None:
+        """Close an open utterance at the end of the input."""
+        if self.start_frame is not None and self.end is None:
+            self._close(self.vad.frame_length)
+
+    def trimmed(self) -> Optional[Tuple[int, int]]:
+        """
+        Return the padded speech span.
+
+        Returns:
+            Optional[Tuple[int, int]]: (start, end) sample indices, or None if no speech was found
+        """
+        if self.start is None or self.end is None:
+            return None
+        return self.start, self.end
+
+    def _close(self, frame_length: int) -> None:
+        last = self.last_speech_frame if not self.truncated else self.frame_index - 1
+        self.start = max(0, self.start_frame - self.pad_frames) * frame_length
+        self.end = min(self.frame_index, last + 1 + self.pad_frames) * frame_length
+        self.decided_at = self.frame_index * frame_length
+
+def endpoint_samples(samples: np.ndarray, vad: VoiceActivityDetector, block: int = 512,
+                     **endpointer_kwargs) -> Endpointer:
+    """
+    Run the endpointer over a complete recording, as if it were streamed in blocks.
+
+    Args:
+        samples (np.ndarray): int16 mono samples
+        vad (VoiceActivityDetector): Frame classifier
+        block (int, optional): Samples fed per step, matching the capture chunk. Defaults to 512.
+        **endpointer_kwargs: Endpointer arguments
+
+    Returns:
+        Endpointer: The endpointer after the utterance closed or the input ran out
+    """
+    endpointer = Endpointer(vad, **endpointer_kwargs)
+    noise_floor = vad.estimate_noise_floor(samples)
+    for offset in range(0, len(samples), block):
+        if endpointer.feed(samples[offset:offset + block], noise_floor):
+            return endpointer
+    endpointer.finish()
+    return endpointer
@@ -0,0 +1,212 @@
+"""
+Wake-word detection on the shared capture stream.
+
+The detector reads frames straight out of the capture ring buffer
+(libs/audio_capture.py) as NumPy views, so the wake-word detector, the VAD
+endpointer and the recognizer all share one always-open microphone and no
+audio is copied between them. When the wake word is heard, the command is
+captured from the same stream starting at the sample where the wake word
+ended.
+
+Detector engines are pluggable:
+
+- PorcupineDetector: Picovoice Porcupine with a custom .ppn keyword
+- StandInDetector: fires on a short run of loud frames; needs no model or
+  access key, for tests, benchmarks and development machines
+"""
+
+import logging
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+
+try:
+    import pvporcupine  # type: ignore
+except ImportError:
+    pvporcupine = None
+
+class WakeWordDetector:
+    """
+    Interface of a wake-word engine.
+
+    Attributes:
+        name (str): Engine name used in configuration
+        sample_rate (int): Sample rate the engine expects
+        frame_length (int): Samples per call to process()
+    """
+    name = "base"
+    sample_rate = 16000
+    frame_length = 512
+
+    def process(self, frame: np.ndarray) -> bool:
+        """
+        Examine one frame.
+
+        Args:
+            frame (np.ndarray): frame_length int16 samples (may be a view into the capture buffer)
+
+        Returns:
+            bool: True if the wake word ends in this frame
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release engine resources."""
+
+class PorcupineDetector(WakeWordDetector):
+    """Picovoice Porcupine keyword spotter."""
+    name = "porcupine"
+
+    def __init__(self, access_key: str, keyword_path: str, sensitivity: float = 0.5):
+        """
+        Create the Porcupine engine.
+
+        Args:
+            access_key (str): Picovoice access key
+            keyword_path (str): Path of the .ppn keyword file
+            sensitivity (float, optional): Detection sensitivity (0-1). Defaults to 0.5.
+
+        Raises:
+            RuntimeError: If pvporcupine is not installed
+        """
+        if pvporcupine is None:
+            raise RuntimeError("pvporcupine is not installed")
+        self.porcupine = pvporcupine.create(access_key=access_key, keyword_paths=[keyword_path],
+                                            sensitivities=[sensitivity])
+        self.sample_rate = self.porcupine.sample_rate
+        self.frame_length = self.porcupine.frame_length
+
+    def process(self, frame: np.ndarray) -> bool:
+        return self.porcupine.process(frame) >= 0
+
+    def close(self) -> None:
+        if self.porcupine is not None:
+            self.porcupine.delete()
+            self.porcupine = None
+
+class StandInDetector(WakeWordDetector):
+    """
+    Model-free stand-in that fires after `hold_frames` consecutive loud frames.
+
+    Attributes:
+        threshold (float): RMS level of a loud frame
+        hold_frames (int): Consecutive loud frames that count as the wake word
+    """
+    name = "standin"
+
+    def __init__(self, threshold: float = 3000.0, hold_frames: int = 8, sample_rate: int = 16000,
+                 frame_length: int = 512):
+        self.threshold = threshold
+        self.hold_frames = hold_frames
+        self.sample_rate = sample_rate
+        self.frame_length = frame_length
+        self.run = 0
+
+    def process(self, frame: np.ndarray) -> bool:
+        rms = float(np.sqrt(np.mean(frame.astype(np.float32) ** 2)))
+        self.run = self.run + 1 if rms >= self.threshold else 0
+        return self.run == self.hold_frames
+
+def make_detector(wake_word_config: dict, access_key: Optional[str] = None,
+                  keyword_path: Optional[str] = None) -> Optional[WakeWordDetector]:
+    """
+    Build the configured detector.
+
+    Args:
+        wake_word_config (dict): 'wake_word' configuration section
+        access_key (str, optional): Picovoice access key
+        keyword_path (str, optional): Porcupine .ppn keyword file
+
+    Returns:
+        Optional[WakeWordDetector]: The detector, or None if disabled or unavailable
+    """
+    engine = wake_word_config.get('engine', 'porcupine')
+    if engine in (None, 'none'):
+        return None
+    try:
+        if engine == 'porcupine':
+            return PorcupineDetector(access_key, keyword_path, float(wake_word_config.get('sensitivity', 0.5)))
+        if engine == 'standin':
+            return StandInDetector(threshold=float(wake_word_config.get('standin_threshold', 3000.0)),
+                                   hold_frames=int(wake_word_config.get('standin_hold_frames', 8)))
+    except Exception as e:
+        logging.error(f"Wake-word engine '{engine}' unavailable: {e}")
+        return None
+    logging.error(f"Unknown wake-word engine '{engine}'")
+    return None
+
+class WakeWordListener:
+    """
+    Runs a detector over the capture ring buffer in a background thread.
+
+    Attributes:
+        capture (CaptureStream): Shared capture stream
+        detector (WakeWordDetector): Engine
+        on_wake (Callable): Called with the absolute sample position where the wake word ended
+        detections (int): Wake words heard
+        overruns (int): Times the listener fell a whole buffer behind and skipped ahead
+    """
+
+    def __init__(self, capture, detector: WakeWordDetector, on_wake: Callable[[int], None]):
+        if detector.sample_rate != capture.SAMPLE_RATE:
+            raise ValueError(f"Wake-word engine needs {detector.sample_rate} Hz audio, "
+                             f"capture runs at {capture.SAMPLE_RATE} Hz")
+        self.capture = capture
+        self.detector = detector
+        self.on_wake = on_wake
+        self.detections = 0
+        self.overruns = 0
+        self.running = False
+        self.active = threading.Event()
+        self.active.set()
+        self.thread = None
+
+    def start(self) -> None:
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="wake-word", daemon=True)
+        self.thread.start()
+        logging.info("Wake-word listener started (%s).", self.detector.name)
+
+    def stop(self) -> None:
+        self.running = False
+        self.active.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+        self.detector.close()
+
+    def set_paused(self, paused: bool) -> None:
+        """Pause detection (e.g. while a command is being captured and handled)."""
+        if paused:
+            self.active.clear()
+        else:
+            self.active.set()
+
+    def _aligned(self, position: int) -> int:
+        return position - position % self.detector.frame_length
+
+    def _run(self) -> None:
+        frame_length = self.detector.frame_length
+        cursor = self._aligned(self.capture.position)
+        while self.running:
+            if not self.active.is_set():
+                self.active.wait()
+                cursor = self._aligned(self.capture.position)
+                continue
+            if not self.capture.wait_for(cursor + frame_length, 1.0):
+                continue
+            if self.capture.position - cursor > self.capture.capacity - frame_length:
+                self.overruns += 1
+                cursor = self._aligned(self.capture.position)
+                continue
+            frame = self.capture.view(cursor, cursor + frame_length)
+            cursor += frame_length
+            try:
+                detected = self.detector.process(frame)
+            except Exception as e:
+                logging.error(f"Wake-word engine error: {e}")
+                continue
+            if detected:
+                self.detections += 1
+                logging.info("Wake word detected.")
+                self.on_wake(cursor)
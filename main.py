@@ -4,7 +4,6 @@ import threading
 # import subprocess
 from pathlib import Path
 from multiprocessing import Process
-from _fam_assistant import FamAssistant
 
 def load_config():
     with open('conf/secrets.yaml') as file:
@@ -45,12 +44,20 @@ def main():
         FamAssistant: An instance of the FamAssistant running in a separate thread.
         list: A list of processes running the Streamlit apps.
     """
+    # Imported here, not at module level: the gesture sampler is started with 'spawn', which
+    # re-imports this module in the child, and must not pull in the assistant and its audio stack
+    from _fam_assistant import FamAssistant
+
     config = load_config()
     access_key = config['main']['access_key']
     keyword_path = "/home/pi/FAM/model/Hey-Fam_en_raspberry-pi_v3_0_0.ppn"
     music_path = config['main']['music_path']
 
-    assistant = FamAssistant(access_key=access_key, keyword_path=keyword_path, music_path=music_path)
+    assistant = FamAssistant(access_key=access_key, keyword_path=keyword_path, music_path=music_path,
+                             gesture_config=config.get('gesture', {}),
+                             wake_word_config=config.get('wake_word', {}),
+                             command_config=config.get('commands', {}),
+                             http_config=config.get('http', {}))
 
     # Start the assistant in a separate thread
     assistant_thread = threading.Thread(target=assistant.start, daemon=True)